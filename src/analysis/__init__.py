@@ -1,4 +1,5 @@
 from .performance_analyzer import PerformanceAnalyzer
+from .performance_cache import PerformanceCache
 from .predictor import Predictor
 
-__all__ = ['PerformanceAnalyzer', 'Predictor']
\ No newline at end of file
+__all__ = ['PerformanceAnalyzer', 'PerformanceCache', 'Predictor']
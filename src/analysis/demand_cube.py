@@ -0,0 +1,180 @@
+# Monthly demand of many entities in one dense matrix, built once per data load
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from src.models.sales_history import SalesHistory
+from src.utils.periods import MONTHS_PER_PERIOD, month_index, months_to_periods, period_of, period_start
+
+# Above this many rows with sales in a boundary month, cut them all at once
+VECTORIZED_EDGE_ROWS = 256
+
+
+def month_start(month: int) -> date:
+    """First day of a month index"""
+    return period_start(month, "monthly")
+
+
+def month_end(month: int) -> date:
+    """Last day of a month index"""
+    return month_start(month + 1) - timedelta(days=1)
+
+
+@dataclass(eq=False)
+class DemandCube:
+    """Sales quantity per entity and calendar month, for all entities of one kind
+
+    quantities[i, j] is the total sold by ids[i] in month first_month + j;
+    present[i, j] tells whether it had any sale that month (zero-quantity sales
+    count). The month axis covers whole years, so quarterly and yearly views are
+    reshapes of it.
+    """
+
+    ids: List[str]
+    histories: List[SalesHistory]  # the histories the cube was built from, one per ID
+    first_month: int  # month index of column 0, always a January
+    quantities: np.ndarray  # int64, (entities, months)
+    present: np.ndarray  # bool, (entities, months)
+    positions: Dict[str, int] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.positions = {entity_id: i for i, entity_id in enumerate(self.ids)}
+
+    @classmethod
+    def from_histories(cls, ids: Sequence[str], histories: Sequence[SalesHistory]) -> "DemandCube":
+        """Fill the cube with one bincount over (entity, month) cells"""
+        counts = np.fromiter((len(history) for history in histories), np.int64, len(histories))
+        if not counts.sum():
+            empty = np.zeros((len(ids), 0), dtype=np.int64)
+            return cls(list(ids), list(histories), 0, empty, empty.astype(bool))
+        months = month_index(np.concatenate([history.dates for history in histories]))
+        quantities = np.concatenate([history.quantities for history in histories])
+        rows = np.repeat(np.arange(len(histories)), counts)
+
+        first_month = int(months.min()) // 12 * 12
+        n_months = (int(months.max()) // 12 * 12 + 12) - first_month
+        cells = rows * n_months + (months - first_month)
+        size = len(histories) * n_months
+        totals = np.bincount(cells, weights=quantities, minlength=size)
+        present = np.bincount(cells, minlength=size) > 0
+        return cls(
+            list(ids),
+            list(histories),
+            first_month,
+            totals.astype(np.int64).reshape(len(histories), n_months),
+            present.reshape(len(histories), n_months),
+        )
+
+    @property
+    def n_months(self) -> int:
+        return self.quantities.shape[1]
+
+    @property
+    def nbytes(self) -> int:
+        return self.quantities.nbytes + self.present.nbytes
+
+    def row(self, entity) -> int | None:
+        """Row of a Room / TwelveNC, None if unknown or its sales changed since the cube was built"""
+        position = self.positions.get(entity.id)
+        if position is None or self.histories[position] is not entity.sales_history:
+            return None
+        return position
+
+    def view(self, granularity: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Whole-period totals of every entity
+
+        Returns:
+            (quantities, present, period number of each column)
+        """
+        step = MONTHS_PER_PERIOD[granularity]
+        shape = (len(self.ids), self.n_months // step, step)
+        return (
+            self.quantities.reshape(shape).sum(axis=2),
+            self.present.reshape(shape).any(axis=2),
+            months_to_periods(np.arange(self.first_month, self.first_month + self.n_months, step), granularity),
+        )
+
+    def monthly_window(self, rows: Sequence[int], start: date, end: date) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Monthly totals of some rows between start and end (inclusive, day precision)
+
+        Whole months come from the cube; the two boundary months are cut to
+        start / end with binary searches on each entity's history.
+
+        Returns:
+            (month indexes, quantities (rows, months), present (rows, months))
+        """
+        first, last = period_of(start, "monthly"), period_of(end, "monthly")
+        months = np.arange(first, last + 1)
+        quantities = np.zeros((len(rows), months.size), dtype=np.int64)
+        present = np.zeros((len(rows), months.size), dtype=bool)
+        if months.size <= 0:
+            return months, quantities, present
+
+        # Overlap of [first, last] with the cube's months
+        lo = max(first, self.first_month)
+        hi = min(last, self.first_month + self.n_months - 1)
+        if lo <= hi:
+            columns = slice(lo - self.first_month, hi - self.first_month + 1)
+            quantities[:, lo - first : hi - first + 1] = self.quantities[rows, columns]
+            present[:, lo - first : hi - first + 1] = self.present[rows, columns]
+
+        # Boundary months only partly inside [start, end]
+        edges = [(0, start, min(end, month_end(first)))]
+        if last != first:
+            edges.append((months.size - 1, month_start(last), end))
+        edges = [
+            (column, edge_start, edge_end)
+            for column, edge_start, edge_end in edges
+            if (edge_start, edge_end) != (month_start(first + column), month_end(first + column))
+        ]
+        if not edges:
+            return months, quantities, present
+        columns = [column for column, _, _ in edges]
+        edge_starts = np.array([edge_start.toordinal() for _, edge_start, _ in edges])
+        edge_ends = np.array([edge_end.toordinal() for _, _, edge_end in edges])
+        # Rows without a sale in a boundary month already hold 0 there
+        cut = np.flatnonzero(present[:, columns].any(axis=1))
+        if cut.size <= VECTORIZED_EDGE_ROWS:
+            for i in cut.tolist():
+                history = self.histories[rows[i]]
+                low = history.dates.searchsorted(edge_starts, "left")
+                high = np.maximum(low, history.dates.searchsorted(edge_ends, "right"))
+                prefix = history.prefix
+                quantities[i, columns] = prefix[high] - prefix[low]
+                present[i, columns] = high > low
+            return months, quantities, present
+
+        # Many rows: one masked bincount per boundary month over their concatenated sales
+        histories = [self.histories[rows[i]] for i in cut.tolist()]
+        counts = np.fromiter((len(history) for history in histories), np.int64, len(histories))
+        dates = np.concatenate([history.dates for history in histories])
+        sale_quantities = np.concatenate([history.quantities for history in histories])
+        sale_rows = np.repeat(np.arange(cut.size), counts)
+        for column, low, high in zip(columns, edge_starts.tolist(), edge_ends.tolist()):
+            inside = (dates >= low) & (dates <= high)
+            quantities[cut, column] = np.bincount(
+                sale_rows[inside], weights=sale_quantities[inside], minlength=cut.size
+            ).astype(np.int64)
+            present[cut, column] = np.bincount(sale_rows[inside], minlength=cut.size) > 0
+        return months, quantities, present
+
+    def periods(
+        self, rows: Sequence[int], start: date, end: date, granularity: str
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Period totals of some rows between start and end (inclusive)
+
+        Returns:
+            (period numbers (see utils.periods), quantities (rows, periods), present (rows, periods))
+        """
+        months, quantities, present = self.monthly_window(rows, start, end)
+        if not months.size:
+            return months, quantities, present
+        keys = months_to_periods(months, granularity)
+        starts = np.concatenate(([0], np.flatnonzero(np.diff(keys)) + 1))
+        return (
+            keys[starts],
+            np.add.reduceat(quantities, starts, axis=1),
+            np.logical_or.reduceat(present, starts, axis=1),
+        )
@@ -0,0 +1,212 @@
+"""Portfolio-wide period totals computed by a process pool over shared-memory sales arrays
+
+The sales are laid out as three flat arrays (sale dates, quantities and per-entity
+offsets, see GroupedSales) in multiprocessing.shared_memory blocks. Workers attach
+to them by name and receive only entity rows; each returns the (rows x periods)
+totals of its rows, so no entity or sales object is pickled.
+
+The pool and the shared copies of the last GroupedSales are kept between calls: a
+portfolio-wide run pays for starting the workers and copying the sales once per
+data load, not once per analysis. shutdown() releases both (also run at exit).
+"""
+
+import atexit
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import date
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from ..models import GroupedSales
+from ..utils.periods import period_of, periods_of
+from ..utils.process_pool import spawn_pool
+
+# Row chunks handed out per worker: more than one, so an unlucky chunk doesn't hold up the pool
+CHUNKS_PER_WORKER = 4
+
+ARRAY_KEYS = ("dates", "quantities", "offsets")
+
+# GroupedSales kept in shared memory at once (the rooms' and the 12NCs' of a catalog)
+MAX_SHARED_SALES = 2
+
+# Pool and shared sales of the parent process, reused across calls (guarded by _lock)
+_lock = threading.Lock()
+_pool: ProcessPoolExecutor | None = None
+_pool_workers = 0
+# (GroupedSales, its blocks, their specs), most recently used last
+_shared: List[Tuple[GroupedSales, List[SharedMemory], Dict[str, Tuple[str, str, int]]]] = []
+
+# Sales arrays a worker process is attached to, by their block names (see _attach)
+_worker_names: Tuple[str, ...] = ()
+_worker_arrays: Dict[str, np.ndarray] = {}
+_worker_blocks: List[SharedMemory] = []
+
+
+def _share(array: np.ndarray) -> Tuple[SharedMemory, Tuple[str, str, int]]:
+    """Copy array into a new shared memory block; returns it and its (name, dtype, length)"""
+    block = SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[:] = array
+    return block, (block.name, array.dtype.str, array.size)
+
+
+def _unlink(blocks: List[SharedMemory]):
+    for block in blocks:
+        block.close()
+        block.unlink()
+
+
+def _shared_arrays(sales: GroupedSales) -> Dict[str, Tuple[str, str, int]]:
+    """Private function returning the block specs of sales, copying them to shared memory on first use"""
+    for entry in _shared:
+        if entry[0] is sales:
+            _shared.remove(entry)
+            _shared.append(entry)
+            return entry[2]
+    blocks, specs = [], {}
+    try:
+        for key in ARRAY_KEYS:
+            block, specs[key] = _share(getattr(sales, key))
+            blocks.append(block)
+    except BaseException:
+        _unlink(blocks)
+        raise
+    _shared.append((sales, blocks, specs))
+    while len(_shared) > MAX_SHARED_SALES:
+        _unlink(_shared.pop(0)[1])
+    return specs
+
+
+def _worker_pool(workers: int) -> ProcessPoolExecutor:
+    """Private function returning the running pool, restarted when the worker count changes"""
+    global _pool, _pool_workers
+    if _pool is None or _pool_workers != workers:
+        if _pool is not None:
+            _pool.shutdown(wait=True, cancel_futures=True)
+        _pool, _pool_workers = spawn_pool(workers), workers
+    return _pool
+
+
+def _shutdown_pool():
+    """Private function to stop the pool's workers (call with _lock held)"""
+    global _pool, _pool_workers
+    if _pool is not None:
+        _pool.shutdown(wait=True, cancel_futures=True)
+    _pool, _pool_workers = None, 0
+
+
+def shutdown():
+    """Stop the worker pool and free the shared sales arrays (both are recreated on the next call)"""
+    with _lock:
+        _shutdown_pool()
+        while _shared:
+            _unlink(_shared.pop()[1])
+
+
+atexit.register(shutdown)
+
+
+def _attach(specs: Dict[str, Tuple[str, str, int]]) -> Dict[str, np.ndarray]:
+    """Private function to map the blocks of specs in a worker, once per set of blocks"""
+    global _worker_names
+    names = tuple(specs[key][0] for key in ARRAY_KEYS)
+    if names != _worker_names:
+        for block in _worker_blocks:
+            block.close()
+        _worker_blocks.clear()
+        _worker_arrays.clear()
+        for key, (name, dtype, size) in specs.items():
+            block = SharedMemory(name=name)
+            _worker_blocks.append(block)  # keep the mapping alive until the next set of blocks
+            _worker_arrays[key] = np.ndarray((size,), dtype=np.dtype(dtype), buffer=block.buf)
+        _worker_names = names
+    return _worker_arrays
+
+
+def period_block(
+    arrays: Dict[str, np.ndarray], rows: np.ndarray, start: date, end: date, granularity: str
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Period totals of some entities (rows of the flat sales arrays)
+
+    Returns:
+        (quantities (rows, periods) int64, present (rows, periods) bool); the columns
+        are the periods from the one containing start to the one containing end
+    """
+    offsets = arrays["offsets"]
+    first, last = period_of(start, granularity), period_of(end, granularity)
+    n_rows, n_periods = len(rows), last - first + 1
+    starts, counts = offsets[rows], offsets[rows + 1] - offsets[rows]
+    if n_rows and rows[-1] - rows[0] == n_rows - 1 and np.all(np.diff(rows) == 1):
+        sales = slice(int(starts[0]), int(starts[0] + counts.sum()))  # consecutive rows: no gather
+    else:
+        sales = np.arange(counts.sum()) + np.repeat(starts - (np.cumsum(counts) - counts), counts)
+    dates, quantities = arrays["dates"][sales], arrays["quantities"][sales]
+    row_of_sale = np.repeat(np.arange(n_rows), counts)
+
+    inside = (dates >= start.toordinal()) & (dates <= end.toordinal())
+    cells = row_of_sale[inside] * n_periods + (periods_of(dates[inside], granularity) - first)
+    size = n_rows * n_periods
+    totals = np.bincount(cells, weights=quantities[inside], minlength=size).astype(np.int64)
+    present = np.bincount(cells, minlength=size) > 0
+    return totals.reshape(n_rows, n_periods), present.reshape(n_rows, n_periods)
+
+
+def _worker_block(specs, rows: np.ndarray, start: date, end: date, granularity: str):
+    return period_block(_attach(specs), rows, start, end, granularity)
+
+
+def _ranges(offsets: np.ndarray, chunks: int) -> List[Tuple[int, int]]:
+    """Split the entities into about `chunks` contiguous ranges with similar sale counts"""
+    n_entities = offsets.size - 1
+    targets = np.linspace(0, offsets[-1], chunks + 1)[1:-1]
+    cuts = np.unique(np.concatenate(([0], np.searchsorted(offsets, targets), [n_entities])))
+    return [(int(lo), int(hi)) for lo, hi in zip(cuts[:-1], cuts[1:]) if hi > lo]
+
+
+def parallel_period_totals(
+    sales: GroupedSales, rows: Sequence[int], start: date, end: date, granularity: str, workers: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Period totals of some entities between start and end (inclusive), in worker processes
+
+    Args:
+        sales: Flat sales arrays, e.g. EntityCatalog.sales(kind); the shared memory copy is
+            reused by later calls with the same object (up to MAX_SHARED_SALES of them)
+        rows: Groups of sales to total, one result row each
+        start, end: Date range
+        granularity: "monthly", "quarterly" or "yearly"
+        workers: Number of worker processes of the pool (restarted when it changes)
+
+    Returns:
+        (period numbers (see utils.periods), quantities (rows, periods), present (rows, periods))
+    """
+    rows = np.asarray(rows, dtype=np.int64)
+    first, last = period_of(start, granularity), period_of(end, granularity)
+    periods = np.arange(first, last + 1)
+    quantities = np.zeros((rows.size, periods.size), dtype=np.int64)
+    present = np.zeros((rows.size, periods.size), dtype=bool)
+    if not rows.size or periods.size <= 0:
+        return periods, quantities, present
+
+    # Chunks of the requested rows with similar sale counts
+    row_offsets = np.zeros(rows.size + 1, dtype=np.int64)
+    np.cumsum(sales.offsets[rows + 1] - sales.offsets[rows], out=row_offsets[1:])
+    chunks = _ranges(row_offsets, workers * CHUNKS_PER_WORKER)
+
+    with _lock:
+        specs = _shared_arrays(sales)
+        pool = _worker_pool(workers)
+        try:
+            futures = [
+                (lo, pool.submit(_worker_block, specs, rows[lo:hi], start, end, granularity))
+                for lo, hi in chunks
+            ]
+            for lo, future in futures:
+                block_quantities, block_present = future.result()
+                quantities[lo : lo + len(block_quantities)] = block_quantities
+                present[lo : lo + len(block_present)] = block_present
+        except BrokenProcessPool:
+            _shutdown_pool()  # a worker died: start a fresh pool on the next call
+            raise
+    return periods, quantities, present
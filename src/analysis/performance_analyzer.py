@@ -1,26 +1,40 @@
-from datetime import datetime, date
-from typing import List, Dict
+from datetime import date
+from typing import List, Dict, Literal, Sequence
 from collections import defaultdict
 from dateutil.relativedelta import relativedelta
 
+import numpy as np
+
 from src.models.mapping import Room
-from ..models import SalesRecord, PerformanceData, TimePeriod
-from ..utils import get_period_key
-from ..utils.date_utils import parse_period_label_for_sorting
+from ..models import GroupedSales, SalesHistory, SalesRecord, PerformanceData, PerformanceTable, TimePeriod
+from ..utils.periods import GRANULARITIES, format_period, periods_of
 from src.models import G_entity
+from .parallel_analysis import parallel_period_totals
+from .performance_cache import PerformanceCache, performance_cache
+from ..utils.clock import SessionClock, session_clock
 
 
 class PerformanceAnalyzer:
     """Feature 2: Analyze historical performance"""
 
-    def __init__(self):
+    def __init__(
+        self, cube_source=None, cache: PerformanceCache | None = None, clock: SessionClock | None = None
+    ):
         self.sales_data = []  # This will be set by the PerformanceCenter when initialized
+        # Anything with cube(entity_type) -> DemandCube (the EntityCatalog of the loaded data);
+        # when set, analyze() slices the cube instead of regrouping the raw sales
+        self.cube_source = cube_source
+        # LRU of analyze() results, used when the cube source has a data version (shared app-wide by default)
+        self.cache = cache if cache is not None else performance_cache
+        # "today" of analyses called without an explicit as_of
+        self.clock = clock if clock is not None else session_clock
 
     def analyze(
         self,
         analyzed_obj: G_entity,
         lookback_years: int = 3,
         granularity: str = "monthly",
+        as_of: date | None = None,
     ) -> PerformanceData:
         """Main analysis function to analyze performance for a given 12NC or Room
         input:
@@ -28,6 +42,7 @@ class PerformanceAnalyzer:
             - id_type: "12nc" or "room"
             - lookback_years: number of years to look back for analysis
             - granularity: "monthly" or "yearly"
+            - as_of: last day of the analyzed window (default: the clock's today)
         output:
             - PerformanceData object containing historical performance data
         """
@@ -35,35 +50,74 @@ class PerformanceAnalyzer:
             analyzed_obj.g_entity.sales_history
         )  # Assuming Room and TwelveNC have a sales_records attribute
 
-        end_date = datetime.now().date()
-        start_date = end_date - relativedelta(years=lookback_years)
-
-        filtered_sales = self._filter_sales(analyzed_obj, start_date, end_date)
+        start_date, end_date = self.lookback_window(lookback_years, as_of)
 
-       
+        version = getattr(self.cube_source, "version", None)
+        cache_key = (analyzed_obj.entity_type, analyzed_obj.g_entity.id, granularity, lookback_years, end_date)
+        if version is not None:
+            cached = self.cache.get(version, cache_key, self.sales_data)
+            if cached is not None:
+                return cached
 
-        grouped = self._group_by_period(filtered_sales, granularity)
-
-        periods = []  # List of TimePeriod objects for the performance data
-        for period_key in grouped.keys():
-            sales = grouped[period_key]
-            periods.append(TimePeriod(label=period_key, quantity=sum(s.quantity for s in sales)))
+        periods = self._cube_periods([analyzed_obj], start_date, end_date, granularity)
+        if periods is None:
+            filtered_sales = self._filter_sales(analyzed_obj, start_date, end_date)
+            periods = self._group_by_period(filtered_sales, granularity)
 
         total_qty = sum(p.quantity for p in periods)
         avg_qty = total_qty / len(periods) if periods else 0
 
-        # In the analyze() method, after creating periods:
-        periods = sorted(periods, key=lambda p: parse_period_label_for_sorting(p.label))
-            
-      
-
-        return PerformanceData(
+        performance_data = PerformanceData(
             g_entity=analyzed_obj,
             periods=periods,
             granularity=granularity,
             total=total_qty,
             average=avg_qty,
         )
+        if version is not None:
+            self.cache.put(version, cache_key, self.sales_data, performance_data)
+        return performance_data
+
+    def lookback_window(self, lookback_years: int, as_of: date | None = None) -> tuple[date, date]:
+        """Date range analyzed by a lookback
+        input:
+            - lookback_years: number of years to look back
+            - as_of: last day of the window (default: the clock's today)
+        output:
+            - (start_date, end_date), both inclusive
+        """
+        end_date = self.clock.resolve(as_of)
+        return end_date - relativedelta(years=lookback_years), end_date
+
+    def _cube_periods(
+        self, analyzed_objs: List[G_entity], start_date: date, end_date: date, granularity: str
+    ) -> List[TimePeriod] | None:
+        """Private method to read period totals from the demand cube
+        input:
+            - analyzed_objs: entities of one type, all covered by the cube
+            - start_date, end_date: the date range (inclusive)
+            - granularity: "monthly", "quarterly" or "yearly"
+        output:
+            - chronological TimePeriods of the summed rows (periods without any sale omitted),
+              or None when there is no cube or one of the entities is not in it
+        """
+        if self.cube_source is None or not analyzed_objs or granularity not in GRANULARITIES:
+            return None
+        entity_types = {analyzed_obj.entity_type for analyzed_obj in analyzed_objs}
+        if len(entity_types) != 1:
+            return None
+        cube = self.cube_source.cube(entity_types.pop())
+        rows = [cube.row(analyzed_obj.g_entity) for analyzed_obj in analyzed_objs]
+        if None in rows:
+            return None
+
+        indexes, quantities, present = cube.periods(rows, start_date, end_date, granularity)
+        totals = quantities.sum(axis=0).tolist()
+        return [
+            TimePeriod(label=format_period(index, granularity), quantity=total, index=index)
+            for index, total, has_sales in zip(indexes.tolist(), totals, present.any(axis=0).tolist())
+            if has_sales
+        ]
 
     def _filter_sales(
         self, analyzed_obj: G_entity, start_date: date, end_date: date
@@ -74,48 +128,135 @@ class PerformanceAnalyzer:
             - start_date: the start date for filtering
             - end_date: the end date for filtering
         output:
-            - List of SalesRecord that match the criteria
+            - SalesHistory (a sequence of SalesRecord) of the sales in the date range,
+              found by binary search on the date-sorted history
         """
         if not self.sales_data:
             raise ValueError("No sales data available for filtering")
-        relevnat_sales = []
-        for sale in self.sales_data:
-            if start_date <= sale.date <= end_date:
-                relevnat_sales.append(sale)
-        return relevnat_sales
-
-    def _group_by_period(
-        self, sales: List[SalesRecord], granularity: str
-    ) -> Dict[str, List[SalesRecord]]:
-        """Private method to group sales by time period based on the specified granularity,
+        return SalesHistory.from_records(self.sales_data).window(start_date, end_date)
+
+    def _group_by_period(self, sales: SalesHistory, granularity: str) -> List[TimePeriod]:
+        """Private method to total date-sorted sales per time period of the specified granularity,
         input:
-            - sales: List of SalesRecord to group
-            - granularity: "monthly" or "yearly"
+            - sales: SalesHistory to group
+            - granularity: "monthly", "quarterly" or "yearly" (anything else groups by year)
         output:
-            - Dictionary with period keys and corresponding sales records
+            - chronological TimePeriods of the periods with at least one sale
         """
-        groups = defaultdict(list)
+        if granularity not in GRANULARITIES:
+            granularity = "yearly"
+        if not len(sales):
+            return []
+        # Sorted dates give non-decreasing period numbers: each period is one run
+        indexes = periods_of(sales.dates, granularity)
+        starts = np.concatenate(([0], np.flatnonzero(np.diff(indexes)) + 1))
+        totals = np.add.reduceat(sales.quantities, starts)
+        return [
+            TimePeriod(label=format_period(index, granularity), quantity=total, index=index)
+            for index, total in zip(indexes[starts].tolist(), totals.tolist())
+        ]
+
+    def aggregate(
+        self,
+        analyzed_objs: List[G_entity],
+        lookback_years: int = 3,
+        granularity: str = "monthly",
+        as_of: date | None = None,
+    ) -> List[TimePeriod]:
+        """Summed period quantities of many entities of one type (bulk views)
+        input:
+            - analyzed_objs: List of Room or TwelveNC objects of the same entity_type
+            - lookback_years: number of years to look back for analysis
+            - granularity: "monthly", "quarterly" or "yearly"
+            - as_of: last day of the window (default: the clock's today)
+        output:
+            - chronological TimePeriods; with a demand cube this is one row-sum over the
+              selected entities, otherwise each entity is analyzed and the periods are added up
+        """
+        start_date, end_date = self.lookback_window(lookback_years, as_of)
+        periods = self._cube_periods(analyzed_objs, start_date, end_date, granularity)
+        if periods is not None:
+            return periods
+
+        totals: Dict[int, int] = defaultdict(int)
+        labels: Dict[int, str] = {}
+        for analyzed_obj in analyzed_objs:
+            if not analyzed_obj.g_entity.sales_history:
+                continue
+            try:
+                performance_data = self.analyze(analyzed_obj, lookback_years, granularity, as_of)
+            except Exception as e:
+                print(f"Error analyzing entity '{analyzed_obj}': {e}")
+                continue
+            for period in performance_data.periods:
+                totals[period.index] += period.quantity
+                labels[period.index] = period.label
+        return [TimePeriod(label=labels[index], quantity=totals[index], index=index) for index in sorted(totals)]
 
-        for sale in sales:
-            key = get_period_key(sale.date, granularity)
-            groups[key].append(sale)
+    def analyze_all(
+        self,
+        entity_type: str,
+        entity_ids: Sequence[str] | Literal["all"] = "all",
+        lookback_years: int = 3,
+        granularity: str = "monthly",
+        as_of: date | None = None,
+    ) -> PerformanceTable:
+        """Period totals of many entities in one vectorized pass over the demand cube
+        input:
+            - entity_type: "room" or "12NC"
+            - entity_ids: IDs to analyze (rows keep this order), or "all" for every entity of the type
+            - lookback_years: number of years to look back for analysis
+            - granularity: "monthly", "quarterly" or "yearly"
+            - as_of: last day of the window (default: the clock's today)
+        output:
+            - PerformanceTable: entities x periods quantities (every period of the window), with
+              per-entity totals and averages (total / periods with a sale, as in analyze())
+        """
+        if self.cube_source is None:
+            raise ValueError("analyze_all needs a cube_source (the EntityCatalog of the loaded data)")
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"Unknown granularity: {granularity}")
+        cube = self.cube_source.cube(entity_type)
+        if isinstance(entity_ids, str) and entity_ids == "all":
+            ids, rows = list(cube.ids), range(len(cube.ids))
+        else:
+            ids = list(entity_ids)
+            unknown = [entity_id for entity_id in ids if entity_id not in cube.positions]
+            if unknown:
+                raise ValueError(f"Unknown {entity_type} IDs: {', '.join(unknown[:5])}")
+            rows = [cube.positions[entity_id] for entity_id in ids]
 
-        return groups
+        start_date, end_date = self.lookback_window(lookback_years, as_of)
+        periods, quantities, present = cube.periods(rows, start_date, end_date, granularity)
+        totals = quantities.sum(axis=1)
+        counts = present.sum(axis=1)
+        averages = np.divide(totals, counts, out=np.zeros(len(ids)), where=counts > 0)
+        return PerformanceTable(entity_type, granularity, ids, periods, quantities, totals, averages)
 
     def multi_item_analyze(
         self,
         analyzed_objs: List[G_entity],
         lookback_years: int = 3,
         granularity: str = "monthly",
+        as_of: date | None = None,
+        workers: int = 1,
     ) -> Dict[str, List[PerformanceData]]:
         """Analyze multiple items:
         input:
             - analyzed_objs: List of Room or TwelveNC objects to analyze
             - lookback_years: number of years to look back for analysis
             - granularity: "monthly" or "yearly"
+            - as_of: last day of the analyzed windows (default: the clock's today)
+            - workers: with more than 1, the period totals are computed by that many worker
+              processes over shared-memory sales arrays (see parallel_analysis); the pool and
+              the catalog's shared sales are kept for later calls, so the first call pays
+              the start-up
         output:
-            - dictionary of PerformanceData for each analyzed object
+            - dictionary of PerformanceData for each analyzed object, keyed by entity ID
         """
+        if workers > 1 and analyzed_objs:
+            return self._multi_item_analyze_parallel(analyzed_objs, lookback_years, granularity, as_of, workers)
+
         results = defaultdict(list)
         for analyzed_obj in analyzed_objs:
             try:
@@ -123,8 +264,76 @@ class PerformanceAnalyzer:
                     analyzed_obj=analyzed_obj,
                     lookback_years=lookback_years,
                     granularity=granularity,
+                    as_of=as_of,
+                )
+                results[analyzed_obj.g_entity.id].append(performance_data)
+            except Exception as e:
+                print(f"Error analyzing entity '{analyzed_obj}': {e}")
+
+        return results
+
+    def _multi_item_analyze_parallel(
+        self,
+        analyzed_objs: List[G_entity],
+        lookback_years: int,
+        granularity: str,
+        as_of: date | None,
+        workers: int,
+    ) -> Dict[str, List[PerformanceData]]:
+        """Private method for multi_item_analyze(workers > 1): same results as the serial loop"""
+        period_granularity = granularity if granularity in GRANULARITIES else "yearly"
+        start_date, end_date = self.lookback_window(lookback_years, as_of)
+
+        # Entities the cube source covers are read from its flat sales arrays (shared with the
+        # workers once per load); the others are stacked for this call
+        sales_row = getattr(self.cube_source, "sales_row", None)
+        covered = defaultdict(list)  # entity type -> [(position in analyzed_objs, sales row)]
+        uncovered = []
+        for position, analyzed_obj in enumerate(analyzed_objs):
+            row = sales_row(analyzed_obj.entity_type, analyzed_obj.g_entity) if sales_row else None
+            if row is None:
+                uncovered.append(position)
+            else:
+                covered[analyzed_obj.entity_type].append((position, row))
+        sources = [(self.cube_source.sales(entity_type), pairs) for entity_type, pairs in covered.items()]
+        if uncovered:
+            stacked = GroupedSales.from_histories(
+                [analyzed_objs[position].g_entity.id for position in uncovered],
+                [analyzed_objs[position].g_entity.sales_history for position in uncovered],
+            )
+            sources.append((stacked, [(position, row) for row, position in enumerate(uncovered)]))
+
+        quantities = [None] * len(analyzed_objs)
+        present = [None] * len(analyzed_objs)
+        for sales, pairs in sources:
+            indexes, source_quantities, source_present = parallel_period_totals(
+                sales, [row for _, row in pairs], start_date, end_date, period_granularity, workers
+            )
+            for (position, _), row_quantities, row_present in zip(pairs, source_quantities, source_present):
+                quantities[position], present[position] = row_quantities, row_present
+        indexes = indexes.tolist()
+        labels = [format_period(index, period_granularity) for index in indexes]
+
+        results = defaultdict(list)
+        for analyzed_obj, row_quantities, row_present in zip(analyzed_objs, quantities, present):
+            try:
+                if not analyzed_obj.g_entity.sales_history:
+                    raise ValueError("No sales data available for filtering")
+                columns = np.flatnonzero(row_present).tolist()
+                row_quantities = row_quantities.tolist()
+                periods = [
+                    TimePeriod(label=labels[column], quantity=row_quantities[column], index=indexes[column])
+                    for column in columns
+                ]
+                total_qty = sum(p.quantity for p in periods)
+                performance_data = PerformanceData(
+                    g_entity=analyzed_obj,
+                    periods=periods,
+                    granularity=granularity,
+                    total=total_qty,
+                    average=total_qty / len(periods) if periods else 0,
                 )
-                results[analyzed_obj].append(performance_data)
+                results[analyzed_obj.g_entity.id].append(performance_data)
             except Exception as e:
                 print(f"Error analyzing entity '{analyzed_obj}': {e}")
 
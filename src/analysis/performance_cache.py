@@ -0,0 +1,92 @@
+"""Bounded LRU cache of PerformanceData, invalidated by data loads
+
+Entries are keyed by (data version, entity type, entity ID, granularity,
+lookback years, as-of date). The data version comes from the EntityCatalog
+each load builds; the first lookup with a newer version drops every older
+entry. Cached PerformanceData objects are shared between callers and must
+be treated as read-only.
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date
+from typing import Tuple
+
+from ..models import PerformanceData, SalesHistory
+
+PERFORMANCE_CACHE_SIZE = 4096
+
+CacheKey = Tuple[str, str, str, int, date]  # entity type, entity ID, granularity, lookback years, as-of
+
+
+@dataclass
+class PerformanceCacheStats:
+    """Counters of one PerformanceCache"""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0  # entries dropped to stay within max_entries
+    invalidations: int = 0  # data version changes (each drops every entry)
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"{self.hits:,} hits / {self.misses:,} misses ({self.hit_rate:.0%}), "
+            f"{self.evictions:,} evictions, {self.invalidations:,} invalidations"
+        )
+
+
+class PerformanceCache:
+    """LRU of analysis results for the currently loaded data"""
+
+    def __init__(self, max_entries: int = PERFORMANCE_CACHE_SIZE):
+        """
+        Args:
+            max_entries: Maximum number of cached PerformanceData
+        """
+        self.max_entries = max_entries
+        self.version = 0
+        # key -> (sales history analyzed, result); the history guards against replaced entity sales
+        self._entries: OrderedDict[CacheKey, Tuple[SalesHistory, PerformanceData]] = OrderedDict()
+        self.stats = PerformanceCacheStats()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _sync(self, version: int) -> bool:
+        """Move to a newer data version; False for lookups against an older one"""
+        if version > self.version:
+            self._entries.clear()
+            self.version = version
+            self.stats.invalidations += 1
+        return version == self.version
+
+    def get(self, version: int, key: CacheKey, sales_history) -> PerformanceData | None:
+        """Cached result for key, if computed from this data version and these sales"""
+        entry = self._entries.get(key) if self._sync(version) else None
+        if entry is None or entry[0] is not sales_history:
+            self.stats.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return entry[1]
+
+    def put(self, version: int, key: CacheKey, sales_history, performance_data: PerformanceData) -> None:
+        if not self._sync(version) or self.max_entries <= 0:
+            return
+        self._entries[key] = (sales_history, performance_data)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+# Shared by every analyzer of the app: the screens and panels analyze the same entities
+performance_cache = PerformanceCache()
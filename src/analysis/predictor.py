@@ -1,21 +1,24 @@
-from typing import List
-from datetime import date, datetime
+from typing import Dict, List
+from datetime import date
 from src.models.performance import TimePeriod
 from ..models import PerformanceData, Prediction
-from ..utils import get_next_period_label
+from ..utils.clock import SessionClock, session_clock
+from ..utils.periods import current_period, parse_period, same_period_last_year
 
 
 class Predictor:
     """Feature 3: Predict future demand based on historical performance"""
 
-    def __init__(self, performance_data: PerformanceData):
+    def __init__(self, performance_data: PerformanceData, clock: SessionClock | None = None):
         """
         Initialize predictor with historical performance data
 
         Args:
             performance_data: PerformanceData object with historical periods
+            clock: "today" of predictions made without an explicit as_of (default: the session clock)
         """
         self.performance_data = performance_data
+        self.clock = clock if clock is not None else session_clock
 
     def predict(
         self,
@@ -23,6 +26,7 @@ class Predictor:
         method: str = "avg_last_n_periods",
         buffer_percentage: float = 10.0,
         n_periods: int = 11,
+        as_of: date | None = None,
     ) -> Prediction:
         """
         Predict demand for the next period
@@ -32,6 +36,8 @@ class Predictor:
             method: Prediction method ("avg_same_period_previous_years", "avg_last_n_periods")
             buffer_percentage: Safety buffer percentage to add
             n_periods: Number of periods to average (only used for "avg_last_n_periods" method)
+            as_of: Date the prediction is made at; target_time must be after its period
+                (default: the clock's today)
 
         Returns:
             Prediction object with forecasted quantity
@@ -42,7 +48,7 @@ class Predictor:
         granularity = self.performance_data.granularity
 
         # Validate target_time is in the future (format depends on granularity)
-        self._validate_future_target(target_time, granularity)
+        self._validate_future_target(target_time, granularity, self.clock.resolve(as_of))
 
         # Calculate baseline prediction based on method
         if method == "avg_same_period_previous_years":
@@ -64,34 +70,28 @@ class Predictor:
             method=method,
         )
 
-    def _validate_future_target(self, target_time: str, granularity: str) -> None:
-        """Validate that target_time is in the future based on granularity format"""
-        today = date.today()
-
+    def _validate_future_target(self, target_time: str, granularity: str, as_of: date | None = None) -> None:
+        """Validate that target_time is after the period containing as_of (default: the clock's today)"""
         try:
-            if granularity == "monthly":
-                # Format: MM-YYYY
-                target_date = datetime.strptime(target_time, "%m-%Y").date()
-                # Check if it's a future month
-                if target_date.year < today.year or (target_date.year == today.year and target_date.month <= today.month):
-                    raise ValueError("Target time must be in the future")
-            elif granularity == "quarterly":
-                # Format: YYYY-QN (e.g., "2026-Q2")
-                year = int(target_time[:4])
-                quarter = int(target_time[-1])
-                current_quarter = (today.month - 1) // 3 + 1
-                if year < today.year or (year == today.year and quarter <= current_quarter):
-                    raise ValueError("Target time must be in the future")
-            elif granularity == "yearly":
-                # Format: YYYY (e.g., "2027")
-                year = int(target_time)
-                if year <= today.year:
-                    raise ValueError("Target time must be in the future")
-        except ValueError as e:
-            if "Target time must be in the future" in str(e):
-                raise
+            target = parse_period(target_time, granularity)
+        except ValueError:
             # If parsing fails, skip validation (let downstream handle it)
-            pass
+            return
+        if target <= current_period(granularity, self.clock.resolve(as_of)):
+            raise ValueError("Target time must be in the future")
+
+    def _period_quantities(self, granularity: str) -> Dict[int, float]:
+        """{period number: quantity} of the historical periods (labels parsed only if the analyzer set no number)"""
+        quantities = {}
+        for p in self.performance_data.periods:
+            index = p.index
+            if index is None:
+                try:
+                    index = parse_period(p.label, granularity)
+                except ValueError:
+                    continue
+            quantities[index] = float(p.quantity)
+        return quantities
 
     def _predict_avg_same_period_previous_years(self, target_time: str, granularity: str) -> float:
         """Predict based on average of the same period in previous years
@@ -114,33 +114,28 @@ class Predictor:
                 else self.performance_data.average
             )
 
-        elif granularity == "monthly":
-            # for monthly, average the target month from previous n years
-            recent = self.performance_data.periods
-            target_month = target_time[:2]  # Extract month from MM-YYYY format
-            matching_months = [float(p.quantity) for p in recent if p.label[:2] == target_month]
+        elif granularity in ("monthly", "quarterly"):
+            # average the target month / quarter over the previous years: step back one year at a time
+            try:
+                period = parse_period(target_time, granularity)
+            except ValueError:
+                return self.performance_data.average
+            quantities = self._period_quantities(granularity)
+            if not quantities:
+                return self.performance_data.average
+            first = min(quantities)
+            matching = []
+            period = same_period_last_year(period, granularity)
+            while period >= first:
+                if period in quantities:
+                    matching.append(quantities[period])
+                period = same_period_last_year(period, granularity)
             return (
-                sum(matching_months) / len(matching_months)
-                if matching_months
+                sum(matching) / len(matching)
+                if matching
                 else self.performance_data.average
             )
 
-        elif granularity == "quarterly":
-            # for quarterly, average the target quarter from previous n years
-            recent = self.performance_data.periods
-            target_month = target_time[:2]  # Extract month from MM-YYYY format
-            target_quarter = int((int(target_month) - 1) / 3) + 1  # Convert month to quarter
-            matching_quarters = [
-                float(p.quantity)
-                for p in recent
-                if int((int(p.label[:2]) - 1) / 3) + 1 == target_quarter
-            ]
-            return (
-                sum(matching_quarters) / len(matching_quarters)
-                if matching_quarters
-                else self.performance_data.average
-            )
-        
         # Default fallback
         return self.performance_data.average
 
@@ -189,7 +184,11 @@ class Predictor:
             )
 
     def multi_period_predict(
-        self, periods: List[TimePeriod], method: str = "average", buffer_percentage: float = 10.0
+        self,
+        periods: List[TimePeriod],
+        method: str = "average",
+        buffer_percentage: float = 10.0,
+        as_of: date | None = None,
     ) -> List[Prediction]:
         """
         Predict demand for multiple future periods
@@ -198,6 +197,7 @@ class Predictor:
             periods: List of future periods to predict
             method: Prediction method
             buffer_percentage: Safety buffer percentage
+            as_of: Date the predictions are made at (default: the clock's today)
 
         Returns:
             List of Prediction objects
@@ -205,7 +205,7 @@ class Predictor:
         predictions = []
 
         for i in periods:
-            prediction = self.predict(i.label, method, buffer_percentage)
+            prediction = self.predict(i.label, method, buffer_percentage, as_of=as_of)
             predictions.append(prediction)
 
             # For subsequent predictions, we could update the baseline
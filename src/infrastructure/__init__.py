@@ -1,8 +1,12 @@
 """Infrastructure layer - data loading and external system interactions"""
 
-from .data_loaders import load_cbom, read_file
+from .data_loaders import FileReadError, load_bom, load_cbom, read_bom, read_file, read_table
 
 __all__ = [
+    'FileReadError',
+    'load_bom',
     'load_cbom',
+    'read_bom',
     'read_file',
+    'read_table',
 ]
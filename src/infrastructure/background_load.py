@@ -0,0 +1,117 @@
+"""Run load_dataset on a worker thread and report progress through a queue
+
+Tk widgets must only be touched from the main thread, so the worker never calls
+back into the UI. It posts LoadEvents to a queue instead, and the screen drains
+that queue from an after() poll.
+"""
+
+import logging
+import queue
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List
+
+from ..services.entity_catalog import EntityCatalog
+from .data_loaders import FileReadError
+from .data_pipeline import LoadCancelled, load_dataset
+from .parse_cache import ParseCache
+
+logger = logging.getLogger(__name__)
+
+# Overall progress once the entities are built and the catalog is being indexed
+CATALOG_PROGRESS = 0.95
+
+
+@dataclass
+class LoadEvent:
+    """One progress / result message from a BackgroundLoad
+
+    kind is one of:
+        'stage'     - message and progress (0-1) of a new load stage
+        'rows'      - payload is (file type, rows read so far)
+        'error'     - payload is the FileReadError of a skipped sales file
+        'done'      - payload is the EntityCatalog of the loaded rooms and 12NCs
+        'failed'    - payload is the exception that ended the load
+        'cancelled' - the load stopped after cancel()
+    """
+
+    kind: str
+    message: str = ""
+    progress: float | None = None
+    payload: Any = None
+
+
+class BackgroundLoad:
+    """A single load of the CBOM, YMBD and FIT_CVI files on a daemon thread"""
+
+    def __init__(self, file_paths: Dict[str, str], config, cache: ParseCache | None = None):
+        """
+        Args:
+            file_paths: {'cbom': path, 'ymbd': path, 'fit_cvi': path}
+            config: Configuration dictionary
+            cache: ParseCache to use, or None to always parse
+        """
+        self.file_paths = dict(file_paths)
+        self.config = config
+        self.cache = cache
+        self.events: "queue.Queue[LoadEvent]" = queue.Queue()
+        self.cancel_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> "BackgroundLoad":
+        self._thread = threading.Thread(target=self._run, name="data-load", daemon=True)
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        """Ask the load to stop at the next stage or chunk boundary"""
+        self.cancel_event.set()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def join(self, timeout: float | None = None):
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def poll(self) -> List[LoadEvent]:
+        """All events posted since the last poll (never blocks)"""
+        events = []
+        while True:
+            try:
+                events.append(self.events.get_nowait())
+            except queue.Empty:
+                return events
+
+    def _post(self, kind: str, message: str = "", progress: float | None = None, payload=None):
+        self.events.put(LoadEvent(kind, message, progress, payload))
+
+    def _run(self):
+        try:
+            rooms, nc12s = load_dataset(
+                self.file_paths,
+                self.config,
+                cache=self.cache,
+                on_stage=lambda message, progress: self._post("stage", message, progress),
+                on_error=lambda error: self._post("error", error.message, payload=error),
+                on_rows=lambda file_type, rows: self._post("rows", payload=(file_type, rows)),
+                cancel_event=self.cancel_event,
+            )
+            # The catalog's lookups and indexes cost O(sales records): build them here,
+            # not on the Tk thread
+            if not self.cancel_event.is_set():
+                self._post("stage", "Indexing entities...", CATALOG_PROGRESS)
+                catalog = EntityCatalog(rooms, nc12s)
+        except LoadCancelled:
+            self._post("cancelled", "Loading cancelled")
+        except (FileReadError, ValueError) as e:
+            self._post("failed", str(e), payload=e)
+        except Exception as e:
+            logger.exception("Loading files failed")
+            self._post("failed", str(e), payload=e)
+        else:
+            if self.cancel_event.is_set():
+                self._post("cancelled", "Loading cancelled")
+            else:
+                self._post("done", progress=1.0, payload=catalog)
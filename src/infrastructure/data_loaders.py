@@ -1,25 +1,46 @@
 # Standard library imports
 import re
 import os
+import numpy as np
 import pandas as pd
 import logging
 from pathlib import Path
 from tkinter import messagebox
 
+from openpyxl import load_workbook
+
+from ..models.bom import BillOfMaterials
+
 # Use relative imports for utility functions
 from ..utils import (
-    col_letter_to_index,
+    AppConfig,
     file_in_use,
-    normalize_identifier,
+    normalize_identifiers,
+    validate_identifiers,
     find_column_by_canon,
-    load_config,
+    get_config,
     pick_sheet,
 )
 
 
+class FileReadError(Exception):
+    """An input file could not be read; title/message are suitable for an error dialog"""
+
+    def __init__(self, title: str, message: str):
+        super().__init__(title, message)
+        self.title = title
+        self.message = message
+
+    def __str__(self) -> str:
+        return self.message
+
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Rows per DataFrame yielded by the read-only Excel reader
+DEFAULT_EXCEL_BATCH_SIZE = 50_000
+
 
 def load_cbom(cbom_path, config) -> tuple[dict, dict]:
     """
@@ -32,260 +53,232 @@ def load_cbom(cbom_path, config) -> tuple[dict, dict]:
     Output:
     - room_data: Dictionary {room_number: room_description, tncs['12NC (normalized)', '12NC (original)', '12NC_Description', 'Quantity']}}
     - data_12nc: Dictionary {12nc_number:  12nc_description, IGT 12NC, rooms['Room(normalized)','Room(original)', 'Room_Description', 'Quantity']}}
+
+    Both dictionaries are derived from the sparse store returned by load_bom, so
+    only positive quantities are listed.
     """
+    bom = load_bom(cbom_path, config)
+    if bom is None:
+        return {}, {}
+    return bom_to_cbom_data(bom)
 
-    # Initialize dictionaries to hold data
-    room_data = {}
-    data_12nc = {}
 
-    cbom_config = config["cbom"]
-    # Get configuration values
-    room_col_start = cbom_config["columns"].get("room_start", "G")
-    room_num_row = cbom_config["rows"].get("room_numbers", 5)
-    room_desc_row = cbom_config["rows"].get("room_descriptions", 4)
-    nc12_col = cbom_config["columns"].get("12nc", "C")
-    nc12_desc_col = cbom_config["columns"].get("12nc_description", "D")
-    nc12_igt_col = cbom_config["columns"].get("IGT_12nc", "A")
-    nc12_row_start = cbom_config["rows"].get("12nc_start", 9)
+def load_bom(cbom_path, config) -> BillOfMaterials | None:
+    """
+    Reads the CBOM Excel file into the sparse BillOfMaterials store.
 
+    Input:
+    - cbom_path: Path to the CBOM Excel file
+    - config: Configuration dictionary with CBOM structure settings
+
+    Output:
+    - BillOfMaterials, or None if the file could not be read
+    """
     df = read_file(cbom_path, "cbom", header=None)
     if df is None:
-        return room_data, data_12nc
-
-    room_col_idx = col_letter_to_index(room_col_start)
-    nc12_col_idx = col_letter_to_index(nc12_col)
-    nc12_desc_col_idx = col_letter_to_index(nc12_desc_col)
-    nc12_igt_col_idx = col_letter_to_index(nc12_igt_col)
-    # Convert 1-indexed rows to 0-indexed
-    room_num_row_idx = room_num_row - 1
-    room_desc_row_idx = room_desc_row - 1
-    nc12_row_start_idx = nc12_row_start - 1
-
-    # Extract room information (starting from room_col_start)
-    room_numbers = df.iloc[room_num_row_idx, room_col_idx:].values
-    room_descriptions = df.iloc[room_desc_row_idx, room_col_idx:].values
-
-    # Extract 12NC information (starting from nc12_row_start)
-    nc12_numbers = df.iloc[nc12_row_start_idx:, nc12_col_idx].values
-    nc12_descriptions = df.iloc[nc12_row_start_idx:, nc12_desc_col_idx].values
-    nc12_igts = df.iloc[nc12_row_start_idx:, nc12_igt_col_idx].values
-
-    # Extract the quantity matrix (from nc12_row_start, room columns onwards)
-    quantity_matrix = df.iloc[nc12_row_start_idx:, room_col_idx:].values
-
-    ############################
-    # Process data for each room
-    ############################
-    valid_room_count = 0
-    seen_rooms = set()
-    for room_idx, room_num in enumerate(room_numbers):
-        if pd.isna(room_num):
-            continue
-
-        room_num_normalized = normalize_identifier(room_num)  # dict key
-
-        room_description = (  # value to store in room_data for this room
-            str(room_descriptions[room_idx]).strip()
-            if not pd.isna(room_descriptions[room_idx])
-            else ""
-        )
-
-        if not room_num_normalized or not re.match(
-            config["validation"]["patterns"]["room_normalized"], room_num_normalized
-        ):  # Validate normalized room format (e.g., "ROOM123")
-            continue
+        return None
+    return parse_cbom_matrix(df, config)
 
-        # Check for duplicates
-        if room_num_normalized not in seen_rooms:
-            seen_rooms.add(room_num_normalized)
-        else:
-            continue
 
-        valid_room_count += 1
-        # Collect all 12NCs for this room
-        room_12ncs = []
-        for nc12_idx, nc12_num in enumerate(nc12_numbers):
-            if pd.isna(nc12_num):
-                continue
+def read_bom(cbom_path, config, on_read=None) -> BillOfMaterials:
+    """
+    Like load_bom, but raises FileReadError instead of showing a dialog (for worker processes).
 
-            nc12_num_normalized = normalize_identifier(nc12_num)
+    on_read is an optional callback run between reading the sheet and parsing it; it may
+    raise to abandon the parse (cancelled loads).
+    """
+    df = read_table(cbom_path, "cbom", header=None, config=config)
+    if on_read is not None:
+        on_read()
+    return parse_cbom_matrix(df, config)
 
-            # Validate normalized format (12 digits)
-            if (
-                not re.match(
-                    config["validation"]["patterns"]["12nc_normalized"], nc12_num_normalized
-                )
-            ) or (not nc12_num_normalized):
-                continue
-
-            quantity = quantity_matrix[nc12_idx, room_idx]
-
-            # Only include if quantity exists and is not zero
-            if pd.isna(quantity):
-                quantity = 0
-            nc12_igt = str(nc12_igts[nc12_idx]).strip() if not pd.isna(nc12_igts[nc12_idx]) else ""
-            nc12_desc = (
-                str(nc12_descriptions[nc12_idx]).strip()
-                if not pd.isna(nc12_descriptions[nc12_idx])
-                else ""
-            )
 
-            room_12ncs.append(
-                {
-                    "12NC": nc12_num_normalized,  # Store normalized version
-                    "Quantity": quantity,
-                }
-            )
+def bom_to_cbom_data(bom: BillOfMaterials) -> tuple[dict, dict]:
+    """
+    Expands the sparse store into the per-entity room_data / data_12nc dictionaries.
 
-        # Create DataFrame for this room (use normalized room number as key)
-        if room_12ncs:
-            room_data[room_num_normalized] = {
-                "description": room_description,
-                "tnc_list": pd.DataFrame(room_12ncs),
+    A room (12NC) is listed as soon as there is any 12NC (room) to pair it with,
+    even if none of its quantities is positive.
+    """
+    room_data = {}
+    data_12nc = {}
+    nc12_id_array = np.asarray(bom.nc12_ids, dtype=object)
+    room_id_array = np.asarray(bom.room_ids, dtype=object)
+
+    if bom.nc12_ids:
+        for room_code, room_id in enumerate(bom.room_ids):
+            nc12_codes, quantities = bom.room_row(room_code)
+            room_data[room_id] = {
+                "description": bom.room_descriptions[room_code],
+                "tnc_list": pd.DataFrame(
+                    {"12NC": nc12_id_array[nc12_codes], "Quantity": quantities}
+                ),
             }
 
-    ############################
-    # Process data for each 12NC
-    ############################
-    valid_12nc_count = 0
-    seen_12ncs = set()
-
-    for nc12_idx, nc12_num in enumerate(nc12_numbers):
-        if pd.isna(nc12_num):
-            continue
-
-        nc12_num_str = str(nc12_num).strip()
+    if bom.room_ids:
+        for nc12_code, nc12_id in enumerate(bom.nc12_ids):
+            room_codes, quantities = bom.nc12_column(nc12_code)
+            data_12nc[nc12_id] = {
+                "12NC_Description": bom.nc12_descriptions[nc12_code],
+                "12NC_IGT": bom.nc12_igts[nc12_code],
+                "room_list": pd.DataFrame({"Room": room_id_array[room_codes], "Quantity": quantities}),
+            }
 
-        nc12_num_normalized = normalize_identifier(nc12_num_str)  # dict key
+    return room_data, data_12nc
 
-        # Validate normalized format (12 digits)
-        if not re.match(config["validation"]["patterns"]["12nc_normalized"], nc12_num_normalized):
-            continue
 
-        # Check for duplicates
-        if nc12_num_normalized not in seen_12ncs:
-            seen_12ncs.add(nc12_num_normalized)
-        else:
-            continue
-
-        valid_12nc_count += 1
+def parse_cbom_matrix(df: pd.DataFrame, config) -> BillOfMaterials:
+    """
+    Parses a raw (header-less) CBOM sheet into the sparse BillOfMaterials store.
 
-        # Get 12NC description and IGT
-        nc12_desc = (  # value to store in data_12nc for this 12NC
-            str(nc12_descriptions[nc12_idx]).strip()
-            if not pd.isna(nc12_descriptions[nc12_idx])
-            else ""
-        )
-        nc12_igt = (
-            str(nc12_igts[nc12_idx]).strip() if not pd.isna(nc12_igts[nc12_idx]) else ""
-        )  # Store IGT 12NC if available
+    The room header row and the 12NC column are normalized and validated once, the
+    quantity matrix is masked in NumPy, and every positive cell becomes one
+    (room, 12NC, quantity) triple. Duplicate rooms or 12NCs keep their first
+    occurrence; quantities are truncated to integers.
 
-        # Collect all rooms for this 12NC
-        nc12_rooms = []
-        for room_idx, room_num in enumerate(room_numbers):
-            if pd.isna(room_num):
-                continue
-            room_num_normalized = normalize_identifier(room_num)
+    Input:
+    - df: CBOM sheet as read with header=None
+    - config: Configuration dictionary with CBOM structure settings
 
-            if not room_num_normalized:  # Skip empty normalized values
-                continue
+    Output:
+    - BillOfMaterials with rooms and 12NCs coded in sheet order
+    """
+    config = AppConfig.of(config)
+    cbom_config = config["cbom"]
+    # Get configuration values (column letters are converted once, in AppConfig)
+    room_col_idx = config.cbom_columns["room_start"]
+    nc12_col_idx = config.cbom_columns["12nc"]
+    nc12_desc_col_idx = config.cbom_columns["12nc_description"]
+    nc12_igt_col_idx = config.cbom_columns["IGT_12nc"]
+    # Convert 1-indexed rows to 0-indexed
+    room_num_row_idx = cbom_config["rows"].get("room_numbers", 5) - 1
+    room_desc_row_idx = cbom_config["rows"].get("room_descriptions", 4) - 1
+    nc12_row_start_idx = cbom_config["rows"].get("12nc_start", 9) - 1
+
+    # Header row and ID column, handled once as arrays
+    room_numbers = df.iloc[room_num_row_idx, room_col_idx:].to_numpy()
+    room_descriptions = df.iloc[room_desc_row_idx, room_col_idx:].to_numpy()
+    nc12_numbers = df.iloc[nc12_row_start_idx:, nc12_col_idx].to_numpy()
+    nc12_descriptions = df.iloc[nc12_row_start_idx:, nc12_desc_col_idx].to_numpy()
+    nc12_igts = df.iloc[nc12_row_start_idx:, nc12_igt_col_idx].to_numpy()
+
+    valid_cols, room_ids = _first_valid_identifiers(room_numbers, config.room_pattern)
+    valid_rows, nc12_ids = _first_valid_identifiers(nc12_numbers, config.nc12_pattern)
+
+    # Quantity sub-matrix of valid 12NC rows x valid room columns
+    quantity_matrix = df.iloc[nc12_row_start_idx:, room_col_idx:].to_numpy()
+    cells = quantity_matrix[np.ix_(valid_rows, valid_cols)].ravel()
+    numeric = pd.to_numeric(pd.Series(cells, dtype=object), errors="coerce").to_numpy(dtype=float)
+    numeric = np.trunc(np.nan_to_num(numeric, nan=0.0))
+    positive = np.flatnonzero(numeric > 0)
+    nc12_codes, room_codes = (
+        np.divmod(positive, len(valid_cols)) if len(valid_cols) else (positive, positive)
+    )
+
+    return BillOfMaterials.from_triples(
+        room_ids,
+        nc12_ids,
+        room_codes,
+        nc12_codes,
+        numeric[positive],
+        room_descriptions=_clean_text(room_descriptions[valid_cols]),
+        nc12_descriptions=_clean_text(nc12_descriptions[valid_rows]),
+        nc12_igts=_clean_text(nc12_igts[valid_rows]),
+    )
+
+
+def _first_valid_identifiers(values, regex: re.Pattern) -> tuple[np.ndarray, list[str]]:
+    """Normalize and validate an ID array, keeping the first occurrence of each ID
+
+    Returns the positions of the kept values and their normalized IDs.
+    """
+    normalized = normalize_identifiers(values)
+    keep = validate_identifiers(normalized, regex) & ~pd.Series(normalized).duplicated().to_numpy()
+    positions = np.flatnonzero(keep)
+    return positions, normalized[positions].tolist()
 
-            quantity = quantity_matrix[nc12_idx, room_idx]
 
-            if pd.isna(quantity):
-                quantity = 0
+def _clean_text(values) -> list[str]:
+    """Strip text cells, turning empty (NaN) cells into empty strings"""
+    return ["" if pd.isna(value) else str(value).strip() for value in values]
 
-            room_desc = (
-                str(room_descriptions[room_idx]).strip()
-                if not pd.isna(room_descriptions[room_idx])
-                else ""
-            )
 
-            nc12_rooms.append(
-                {
-                    "Room": room_num_normalized,  # Store normalized version
-                    "Quantity": quantity,
-                }
-            )
+def read_file(
+    path: Path, file_type: str, header=None, converters=None, chunksize: int | None = None
+):
+    """
+    Reads an Excel or CSV file into a DataFrame, handling different formats and errors.
+    Meant primarily to be used for reading FIT_CVI files but can be used for other file types as well with appropriate configuration.
 
-        # Create DataFrame for this 12NC (use normalized 12NC as key)
-        if nc12_rooms:
-            data_12nc[nc12_num_normalized] = {
-                "12NC_Description": nc12_desc,
-                "12NC_IGT": nc12_igt,
-                "room_list": pd.DataFrame(nc12_rooms),
-            }
+    Errors are shown in a message box; see read_table for the arguments and reading modes.
 
-    return room_data, data_12nc
+    Returns:
+        pd.DataFrame: The contents of the file as a DataFrame (or an iterator of DataFrame
+        chunks in streaming mode), or None if an error occurred.
+    """
+    try:
+        return read_table(path, file_type, header=header, converters=converters, chunksize=chunksize)
+    except FileReadError as e:
+        messagebox.showerror(e.title, e.message)
+        return None
 
 
-def read_file(path: Path, file_type: str, header=None, converters=None) -> pd.DataFrame | None:
+def read_table(
+    path: Path, file_type: str, header=None, converters=None, chunksize: int | None = None, config=None
+):
     """
-    Reads an Excel or CSV file into a DataFrame, handling different formats and errors.
-    Meant primarily to be used for reading FIT_CVI files but can be used for other file types as well with appropriate configuration.
+    Reads an Excel or CSV file into a DataFrame, raising FileReadError instead of showing dialogs.
+    Safe to call from worker threads and processes; read_file is the interactive wrapper.
 
     Args:
         path (Path): The path to the file to read.
         file_type (str): The type of the file ('excel' or 'csv').
         header (int, list of int, None): Row(s) to use as the column names. Defaults to None.
         converters (dict, optional): Dict of functions for converting values in certain columns. Keys can be integers or column labels.
+        config (dict, optional): Configuration (the cached config.json, see get_config, if omitted).
+
+    With a header, the required columns are checked on a header-only read first; for
+    sales files (YMBD/FIT_CVI) only the configured columns are then loaded, with string
+    IDs, integer quantities and parsed dates.
+
+    With chunksize (sales CSV files only) the file is streamed: an iterator of
+    DataFrames of at most chunksize rows is returned instead of one DataFrame,
+    so the caller can aggregate each chunk and discard it.
+
+    Sales .xlsx/.xlsm files are streamed the same way when config[file_type]["excel_reader"]
+    is "read_only" (openpyxl read-only mode, batches of chunksize or
+    config[file_type]["batch_size"] rows); the default "pandas" reads the sheet at once.
+
     Returns:
-        pd.DataFrame: The contents of the file as a DataFrame, or None if an error occurred.
+        pd.DataFrame: The contents of the file as a DataFrame (or an iterator of DataFrame
+        chunks in streaming mode).
+
+    Raises:
+        FileReadError: If the file is missing, in use, unsupported or lacks required columns.
+            In streaming mode, read errors are raised as FileReadError by the iterator.
     """
+    if not os.path.exists(path):
+        raise FileReadError(
+            "File Not Found",
+            f"The specified file does not exist:\n{path}\n\nPlease check the file path and try again.",
+        )
+    if file_in_use(path):
+        raise FileReadError(
+            "File In Use",
+            f"The specified file is currently open in another program:\n{path}\n\nPlease close the file and try again.",
+        )
+
     df = None
     try:
-        if not os.path.exists(path):
-            messagebox.showerror(
-                "File Not Found",
-                f"The specified file does not exist:\n{path}\n\nPlease check the file path and try again.",
-            )
-            return None
-        if file_in_use(path):
-            messagebox.showerror(
-                "File In Use",
-                f"The specified file is currently open in another program:\n{path}\n\nPlease close the file and try again.",
-            )
-            return None
-
-        # Load configuration for required fields and sheet names
-        config = load_config(config_path="config/config.json")
+        # Configuration for required fields and sheet names
+        config = AppConfig.of(config if config is not None else get_config())
 
         if isinstance(path, str):
             path = Path(path)
         ext = path.suffix.lower()
 
         relevant_sheet = pick_sheet(path, file_type, config)
-
-        # Prepare converters for specific file types to prevent unwanted type conversions
-        converters_dict = converters.copy() if converters else {}
-
-        if file_type == "ymbd":
-            # Force Component column to be read as string to prevent float conversion
-            # which can cause issues like 989606130501 becoming 989606130501.0
-            converters_dict["Component"] = lambda x: str(x).strip()
-
-        # Read file based on extension
-        if ext == ".csv":
-            df = pd.read_csv(
-                path, header=header, converters=converters_dict if converters_dict else None
-            )
-        elif ext in [".xlsx", ".xlsm"]:
-            df = pd.read_excel(
-                path,
-                sheet_name=relevant_sheet,
-                header=header,
-                engine="openpyxl",
-                converters=converters_dict if converters_dict else None,
-            )
-        elif ext in [".xls"]:
-            df = pd.read_excel(
-                path,
-                sheet_name=relevant_sheet,
-                header=header,
-                engine="xlrd",
-                converters=converters_dict if converters_dict else None,
-            )
-        else:
+        if ext not in (".csv", ".xlsx", ".xlsm", ".xls"):
             raise ValueError(
                 f"Unsupported file format: {ext}. Only .xlsx, .xlsm, and .csv files are supported."
             )
@@ -294,14 +287,147 @@ def read_file(path: Path, file_type: str, header=None, converters=None) -> pd.Da
         if header is not None:
             required_columns = config[file_type].get("columns", {}).values()
 
-            if not set(required_columns).issubset(set(df.columns)):
-                messagebox.showerror(
+            # Header-only probe: reject a wrong sheet before reading any data rows
+            header_columns = _read_table(path, ext, relevant_sheet, header=header, nrows=0).columns
+            if not set(required_columns).issubset(set(header_columns)):
+                raise FileReadError(
                     "Error", f"Sheet '{relevant_sheet}' must contain columns: {required_columns}"
                 )
-                return None
+
+        read_options = _typed_read_options(config, file_type) if header is not None else {}
+        if read_options and ext in (".xlsx", ".xlsm") and (
+            config[file_type].get("excel_reader", "pandas") == "read_only"
+        ):
+            return _file_read_errors(
+                _iter_excel_batches(
+                    path,
+                    relevant_sheet,
+                    header,
+                    read_options["usecols"],
+                    chunksize or config[file_type].get("batch_size", DEFAULT_EXCEL_BATCH_SIZE),
+                )
+            )
+        if read_options and chunksize and ext == ".csv":
+            # Streaming: a bad quantity must not abort the stream halfway, so only IDs
+            # and dates are typed; the sales parser coerces quantities per chunk
+            return _file_read_errors(
+                pd.read_csv(
+                    path,
+                    header=header,
+                    converters=converters or None,
+                    chunksize=chunksize,
+                    usecols=read_options["usecols"],
+                    dtype={c: t for c, t in read_options["dtype"].items() if t is str},
+                    parse_dates=read_options["parse_dates"],
+                    date_format=read_options["date_format"],
+                )
+            )
+        if read_options:
+            try:
+                df = _read_table(
+                    path, ext, relevant_sheet, header=header, converters=converters, **read_options
+                )
+            except (ValueError, TypeError) as e:
+                # A malformed cell defeats the explicit dtypes; let the sales parser sort it out
+                logger.info(f"Typed read of {path.name} failed ({e}), reading columns untyped")
+                df = _read_table(
+                    path,
+                    ext,
+                    relevant_sheet,
+                    header=header,
+                    converters=converters,
+                    usecols=read_options["usecols"],
+                    dtype={c: t for c, t in read_options["dtype"].items() if t is str},
+                )
+        else:
+            df = _read_table(path, ext, relevant_sheet, header=header, converters=converters)
 
         return df
 
+    except FileReadError:
+        raise
     except Exception as e:
-        messagebox.showerror("Error", f"Could not read file:\n{e}")
-        return None
+        raise FileReadError("Error", f"Could not read file:\n{e}") from e
+
+
+def _file_read_errors(chunks):
+    """Iterate a streaming reader, raising FileReadError for errors that surface mid-stream
+
+    A streamed file is opened and read lazily, so a corrupt or truncated file only
+    fails once the sales parser pulls the next chunk, outside read_table's own check.
+    """
+    try:
+        yield from chunks
+    except FileReadError:
+        raise
+    except Exception as e:
+        raise FileReadError("Error", f"Could not read file:\n{e}") from e
+
+
+def _typed_read_options(config: AppConfig, file_type: str) -> dict:
+    """Reader options loading only the configured sales columns, with explicit dtypes
+
+    IDs are read as strings, quantities as nullable integers and the date column is
+    parsed with the configured format. Returns {} for file types without sales
+    columns.
+    """
+    columns = config[file_type].get("columns", {})
+    if "sales" not in columns or "date" not in columns:
+        return {}
+    id_column = columns.get("12nc") or columns.get("room")
+    dtype = {columns["sales"]: "Int64"}
+    if id_column:
+        dtype[id_column] = str
+    return {
+        "usecols": list(dict.fromkeys(columns.values())),
+        "dtype": dtype,
+        "parse_dates": [columns["date"]],
+        "date_format": config.date_formats[file_type],
+    }
+
+
+def _read_table(path: Path, ext: str, sheet_name: str, header=None, converters=None, **options) -> pd.DataFrame:
+    """Read a CSV or Excel sheet, passing column selection/dtype options to the reader"""
+    if ext == ".csv":
+        return pd.read_csv(path, header=header, converters=converters or None, **options)
+    return pd.read_excel(
+        path,
+        sheet_name=sheet_name,
+        header=header,
+        engine="xlrd" if ext == ".xls" else "openpyxl",
+        converters=converters or None,
+        **options,
+    )
+
+
+def _iter_excel_batches(path: Path, sheet_name: str, header: int, columns: list, batch_size: int):
+    """Yield DataFrames of at most batch_size rows holding only the given columns
+
+    Uses openpyxl read-only mode, which streams the sheet XML instead of building
+    the whole worksheet, and only visits the cells between the first and last
+    wanted column. The header row is row `header` (0-based), as in pandas.
+    """
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        worksheet = workbook[sheet_name]
+        header_row = next(worksheet.iter_rows(min_row=header + 1, max_row=header + 1, values_only=True), ())
+        labels = list(header_row)
+        positions = [labels.index(column) for column in columns]
+        first, last = min(positions), max(positions)
+        offsets = [position - first for position in positions]
+        width = last - first + 1
+
+        batch = []
+        for row in worksheet.iter_rows(
+            min_row=header + 2, min_col=first + 1, max_col=last + 1, values_only=True
+        ):
+            if len(row) < width:
+                row = tuple(row) + (None,) * (width - len(row))
+            batch.append([row[offset] for offset in offsets])
+            if len(batch) >= batch_size:
+                yield pd.DataFrame(batch, columns=columns)
+                batch = []
+        if batch:
+            yield pd.DataFrame(batch, columns=columns)
+    finally:
+        workbook.close()
@@ -0,0 +1,317 @@
+"""Load pipeline: input files -> parsed arrays (cached on disk) -> Room / TwelveNC objects"""
+
+import logging
+import os
+import queue
+import threading
+from concurrent.futures import FIRST_COMPLETED, wait
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+from ..models.bom import BillOfMaterials
+from ..models.grouped_sales import GroupedSales
+from ..models.mapping import Room, TwelveNC
+from ..utils.process_pool import spawn_context, spawn_pool, terminate_pool
+from .data_loaders import FileReadError, read_bom, read_table
+from .data_transformer import parse_fit_cvi_sales, parse_ymbd_sales, transform_bom
+from .parse_cache import ParseCache, ParsedDataset
+
+logger = logging.getLogger(__name__)
+
+FILE_LABELS = {"cbom": "CBOM file", "ymbd": "YMBD sales data", "fit_cvi": "FIT_CVI sales data"}
+SALES_PARSERS = {"ymbd": parse_ymbd_sales, "fit_cvi": parse_fit_cvi_sales}
+
+# Share of the progress bar covered by parsing; the rest is building the entities
+PARSE_PROGRESS = 0.9
+
+# Progress queue and cancel event of a parse worker process (set by _init_worker)
+_worker_progress = None
+_worker_cancel = None
+
+
+class LoadCancelled(Exception):
+    """The load was cancelled through its cancel event"""
+
+
+def _notify(on_stage: Callable[[str, float], None] | None, message: str, progress: float):
+    if on_stage is not None:
+        on_stage(message, progress)
+
+
+def _check_cancelled(cancel_event: threading.Event | None):
+    if cancel_event is not None and cancel_event.is_set():
+        raise LoadCancelled()
+
+
+def parse_file(
+    file_type: str,
+    path,
+    config,
+    on_rows: Callable[[int], None] | None = None,
+    cancel_event: threading.Event | None = None,
+):
+    """Parse one input file
+
+    Args:
+        on_rows: Optional callback receiving the rows read so far (sales files, per chunk)
+        cancel_event: Optional event; checked once the CBOM sheet is read, before parsing it
+            (sales files check it through on_rows)
+
+    Returns:
+        BillOfMaterials for 'cbom', (GroupedSales, SalesParseReport) for 'ymbd' / 'fit_cvi'
+
+    Raises:
+        FileReadError: If the file cannot be read
+        LoadCancelled: If cancel_event was set
+    """
+    if file_type == "cbom":
+        return read_bom(Path(path), config, on_read=lambda: _check_cancelled(cancel_event))
+    data = read_table(
+        Path(path), file_type, header=0, chunksize=config[file_type].get("chunk_size"), config=config
+    )
+    return SALES_PARSERS[file_type](data, config, on_rows=on_rows)
+
+
+def _init_worker(progress_queue, cancel_event):
+    global _worker_progress, _worker_cancel
+    _worker_progress = progress_queue
+    _worker_cancel = cancel_event
+
+
+def _parse_file_payload(file_type: str, path: str, config):
+    """Process pool worker: parse one file and return plain arrays (cheap to pickle)
+
+    Sales files stop with LoadCancelled at the next chunk once the cancel event is set,
+    the CBOM before parsing its sheet.
+    """
+
+    def on_rows(rows):
+        _check_cancelled(_worker_cancel)
+        if _worker_progress is not None:
+            _worker_progress.put((file_type, rows))
+
+    result = parse_file(file_type, path, config, on_rows=on_rows, cancel_event=_worker_cancel)
+    if file_type == "cbom":
+        return result.to_arrays()
+    sales, report = result
+    return sales.to_arrays(file_type), report
+
+
+def _from_payload(file_type: str, payload):
+    if file_type == "cbom":
+        return BillOfMaterials.from_arrays(payload)
+    arrays, report = payload
+    return GroupedSales.from_arrays(arrays, file_type), report
+
+
+def _parse_serial(file_paths, config, on_stage, on_rows, cancel_event) -> Tuple[dict, dict]:
+    results, errors = {}, {}
+    for done, file_type in enumerate(FILE_LABELS):
+        _check_cancelled(cancel_event)
+        _notify(on_stage, f"Loading {FILE_LABELS[file_type]}...", PARSE_PROGRESS * done / len(FILE_LABELS))
+
+        def report_rows(rows, file_type=file_type):
+            _check_cancelled(cancel_event)
+            if on_rows is not None:
+                on_rows(file_type, rows)
+
+        try:
+            results[file_type] = parse_file(file_type, file_paths[file_type], config, report_rows, cancel_event)
+        except FileReadError as e:
+            errors[file_type] = e
+    return results, errors
+
+
+def _parse_parallel(file_paths, config, on_stage, on_rows, cancel_event) -> Tuple[dict, dict]:
+    results, errors = {}, {}
+    _check_cancelled(cancel_event)
+    _notify(on_stage, "Loading CBOM, YMBD and FIT_CVI files in parallel...", 0.0)
+    progress_queue = spawn_context.Queue()
+    worker_cancel = spawn_context.Event()
+    pool = spawn_pool(len(FILE_LABELS), initializer=_init_worker, initargs=(progress_queue, worker_cancel))
+    try:
+        futures = {
+            pool.submit(_parse_file_payload, file_type, str(file_paths[file_type]), config): file_type
+            for file_type in FILE_LABELS
+        }
+        pending = set(futures)
+        while pending:
+            finished, pending = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+            _drain_worker_progress(progress_queue, on_rows)
+            _check_cancelled(cancel_event)
+            for future in finished:
+                file_type = futures[future]
+                try:
+                    results[file_type] = _from_payload(file_type, future.result())
+                except FileReadError as e:
+                    errors[file_type] = e
+                    continue
+                waiting = [FILE_LABELS[futures[f]] for f in pending]
+                message = f"Loaded {FILE_LABELS[file_type]}"
+                if waiting:
+                    message += f", waiting for {', '.join(waiting)}..."
+                done = len(results) + len(errors)
+                _notify(on_stage, message, PARSE_PROGRESS * done / len(FILE_LABELS))
+    finally:
+        worker_cancel.set()
+        if cancel_event is not None and cancel_event.is_set():
+            # A worker inside one long read (a CBOM sheet) would only notice at its end
+            terminate_pool(pool)
+        else:
+            # Stop workers still parsing (sales files at their next chunk) and wait for
+            # them, so no orphaned parse keeps running and the queue outlives them
+            pool.shutdown(wait=True, cancel_futures=True)
+    return results, errors
+
+
+def _drain_worker_progress(progress_queue, on_rows):
+    while True:
+        try:
+            file_type, rows = progress_queue.get_nowait()
+        except queue.Empty:
+            return
+        if on_rows is not None:
+            on_rows(file_type, rows)
+
+
+def parse_dataset(
+    file_paths: Dict[str, str],
+    config,
+    on_stage: Callable[[str, float], None] | None = None,
+    on_error: Callable[[FileReadError], None] | None = None,
+    parallel: bool = False,
+    on_rows: Callable[[str, int], None] | None = None,
+    cancel_event: threading.Event | None = None,
+) -> ParsedDataset:
+    """Parse the CBOM, YMBD and FIT_CVI files into compact arrays
+
+    Sales CSV files are streamed in chunks of config[file_type]["chunk_size"] rows
+    when that option is set. With parallel=True each file is parsed in its own
+    worker process, so the load takes about as long as the slowest file.
+
+    Args:
+        file_paths: {'cbom': path, 'ymbd': path, 'fit_cvi': path}
+        config: Configuration dictionary
+        on_stage: Optional callback receiving a short progress message and the overall
+            progress (0-1) at each stage
+        on_error: Optional callback receiving the FileReadError of an unreadable sales
+            file; the load continues without that file's sales
+        parallel: Parse the three files concurrently in a process pool
+        on_rows: Optional callback receiving (file type, rows read so far) per chunk
+        cancel_event: Optional event; once set, the parse stops with LoadCancelled
+
+    Returns:
+        ParsedDataset
+
+    Raises:
+        FileReadError: If the CBOM file cannot be read
+        ValueError: If the CBOM file is empty or invalid
+        LoadCancelled: If cancel_event was set
+    """
+    parse = _parse_parallel if parallel else _parse_serial
+    results, errors = parse(file_paths, config, on_stage, on_rows, cancel_event)
+
+    if "cbom" in errors:
+        raise errors["cbom"]
+    bom = results["cbom"]
+    if not bom.room_ids or not bom.nc12_ids:
+        raise ValueError("CBOM file is empty or invalid")
+
+    for file_type, error in errors.items():
+        logger.warning(f"Skipping {FILE_LABELS[file_type]}: {error}")
+        if on_error is not None:
+            on_error(error)
+
+    reports = []
+    sales = {}
+    for file_type in SALES_PARSERS:
+        sales[file_type], report = results.get(file_type, (GroupedSales.empty(), None))
+        if report is not None:
+            logger.info(report.summary())
+            reports.append(report)
+
+    return ParsedDataset(
+        bom=bom,
+        nc12_sales=sales["ymbd"],
+        room_sales=sales["fit_cvi"],
+        complete=not errors,
+        reports=reports,
+    )
+
+
+def build_entities(
+    dataset: ParsedDataset, cancel_event: threading.Event | None = None
+) -> Tuple[List[Room], List[TwelveNC]]:
+    """Create Room and TwelveNC objects with their components and sales history"""
+    rooms, nc12s = transform_bom(dataset.bom)
+    _check_cancelled(cancel_event)
+    dataset.nc12_sales.attach(nc12s)
+    _check_cancelled(cancel_event)
+    dataset.room_sales.attach(rooms)
+    return rooms, nc12s
+
+
+def load_dataset(
+    file_paths: Dict[str, str],
+    config,
+    cache: ParseCache | None = None,
+    on_stage: Callable[[str, float], None] | None = None,
+    on_error: Callable[[FileReadError], None] | None = None,
+    parallel: bool | None = None,
+    on_rows: Callable[[str, int], None] | None = None,
+    cancel_event: threading.Event | None = None,
+) -> Tuple[List[Room], List[TwelveNC]]:
+    """Load Rooms and 12NCs from the input files, reusing cached parse results
+
+    A cache hit skips reading and parsing entirely; a miss parses the files and
+    stores the result for the next load of the same, unchanged files.
+
+    Args:
+        file_paths: {'cbom': path, 'ymbd': path, 'fit_cvi': path}
+        config: Configuration dictionary
+        cache: ParseCache to use, or None to always parse
+        on_stage: Optional callback receiving a progress message and fraction (0-1) per stage
+        on_error: Optional callback for unreadable sales files (see parse_dataset)
+        parallel: Parse in a process pool; defaults to config["loading"]["parallel"],
+            or to True on machines with more than one CPU
+        on_rows: Optional callback receiving (file type, rows read so far)
+        cancel_event: Optional event; once set, the load stops with LoadCancelled
+
+    Returns:
+        Tuple of (rooms, nc12s)
+    """
+    if parallel is None:
+        parallel = config.get("loading", {}).get("parallel", (os.cpu_count() or 1) > 1)
+
+    key = None
+    dataset = None
+    if cache is not None:
+        _notify(on_stage, "Checking parse cache...", 0.0)
+        try:
+            key = cache.make_key(file_paths, config)
+            dataset = cache.load(key)
+        except OSError as e:
+            logger.warning(f"Parse cache unavailable: {e}")
+            key = None
+        if dataset is not None:
+            logger.info(f"Parse cache hit ({key[:12]})")
+
+    if dataset is None:
+        dataset = parse_dataset(
+            file_paths,
+            config,
+            on_stage,
+            on_error,
+            parallel=parallel,
+            on_rows=on_rows,
+            cancel_event=cancel_event,
+        )
+        if key is not None and dataset.complete:
+            try:
+                cache.store(key, dataset)
+            except OSError as e:
+                logger.warning(f"Could not write parse cache: {e}")
+
+    _check_cancelled(cancel_event)
+    _notify(on_stage, "Processing data...", PARSE_PROGRESS)
+    return build_entities(dataset, cancel_event)
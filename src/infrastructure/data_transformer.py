@@ -1,14 +1,20 @@
 # take loaded data from data_loaders and transform it into the format needed for the application
-import re
+from dataclasses import dataclass, field
 from typing import Dict, List
-from numpy import int_
+import numpy as np
 import pandas as pd
-from datetime import datetime
+from datetime import date
 
-from src.models.mapping import Room, TwelveNC
-from src.models.sales_record import SalesRecord
-from src.utils.config_util import load_config
-from src.utils.string_utils import normalize_identifier
+from src.models.bom import BillOfMaterials, BomView
+from src.models.grouped_sales import GroupedSales
+from src.models.mapping import Room, TwelveNC, validate_entity_fields
+from src.models.sales_history import SalesHistory
+from src.utils.config_util import AppConfig, get_config
+from src.utils.date_utils import DateParser, DateParseStats
+from src.utils.string_utils import normalize_identifiers, validate_identifiers
+
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+MAX_REPORT_EXAMPLES = 5
 
 
 def transform_cbom_data(
@@ -24,90 +30,182 @@ def transform_cbom_data(
     output:
     - rooms: list of Room objects with attributes room, room_description, twelve_ncs (dict of 12NC: quantity)
     - nc12s: list of TwelveNC objects with attributes twelve_nc, tnc_description, rooms (dict of Room: quantity)
+
+    Both dictionaries are merged into one BillOfMaterials (room_data wins on
+    conflicting quantities); see transform_bom.
     """
     if not room_data or not data_12nc:
         raise ValueError("Input data cannot be empty")
 
-    rooms: List[Room] = []
-    nc12s: List[TwelveNC] = []
-    #####################
-    # populate rooms list
-    ####################
-    for room in room_data.keys():
-        if not re.match(config["validation"]["patterns"]["room_normalized"], str(room)):
+    config = AppConfig.of(config)
+    room_ids = []
+    room_keys = list(room_data.keys())
+    for room, valid in zip(room_keys, validate_identifiers([str(r) for r in room_keys], config.room_pattern)):
+        if not valid:
             print(f"Warning: Room '{room}' does not match expected format. Skipping.")
             continue
+        room_ids.append(room)
 
-        # Get description from first row if available
-        description = room_data[room]["description"] if "description" in room_data[room] else ""
-
-        twelve_ncs_dict = {}  # Not Dict[TwelveNC, int]
-        # Skip rows with invalid quantities
-        tnc_list = room_data[room]["tnc_list"]
-        for _, row in tnc_list.iterrows():
-            qty_value = str(row["Quantity"]).strip()
-            if qty_value and qty_value not in ["", "nan", "None"] and not pd.isna(row["Quantity"]):
-                try:
-                    int__value = int(float(qty_value))
-                    if int__value > 0:
-                        twelve_ncs_dict[row["12NC"]] = int__value
-                except (ValueError, TypeError):
-                    print(
-                        f"Warning: Invalid quantity '{qty_value}' for 12NC {row['12NC']} in room {room}. Skipping."
-                    )
-                    continue
-
-        rooms.append(
-            Room(
-                id=room,
-                description=description,
-                components=twelve_ncs_dict,  # Use the dict, not valid_twelve_ncs
-                sales_history=[],
-            )
-        )
-    ################################
-    # populate nc12s list
-    ################################
-    for nc12 in data_12nc.keys():
-
-        if not re.match(config["validation"]["patterns"]["12nc_normalized"], str(nc12)):
+    nc12_ids = []
+    nc12_keys = list(data_12nc.keys())
+    for nc12, valid in zip(nc12_keys, validate_identifiers([str(n) for n in nc12_keys], config.nc12_pattern)):
+        if not valid:
             print(f"Warning: 12NC '{nc12}' does not match expected format. Skipping.")
             continue
-        description = (
-            data_12nc[nc12]["12NC_Description"] if "12NC_Description" in data_12nc[nc12] else ""
-        )
-        igt = data_12nc[nc12]["12NC_IGT"] if "12NC_IGT" in data_12nc[nc12] else ""
+        nc12_ids.append(nc12)
+
+    # Entities referenced only from the other side still get a code, so that
+    # their quantities stay visible in the components of the listed entities
+    room_codes = {room: code for code, room in enumerate(room_ids)}
+    nc12_codes = {nc12: code for code, nc12 in enumerate(nc12_ids)}
+    room_parts, nc12_parts, qty_parts = [[]], [[]], [[]]
+    for room in room_ids:
+        tnc_list = room_data[room]["tnc_list"]
+        room_parts.append([room_codes[room]] * len(tnc_list))
+        nc12_parts.append([nc12_codes.setdefault(nc12, len(nc12_codes)) for nc12 in tnc_list["12NC"]])
+        qty_parts.append(tnc_list["Quantity"].to_numpy(dtype=object))
+    for nc12 in nc12_ids:
+        room_list = data_12nc[nc12]["room_list"]
+        room_parts.append([room_codes.setdefault(room, len(room_codes)) for room in room_list["Room"]])
+        nc12_parts.append([nc12_codes[nc12]] * len(room_list))
+        qty_parts.append(room_list["Quantity"].to_numpy(dtype=object))
+
+    # Skip empty and non-positive quantities; the room side wins on duplicates
+    pairs = pd.DataFrame(
+        {
+            "room": np.concatenate(room_parts).astype(np.int64),
+            "nc12": np.concatenate(nc12_parts).astype(np.int64),
+            "qty": np.trunc(
+                pd.to_numeric(pd.Series(np.concatenate(qty_parts), dtype=object), errors="coerce")
+                .fillna(0)
+                .to_numpy(dtype=float)
+            ),
+        }
+    )
+    pairs = pairs[pairs["qty"] > 0].drop_duplicates(subset=["room", "nc12"], keep="first")
+
+    bom = BillOfMaterials.from_triples(
+        list(room_codes),
+        list(nc12_codes),
+        pairs["room"].to_numpy(),
+        pairs["nc12"].to_numpy(),
+        pairs["qty"].to_numpy(),
+        room_descriptions=[room_data.get(room, {}).get("description", "") for room in room_codes],
+        nc12_descriptions=[
+            data_12nc.get(nc12, {}).get("12NC_Description", "") for nc12 in nc12_codes
+        ],
+        nc12_igts=[data_12nc.get(nc12, {}).get("12NC_IGT", "") for nc12 in nc12_codes],
+    )
+    return transform_bom(bom, room_ids=room_ids, nc12_ids=nc12_ids)
+
+
+def transform_bom(
+    bom: BillOfMaterials, room_ids: List[str] | None = None, nc12_ids: List[str] | None = None
+) -> tuple[List[Room], List[TwelveNC]]:
+    """Create Room and TwelveNC objects whose components are lazy views over the store
 
-        room_dict = {}  # Not Dict[Room, int]
+    input:
+    - bom: BillOfMaterials (canonical CBOM representation)
+    - room_ids / nc12_ids: optional subset of entities to create, default all
 
-        room_list = data_12nc[nc12]["room_list"]
+    output:
+    - rooms: list of Room objects, components = {12NC: quantity} view
+    - nc12s: list of TwelveNC objects, components = {room: quantity} view
+    """
+    if not bom.room_ids or not bom.nc12_ids:
+        raise ValueError("Input data cannot be empty")
 
-        for _, row in room_list.iterrows():
-            qty_value = str(row["Quantity"]).strip()
-            if qty_value and qty_value not in ["", "nan", "None"] and not pd.isna(row["Quantity"]):
-                try:
-                    int__value = int(float(qty_value))
-                    if int__value > 0:
-                        room_dict[row["Room"]] = int__value
-                except (ValueError, TypeError):
-                    print(
-                        f"Warning: Invalid quantity '{qty_value}' for room {row['Room']} in 12NC {nc12}. Skipping."
-                    )
-                    continue
+    room_ids = bom.room_ids if room_ids is None else room_ids
+    nc12_ids = bom.nc12_ids if nc12_ids is None else nc12_ids
 
+    # Validate the fields once per column, then skip the per-object __post_init__
+    room_descriptions = [bom.room_descriptions[bom.room_codes[room]] for room in room_ids]
+    nc12_descriptions = [bom.nc12_descriptions[bom.nc12_codes[nc12]] for nc12 in nc12_ids]
+    validate_entity_fields("Room", room_ids, room_descriptions)
+    validate_entity_fields("12NC", nc12_ids, nc12_descriptions)
+
+    rooms: List[Room] = [
+        Room.trusted(
+            room, description, BomView(bom, "room", bom.room_codes[room]), SalesHistory(room)
+        )
+        for room, description in zip(room_ids, room_descriptions)
+    ]
+    nc12s: List[TwelveNC] = []
+    for nc12, description in zip(nc12_ids, nc12_descriptions):
+        code = bom.nc12_codes[nc12]
         nc12s.append(
-            TwelveNC(
-                id=nc12,
-                description=description,
-                igt=igt,
-                components=room_dict,
-                sales_history=[],
+            TwelveNC.trusted(
+                nc12, description, bom.nc12_igts[code], BomView(bom, "12NC", code), SalesHistory(nc12)
             )
         )
 
     return rooms, nc12s
 
 
+@dataclass
+class SalesParseReport:
+    """Aggregated outcome of parsing one sales file (replaces per-row skip handling)"""
+
+    source: str
+    total_rows: int = 0
+    parsed_rows: int = 0
+    skipped: Dict[str, int] = field(default_factory=dict)  # reason -> number of rows
+    examples: Dict[str, List[str]] = field(default_factory=dict)  # reason -> first offending values
+    fallback_formats: Dict[str, int] = field(default_factory=dict)  # strptime format -> rows
+    date_stats: DateParseStats | None = None  # date parsing throughput / failures
+
+    @property
+    def skipped_rows(self) -> int:
+        return sum(self.skipped.values())
+
+    def add_skipped(self, reason: str, values: pd.Series):
+        """Count the rows in values as skipped for reason, keeping a few examples"""
+        if values.empty:
+            return
+        self.skipped[reason] = self.skipped.get(reason, 0) + len(values)
+        examples = self.examples.setdefault(reason, [])
+        for value in values.astype(str).unique()[: MAX_REPORT_EXAMPLES - len(examples)]:
+            examples.append(value)
+
+    def summary(self) -> str:
+        """One-line human readable summary"""
+        text = f"{self.source}: {self.total_rows:,} rows, {self.parsed_rows:,} parsed"
+        if self.skipped:
+            reasons = ", ".join(f"{reason}: {count:,}" for reason, count in self.skipped.items())
+            text += f", {self.skipped_rows:,} skipped ({reasons})"
+        if self.fallback_formats:
+            formats = ", ".join(f"'{fmt}': {count:,}" for fmt, count in self.fallback_formats.items())
+            text += f"; fallback date formats used ({formats})"
+        if self.date_stats is not None and self.date_stats.rows:
+            text += f"; {self.date_stats.summary()}"
+        return text
+
+
+def parse_ymbd_sales(ymbd_df, config=None, on_rows=None) -> tuple[GroupedSales, SalesParseReport]:
+    """Parse a YMBD DataFrame column-wise into per-12NC sales arrays
+
+    input:
+        - ymbd_df: DataFrame (or iterable of DataFrame chunks) with the 12NC, date and
+          quantity columns named in config["ymbd"]["columns"]
+        - config: configuration (the cached config.json, see get_config, if omitted)
+        - on_rows: optional progress callback receiving the number of rows read so far
+
+    output:
+        - GroupedSales keyed by 12NC, dates sorted within each 12NC
+        - SalesParseReport with the number of skipped rows per reason
+    """
+    config = AppConfig.of(config if config is not None else get_config())
+    return _parse_sales_frame(
+        ymbd_df,
+        config,
+        "ymbd",
+        id_key="12nc",
+        source="YMBD",
+        is_valid_id=lambda ids: ids.str.isdigit() & (ids.str.len() == 12),
+        on_rows=on_rows,
+    )
+
+
 def parse_ymbd_to_sales_records(tnc_list: List[TwelveNC], ymbd_df) -> List[TwelveNC]:
     """Parse YMBD DataFrame to SalesRecord objects and link to TwelveNC objects
     args:
@@ -115,165 +213,144 @@ def parse_ymbd_to_sales_records(tnc_list: List[TwelveNC], ymbd_df) -> List[Twelv
         - ymbd_df: DataFrame with columns 'Component', 'Component Quantity', 'Confirmed Delivery Date'
 
     returns:
-        - List of twelve_ncs with sales history populated as list of SalesRecord objects
+        - List of twelve_ncs with sales history populated as a date-sorted SalesHistory (iterates as SalesRecord objects)
     """
-    ymbd_config = load_config()["ymbd"]
-    date_format = ymbd_config.get("date_format", "YYYY-MM-DD HH:MM:SS")
-
-    date_format_map = {
-        "MM-DD-YYYY": "%m-%d-%Y",
-        "DD-MMM-YYYY": "%d-%b-%Y",
-        "YYYY-MM-DD": "%Y-%m-%d",
-        "YYYY-MM-DD HH:MM:SS": "%Y-%m-%d %H:%M:%S",
-    }
-    strptime_format = date_format_map.get(date_format, "%Y-%m-%d %H:%M:%S")
-    # Step 1: Build ymbd dictionary {12NC: [(date, qty), ...]} - O(n)
-    ymbd_dict = {}
-    skipped = 0
-
-    for _, row in ymbd_df.iterrows():
-        try:
-            component_value = row[ymbd_config["columns"].get("12nc", "")]
-            if pd.isna(component_value):
-                skipped += 1
-                continue
-
-            twelve_nc = normalize_identifier(component_value)
-
-            # Fixed validation
-            if (not twelve_nc) or (not twelve_nc.isdigit()) or (len(twelve_nc) != 12):
-                skipped += 1
-                continue
-
-            # Parse date
-            date_str = str(row[ymbd_config["columns"].get("date", "")]).strip()
-            try:
-                sales_date = datetime.strptime(date_str, strptime_format).date()
-            except ValueError:
-                parsed = False
-                # Try fallback formats: YYYY-MM-DD HH:MM:SS first (actual format), then others
-                for fmt in ["%Y-%m-%d %H:%M:%S", "%Y-%m-%d", "%m-%d-%Y", "%d-%b-%Y"]:
-                    try:
-                        sales_date = datetime.strptime(date_str, fmt).date()
-                        parsed = True
-                        break
-                    except ValueError:
-                        continue
-                if not parsed:
-                    skipped += 1
-                    continue
-
-            quantity = int(row[ymbd_config["columns"].get("sales", "")])
-
-            if twelve_nc not in ymbd_dict:
-                ymbd_dict[twelve_nc] = []
-            ymbd_dict[twelve_nc].append((sales_date, quantity))
-
-        except Exception as e:
-            skipped += 1
-            continue
-    
-    matched_12ncs = 0
-    matched_records = 0
-    for tnc in tnc_list:
-        if tnc.id in ymbd_dict.keys():
-            matched_12ncs += 1
-            for date, qty in ymbd_dict[tnc.id]:
-                sales_record = SalesRecord(identifier=tnc.id, quantity=qty, date=date)
-                tnc.sales_history.append(sales_record)
-                matched_records += 1
-    
+    sales, _ = parse_ymbd_sales(ymbd_df)
+    sales.attach(tnc_list)
     return tnc_list
 
 
+def _parse_sales_frame(
+    data, config: AppConfig, file_type: str, id_key: str, source: str, is_valid_id=None, on_rows=None
+) -> tuple[GroupedSales, SalesParseReport]:
+    """Shared column-wise parser for sales files (one row per sale)
+
+    data is a DataFrame or an iterable of DataFrame chunks (streaming mode, see
+    read_file(chunksize=...)); each chunk is reduced to compact per-entity arrays
+    before the next one is read. on_rows, if given, is called after every chunk
+    with the number of rows read so far (it may raise to abort the parse).
+    """
+    columns = config[file_type]["columns"]
+    column_names = (columns.get(id_key, ""), columns.get("date", ""), columns.get("sales", ""))
+    report = SalesParseReport(source=source)
+    # Raw ID -> normalized ID and date memo, shared by all chunks of the file
+    id_memo = {}
+    date_parser = DateParser(config.date_formats[file_type])
+    report.date_stats = date_parser.stats
+
+    frames = [data] if isinstance(data, pd.DataFrame) else data
+    parts = []
+    for frame in frames:
+        parts.append(_parse_sales_chunk(frame, column_names, date_parser, is_valid_id, report, id_memo))
+        if on_rows is not None:
+            on_rows(report.total_rows)
+    return GroupedSales.concat(parts), report
+
+
+def _parse_sales_chunk(
+    df: pd.DataFrame,
+    column_names: tuple,
+    date_parser: DateParser,
+    is_valid_id,
+    report: SalesParseReport,
+    id_memo: dict | None = None,
+) -> GroupedSales:
+    """Parse one DataFrame (chunk) of sales rows, adding its counts to report
+
+    Rows are dropped, in this order, for a missing ID, an empty normalized ID or
+    one rejected by is_valid_id (Series -> bool Series), a date matching neither
+    the configured nor a fallback format, and a non-numeric or negative
+    quantity. Each dropped row is counted once under the first reason that applies.
+    """
+    id_column, date_column, sales_column = column_names
+    report.total_rows += len(df)
+
+    missing_columns = [c for c in column_names if c not in df.columns]
+    if missing_columns:
+        report.skipped["missing_column"] = report.skipped.get("missing_column", 0) + len(df)
+        report.examples["missing_column"] = [str(c) for c in missing_columns]
+        return GroupedSales.empty()
+
+    raw_ids = df[id_column]
+    present = raw_ids.notna().to_numpy()
+    report.add_skipped("missing_id", raw_ids[~present])
+
+    codes, ids = _normalize_identifier_codes(raw_ids, id_memo)
+    valid_ids = ids != ""
+    if is_valid_id is not None:
+        valid_ids &= is_valid_id(ids).fillna(False)
+    valid_ids = valid_ids.to_numpy(dtype=bool)
+    valid = present & np.append(valid_ids, False)[codes]
+    report.add_skipped("invalid_id", raw_ids[present & ~valid])
+
+    date_values = df[date_column][valid]
+    dates, format_counts = date_parser.parse(date_values)
+    for fmt, count in format_counts.items():
+        if fmt != date_parser.date_format:
+            report.fallback_formats[fmt] = report.fallback_formats.get(fmt, 0) + count
+    has_date = dates.notna().to_numpy()
+    report.add_skipped("invalid_date", date_values[~has_date])
+    valid[valid] = has_date
+
+    quantity_values = df[sales_column][valid]
+    quantities = pd.to_numeric(quantity_values, errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+    has_quantity = np.isfinite(quantities) & (quantities >= 0)
+    report.add_skipped("invalid_quantity", quantity_values[~has_quantity])
+    valid[valid] = has_quantity
+
+    ordinals = (
+        dates[has_date][has_quantity].to_numpy().astype("datetime64[D]").astype(np.int64)
+        + EPOCH_ORDINAL
+    )
+    report.parsed_rows += int(valid.sum())
+    return GroupedSales.from_codes(
+        codes[valid], ids.tolist(), ordinals, np.trunc(quantities[has_quantity]).astype(np.int64)
+    )
+
+
+def _normalize_identifier_codes(values: pd.Series, memo: dict | None = None) -> tuple[np.ndarray, pd.Series]:
+    """Column-wise normalize_identifiers, returned as codes into the distinct normalized IDs
+
+    Values that become equal after normalization share a code; missing values get
+    code -1. memo is passed on to normalize_identifiers.
+    """
+    codes, uniques = pd.factorize(values)
+    normalized = normalize_identifiers(uniques, memo)
+    merged_codes, ids = pd.factorize(normalized)
+    return np.append(merged_codes, -1)[codes], pd.Series(ids, dtype=object)
+
+
+def parse_fit_cvi_sales(fit_cvi_df, config=None, on_rows=None) -> tuple[GroupedSales, SalesParseReport]:
+    """Parse a FIT/CVI DataFrame column-wise into per-room sales arrays
+
+    input:
+        - fit_cvi_df: DataFrame (or iterable of DataFrame chunks) with the room, date and
+          quantity columns named in config["fit_cvi"]["columns"]
+        - config: configuration (the cached config.json, see get_config, if omitted)
+        - on_rows: optional progress callback receiving the number of rows read so far
+
+    output:
+        - GroupedSales keyed by room, dates sorted within each room
+        - SalesParseReport with skipped rows per reason and fallback date format usage
+    """
+    config = AppConfig.of(config if config is not None else get_config())
+    return _parse_sales_frame(
+        fit_cvi_df, config, "fit_cvi", id_key="room", source="FIT_CVI", on_rows=on_rows
+    )
+
+
 def parse_fit_cvi_to_sales_records(room_list: List[Room], fit_cvi_df) -> List[Room]:
     """Parse FIT/CVI DataFrame and populate Room objects with sales history.
 
-    Note: Mutates room_list by appending to sales_history of each room's components.
+    Note: Mutates room_list by adding the parsed sales to the sales_history of each room.
 
     args:
         - room_list: List of Room objects (will be modified in-place)
         - fit_cvi_df: DataFrame with FIT/CVI sales data (room-level)
 
     returns:
-        - The same room_list with populated sales_history
+        - The same room_list with populated sales_history (sorted by date)
     """
-    fit_config = load_config()["fit_cvi"]
-    date_format = fit_config.get("date_format", "YYYY-MM-DD HH:MM:SS")
-
-    date_format_map = {
-        "MM-DD-YYYY": "%m-%d-%Y",
-        "DD-MMM-YYYY": "%d-%b-%Y",
-        "YYYY-MM-DD": "%Y-%m-%d",
-        "YYYY-MM-DD HH:MM:SS": "%Y-%m-%d %H:%M:%S",
-    }
-    strptime_format = date_format_map.get(date_format, "%Y-%m-%d %H:%M:%S")
-
-    # Step 1: Build fit dictionary {room_id: [(date, qty), ...]} - O(n)
-    fit_dict = {}
-    skipped = 0
-
-    for _, row in fit_cvi_df.iterrows():
-        try:
-            room_value = row[fit_config["columns"].get("room", "")]
-            if pd.isna(room_value):
-                skipped += 1
-                continue
-
-            room_id = normalize_identifier(room_value)
-
-            if not room_id:
-                skipped += 1
-                continue
-
-            # Parse date
-            date_str = str(row[fit_config["columns"].get("date", "")]).strip()
-            try:
-                sales_date = datetime.strptime(date_str, strptime_format).date()
-            except ValueError:
-                parsed = False
-
-                # Try fallback formats: YYYY-MM-DD HH:MM:SS first (actual format), then others
-                for fmt in ["%Y-%m-%d %H:%M:%S", "%Y-%m-%d", "%m-%d-%Y", "%d-%b-%Y"]:
-                    try:
-                        sales_date = datetime.strptime(date_str, fmt).date()
-                        parsed = True
-                        print(
-                            f"[FIT DEBUG] Fallback success: '{date_str}' parsed with format '{fmt}'"
-                        )
-                        break
-                    except ValueError:
-                        continue
-                if not parsed:
-                    print(f"[FIT DEBUG] All formats failed for: '{date_str}'")
-                    skipped += 1
-                    continue
-
-            quantity = int(row[fit_config["columns"].get("sales", "")])
-
-            if room_id not in fit_dict:
-                fit_dict[room_id] = []
-            fit_dict[room_id].append((sales_date, quantity))
-
-        except Exception as e:
-            skipped += 1
-            continue
-
-    # Step 2: Update Room objects and their components - O(m)
-    matched_rooms = 0
-    total_records = 0
-
-    for room in room_list:
-        if room.id in fit_dict.keys():
-            matched_rooms += 1
-            # Add sales records to each component in the room
-            for sales_date, quantity in fit_dict[room.id]:
-                sales_record = SalesRecord(
-                    identifier=room.id,
-                    quantity=quantity,  # Room-level quantity applies to all components
-                    date=sales_date,
-                )
-                room.sales_history.append(sales_record)
-                total_records += 1
-
+    sales, _ = parse_fit_cvi_sales(fit_cvi_df)
+    sales.attach(room_list)
     return room_list
@@ -0,0 +1,191 @@
+"""On-disk cache of parsed input files (CBOM store and sales arrays)
+
+One cache entry holds the result of parsing one CBOM + YMBD + FIT_CVI combination
+as a single uncompressed .npz archive (plain NumPy arrays, no pickling). The entry
+key is a hash of every input file's path, size, mtime and content, the config
+sections that drive parsing and the parser version, so any change to the inputs or
+to the parse rules selects a new entry.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict
+
+import numpy as np
+
+from ..models.bom import BillOfMaterials
+from ..models.grouped_sales import GroupedSales
+
+logger = logging.getLogger(__name__)
+
+# Bump when the layout of the stored arrays changes
+CACHE_FORMAT_VERSION = 1
+
+# Bump when parsing gives different results for the same files and config: skip,
+# validation, normalization or date rules of the CBOM / sales parsers
+PARSER_VERSION = 2
+
+# Config sections whose content changes the parse result
+CONFIG_SECTIONS = ("cbom", "ymbd", "fit_cvi", "validation")
+
+DEFAULT_CACHE_DIR = Path(__file__).parent.parent.parent / "cache"
+
+
+@dataclass
+class ParsedDataset:
+    """Parsed, transformed content of one CBOM + YMBD + FIT_CVI combination"""
+
+    bom: BillOfMaterials
+    nc12_sales: GroupedSales  # YMBD sales keyed by 12NC
+    room_sales: GroupedSales  # FIT_CVI sales keyed by room
+    complete: bool = True  # False if a sales file could not be read (never cached)
+    reports: list = field(default_factory=list)  # SalesParseReport per parsed sales file (not cached)
+
+
+def _json_default(value):
+    # Read-only config sections (AppConfig) are mapping proxies
+    if isinstance(value, Mapping):
+        return dict(value)
+    return str(value)
+
+
+def file_fingerprint(path) -> Dict[str, object]:
+    """Identify a file by resolved path, size, modification time and content hash"""
+    path = Path(path).resolve()
+    stat = path.stat()
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return {
+        "path": str(path),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "content": digest.hexdigest(),
+    }
+
+
+class ParseCache:
+    """Directory of cached ParsedDataset entries with LRU/age eviction"""
+
+    def __init__(self, cache_dir=None, max_entries: int = 5, max_age_days: float = 30):
+        """
+        Args:
+            cache_dir: Directory holding the entries (created on demand)
+            max_entries: Number of most recently used entries to keep
+            max_age_days: Entries unused for longer than this are removed
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
+        self.max_entries = max_entries
+        self.max_age_days = max_age_days
+
+    @classmethod
+    def from_config(cls, config) -> "ParseCache | None":
+        """Create the cache described by config["cache"], or None if disabled"""
+        cache_config = config.get("cache", {})
+        if not cache_config.get("enabled", True):
+            return None
+        return cls(
+            cache_dir=cache_config.get("dir"),
+            max_entries=cache_config.get("max_entries", 5),
+            max_age_days=cache_config.get("max_age_days", 30),
+        )
+
+    def make_key(self, file_paths: Dict[str, str], config) -> str:
+        """Cache key for a set of input files ({'cbom': path, 'ymbd': path, ...})"""
+        key_source = {
+            "version": CACHE_FORMAT_VERSION,
+            "parser": PARSER_VERSION,
+            "files": {name: file_fingerprint(path) for name, path in sorted(file_paths.items())},
+            "config": {section: config.get(section) for section in CONFIG_SECTIONS},
+        }
+        encoded = json.dumps(key_source, sort_keys=True, default=_json_default).encode("utf-8")
+        return hashlib.blake2b(encoded, digest_size=20).hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.npz"
+
+    def load(self, key: str) -> ParsedDataset | None:
+        """Return the cached dataset for key, or None on a miss or unreadable entry"""
+        path = self._entry_path(key)
+        if not path.exists():
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as arrays:
+                dataset = ParsedDataset(
+                    bom=BillOfMaterials.from_arrays(arrays),
+                    nc12_sales=GroupedSales.from_arrays(arrays, "ymbd"),
+                    room_sales=GroupedSales.from_arrays(arrays, "fit_cvi"),
+                )
+        except Exception as e:
+            logger.warning(f"Discarding unreadable cache entry {path.name}: {e}")
+            self._remove(path)
+            return None
+        # Mark as recently used for eviction
+        os.utime(path)
+        return dataset
+
+    def store(self, key: str, dataset: ParsedDataset) -> Path:
+        """Write dataset under key, then evict old entries"""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        arrays = dataset.bom.to_arrays()
+        arrays.update(dataset.nc12_sales.to_arrays("ymbd"))
+        arrays.update(dataset.room_sales.to_arrays("fit_cvi"))
+
+        path = self._entry_path(key)
+        # Write to a temporary file first so a crash never leaves a partial entry
+        temp_path = path.with_name(f"{key}.{os.getpid()}.tmp.npz")
+        np.savez(temp_path, **arrays)
+        os.replace(temp_path, path)
+
+        self.evict()
+        return path
+
+    def invalidate(self, key: str | None = None) -> int:
+        """Remove one entry, or every entry when key is None
+
+        Returns:
+            Number of removed entries
+        """
+        if key is not None:
+            return self._remove(self._entry_path(key))
+        return sum(self._remove(path) for path in self._entries())
+
+    def evict(self) -> int:
+        """Remove entries beyond max_entries (least recently used first) or older than max_age_days
+
+        Returns:
+            Number of removed entries
+        """
+        removed = 0
+        cutoff = time.time() - self.max_age_days * 86400
+        entries = []
+        for path in self._entries():
+            try:
+                entries.append((path.stat().st_mtime, path))
+            except FileNotFoundError:
+                continue  # removed meanwhile (another process, invalidate)
+        entries.sort(key=lambda entry: entry[0], reverse=True)
+        for rank, (mtime, path) in enumerate(entries):
+            if rank >= self.max_entries or mtime < cutoff:
+                removed += self._remove(path)
+        return removed
+
+    def _entries(self):
+        if not self.cache_dir.exists():
+            return []
+        return [path for path in self.cache_dir.glob("*.npz") if ".tmp." not in path.name]
+
+    @staticmethod
+    def _remove(path: Path) -> int:
+        try:
+            path.unlink()
+            return 1
+        except FileNotFoundError:
+            return 0
@@ -1,14 +1,22 @@
 from .sales_record import SalesRecord
-from .performance import PerformanceData, TimePeriod
+from .sales_history import SalesHistory
+from .performance import PerformanceData, PerformanceTable, TimePeriod
 from .prediction import Prediction
 from .mapping import Room, TwelveNC, G_entity
+from .bom import BillOfMaterials, BomView
+from .grouped_sales import GroupedSales
 
 __all__ = [
     "SalesRecord",
+    "SalesHistory",
     "PerformanceData",
+    "PerformanceTable",
     "TimePeriod",
     "Prediction",
     "Room",
     "TwelveNC",
     "G_entity",
+    "BillOfMaterials",
+    "BomView",
+    "GroupedSales",
 ]
@@ -0,0 +1,233 @@
+# Sparse bill-of-materials store shared by all Room and TwelveNC objects
+from collections.abc import ItemsView, Mapping, ValuesView
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+import numpy as np
+
+
+@dataclass(eq=False)
+class BillOfMaterials:
+    """Room x 12NC quantity matrix held once, in CSR (by room) and CSC (by 12NC) form
+
+    Rooms and 12NCs are integer-coded by their position in room_ids / nc12_ids.
+    Row r of the CSR part lists the 12NC codes and quantities of room r in
+    room_indices[room_indptr[r]:room_indptr[r + 1]]; the CSC part does the same
+    for the rooms of each 12NC.
+    """
+
+    room_ids: List[str]
+    nc12_ids: List[str]
+    room_indptr: np.ndarray  # CSR row pointers, len(room_ids) + 1
+    room_indices: np.ndarray  # 12NC codes, sorted within each room
+    room_quantities: np.ndarray
+    nc12_indptr: np.ndarray  # CSC column pointers, len(nc12_ids) + 1
+    nc12_indices: np.ndarray  # room codes, sorted within each 12NC
+    nc12_quantities: np.ndarray
+    room_descriptions: List[str] = field(default_factory=list)
+    nc12_descriptions: List[str] = field(default_factory=list)
+    nc12_igts: List[str] = field(default_factory=list)
+    room_codes: Dict[str, int] = field(init=False, repr=False)
+    nc12_codes: Dict[str, int] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        """Build the ID -> code lookups"""
+        self.room_codes = {room_id: code for code, room_id in enumerate(self.room_ids)}
+        self.nc12_codes = {nc12_id: code for code, nc12_id in enumerate(self.nc12_ids)}
+
+    @classmethod
+    def from_triples(
+        cls,
+        room_ids: Sequence[str],
+        nc12_ids: Sequence[str],
+        room_codes: np.ndarray,
+        nc12_codes: np.ndarray,
+        quantities: np.ndarray,
+        **metadata,
+    ) -> "BillOfMaterials":
+        """Build the store from (room code, 12NC code, quantity) triples
+
+        Triples must not repeat a (room, 12NC) pair; entries with a zero quantity
+        are dropped.
+        """
+        room_codes = np.asarray(room_codes, dtype=np.int32)
+        nc12_codes = np.asarray(nc12_codes, dtype=np.int32)
+        quantities = np.asarray(quantities, dtype=np.int32)
+        keep = quantities != 0
+        room_codes, nc12_codes, quantities = room_codes[keep], nc12_codes[keep], quantities[keep]
+
+        by_room = np.lexsort((nc12_codes, room_codes))
+        by_nc12 = np.lexsort((room_codes, nc12_codes))
+        return cls(
+            room_ids=list(room_ids),
+            nc12_ids=list(nc12_ids),
+            room_indptr=_indptr(room_codes, len(room_ids)),
+            room_indices=nc12_codes[by_room],
+            room_quantities=quantities[by_room],
+            nc12_indptr=_indptr(nc12_codes, len(nc12_ids)),
+            nc12_indices=room_codes[by_nc12],
+            nc12_quantities=quantities[by_nc12],
+            **metadata,
+        )
+
+    @property
+    def nnz(self) -> int:
+        """Number of stored (room, 12NC) pairs"""
+        return int(self.room_indices.size)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the sparse arrays"""
+        return sum(
+            array.nbytes
+            for array in (
+                self.room_indptr,
+                self.room_indices,
+                self.room_quantities,
+                self.nc12_indptr,
+                self.nc12_indices,
+                self.nc12_quantities,
+            )
+        )
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """Plain arrays for serialization (see from_arrays)"""
+        return {
+            "bom_room_ids": np.asarray(self.room_ids, dtype=str),
+            "bom_nc12_ids": np.asarray(self.nc12_ids, dtype=str),
+            "bom_room_indptr": self.room_indptr,
+            "bom_room_indices": self.room_indices,
+            "bom_room_quantities": self.room_quantities,
+            "bom_nc12_indptr": self.nc12_indptr,
+            "bom_nc12_indices": self.nc12_indices,
+            "bom_nc12_quantities": self.nc12_quantities,
+            "bom_room_descriptions": np.asarray(self.room_descriptions, dtype=str),
+            "bom_nc12_descriptions": np.asarray(self.nc12_descriptions, dtype=str),
+            "bom_nc12_igts": np.asarray(self.nc12_igts, dtype=str),
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays) -> "BillOfMaterials":
+        return cls(
+            room_ids=arrays["bom_room_ids"].tolist(),
+            nc12_ids=arrays["bom_nc12_ids"].tolist(),
+            room_indptr=arrays["bom_room_indptr"],
+            room_indices=arrays["bom_room_indices"],
+            room_quantities=arrays["bom_room_quantities"],
+            nc12_indptr=arrays["bom_nc12_indptr"],
+            nc12_indices=arrays["bom_nc12_indices"],
+            nc12_quantities=arrays["bom_nc12_quantities"],
+            room_descriptions=arrays["bom_room_descriptions"].tolist(),
+            nc12_descriptions=arrays["bom_nc12_descriptions"].tolist(),
+            nc12_igts=arrays["bom_nc12_igts"].tolist(),
+        )
+
+    def room_row(self, room_code: int) -> Tuple[np.ndarray, np.ndarray]:
+        """12NC codes and quantities of one room - O(1) slice of the CSR arrays"""
+        start, end = self.room_indptr[room_code], self.room_indptr[room_code + 1]
+        return self.room_indices[start:end], self.room_quantities[start:end]
+
+    def nc12_column(self, nc12_code: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Room codes and quantities of one 12NC - O(1) slice of the CSC arrays"""
+        start, end = self.nc12_indptr[nc12_code], self.nc12_indptr[nc12_code + 1]
+        return self.nc12_indices[start:end], self.nc12_quantities[start:end]
+
+    def room_components(self, room_id: str) -> "BomView":
+        """Lazy {12NC: quantity} view for one room"""
+        return BomView(self, "room", self.room_codes[room_id])
+
+    def nc12_components(self, nc12_id: str) -> "BomView":
+        """Lazy {room: quantity} view for one 12NC"""
+        return BomView(self, "12NC", self.nc12_codes[nc12_id])
+
+
+class BomView(Mapping):
+    """Read-only {ID: quantity} mapping over one row (room) or column (12NC) of the store
+
+    Nothing is copied: every access slices the shared CSR/CSC arrays.
+    """
+
+    __slots__ = ("bom", "axis", "code")
+
+    def __init__(self, bom: BillOfMaterials, axis: str, code: int):
+        if axis not in ("room", "12NC"):
+            raise ValueError("axis must be 'room' or '12NC'")
+        self.bom = bom
+        self.axis = axis
+        self.code = code
+
+    def _entries(self) -> Tuple[np.ndarray, np.ndarray]:
+        if self.axis == "room":
+            return self.bom.room_row(self.code)
+        return self.bom.nc12_column(self.code)
+
+    def _other_ids(self) -> List[str]:
+        return self.bom.nc12_ids if self.axis == "room" else self.bom.room_ids
+
+    def _other_codes(self) -> Dict[str, int]:
+        return self.bom.nc12_codes if self.axis == "room" else self.bom.room_codes
+
+    def _position(self, key) -> int:
+        """Position of key inside this row/column, or -1 - O(log nnz of the row)"""
+        code = self._other_codes().get(key)
+        if code is None:
+            return -1
+        indices, _ = self._entries()
+        position = int(np.searchsorted(indices, code))
+        if position < indices.size and indices[position] == code:
+            return position
+        return -1
+
+    def __getitem__(self, key) -> int:
+        position = self._position(key)
+        if position < 0:
+            raise KeyError(key)
+        return int(self._entries()[1][position])
+
+    def __contains__(self, key) -> bool:
+        return self._position(key) >= 0
+
+    def __iter__(self) -> Iterator[str]:
+        other_ids = self._other_ids()
+        indices, _ = self._entries()
+        return (other_ids[code] for code in indices.tolist())
+
+    def __len__(self) -> int:
+        return int(self._entries()[0].size)
+
+    def items(self) -> "_BomItemsView":
+        return _BomItemsView(self)
+
+    def values(self) -> "_BomValuesView":
+        return _BomValuesView(self)
+
+    def total(self) -> int:
+        """Sum of all quantities in this row/column"""
+        return int(self._entries()[1].sum())
+
+    def __repr__(self) -> str:
+        return f"BomView({dict(self.items())!r})"
+
+
+class _BomItemsView(ItemsView):
+    """items() that walks the arrays once instead of looking every key up"""
+
+    def __iter__(self):
+        view = self._mapping
+        other_ids = view._other_ids()
+        indices, quantities = view._entries()
+        return ((other_ids[code], qty) for code, qty in zip(indices.tolist(), quantities.tolist()))
+
+
+class _BomValuesView(ValuesView):
+    """values() straight from the quantity slice"""
+
+    def __iter__(self):
+        return iter(self._mapping._entries()[1].tolist())
+
+
+def _indptr(codes: np.ndarray, size: int) -> np.ndarray:
+    """Compressed pointer array for codes in [0, size)"""
+    indptr = np.zeros(size + 1, dtype=np.int64)
+    np.cumsum(np.bincount(codes, minlength=size), out=indptr[1:])
+    return indptr
@@ -0,0 +1,190 @@
+# Columnar sales of many entities, grouped by entity ID
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.models.sales_history import SalesHistory
+
+
+@dataclass(eq=False)
+class GroupedSales:
+    """Sales of many entities in three flat arrays, grouped by entity and sorted by date
+
+    The sales of ids[i] are dates[offsets[i]:offsets[i + 1]] (date ordinals, see
+    date.toordinal) with the matching quantities.
+    """
+
+    ids: List[str]
+    offsets: np.ndarray  # int64, len(ids) + 1
+    dates: np.ndarray  # int32 date ordinals
+    quantities: np.ndarray  # int64
+    positions: Dict[str, int] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        """Build the ID -> group lookup"""
+        self.positions = {entity_id: i for i, entity_id in enumerate(self.ids)}
+
+    @classmethod
+    def empty(cls) -> "GroupedSales":
+        return cls([], np.zeros(1, dtype=np.int64), np.empty(0, np.int32), np.empty(0, np.int64))
+
+    @classmethod
+    def from_columns(
+        cls, ids: Sequence[str], dates: np.ndarray, quantities: np.ndarray
+    ) -> "GroupedSales":
+        """Group one row per sale (entity ID, date ordinal, quantity) by entity
+
+        Groups follow the first appearance of each ID; rows of one entity keep their
+        input order for equal dates.
+        """
+        codes, unique_ids = pd.factorize(np.asarray(ids, dtype=object))
+        return cls.from_codes(codes, list(unique_ids), dates, quantities)
+
+    @classmethod
+    def from_codes(
+        cls, codes: np.ndarray, ids: Sequence[str], dates: np.ndarray, quantities: np.ndarray
+    ) -> "GroupedSales":
+        """Group integer-coded sales (ids[codes[k]] is the entity of sale k) by entity
+
+        IDs without any sale are dropped; the others keep their order in ids.
+        """
+        codes = np.asarray(codes, dtype=np.int64)
+        counts = np.bincount(codes, minlength=len(ids))
+        used = counts > 0
+        if not used.any():
+            return cls.empty()
+        if not used.all():
+            codes = (np.cumsum(used) - 1)[codes]
+            ids = [entity_id for entity_id, keep in zip(ids, used.tolist()) if keep]
+            counts = counts[used]
+
+        order = np.lexsort((np.asarray(dates), codes))
+        offsets = np.zeros(len(ids) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        return cls(
+            ids=list(ids),
+            offsets=offsets,
+            dates=np.asarray(dates, dtype=np.int32)[order],
+            quantities=np.asarray(quantities, dtype=np.int64)[order],
+        )
+
+    @classmethod
+    def concat(cls, parts: Sequence["GroupedSales"]) -> "GroupedSales":
+        """Merge the sales of several parts (e.g. chunks of one file) into one grouping
+
+        Entities keep their order of first appearance across the parts.
+        """
+        parts = [part for part in parts if part.record_count]
+        if not parts:
+            return cls.empty()
+        if len(parts) == 1:
+            return parts[0]
+
+        positions: Dict[str, int] = {}
+        codes = []
+        for part in parts:
+            part_codes = np.array(
+                [positions.setdefault(entity_id, len(positions)) for entity_id in part.ids],
+                dtype=np.int64,
+            )
+            codes.append(np.repeat(part_codes, np.diff(part.offsets)))
+        return cls.from_codes(
+            np.concatenate(codes),
+            list(positions),
+            np.concatenate([part.dates for part in parts]),
+            np.concatenate([part.quantities for part in parts]),
+        )
+
+    @classmethod
+    def from_entities(cls, entities: Iterable) -> "GroupedSales":
+        """Collect the sales_history of Room/TwelveNC objects"""
+        ids, dates, quantities = [], [], []
+        for entity in entities:
+            history = SalesHistory.from_records(entity.sales_history, entity.id)
+            ids.append(np.full(len(history), entity.id, dtype=object))
+            dates.append(history.dates)
+            quantities.append(history.quantities)
+        if not ids:
+            return cls.empty()
+        return cls.from_columns(np.concatenate(ids), np.concatenate(dates), np.concatenate(quantities))
+
+    @classmethod
+    def from_histories(cls, ids: Sequence[str], histories: Sequence) -> "GroupedSales":
+        """Stack one sales history per ID, in the given order (groups may be empty, IDs may repeat)"""
+        histories = [SalesHistory.from_records(history, entity_id) for entity_id, history in zip(ids, histories)]
+        offsets = np.zeros(len(histories) + 1, dtype=np.int64)
+        np.cumsum([len(history) for history in histories], out=offsets[1:])
+        return cls(
+            ids=list(ids),
+            offsets=offsets,
+            dates=np.concatenate([history.dates for history in histories] or [np.empty(0, np.int32)]),
+            quantities=np.concatenate([history.quantities for history in histories] or [np.empty(0, np.int64)]),
+        )
+
+    def __len__(self) -> int:
+        """Number of entities with sales"""
+        return len(self.ids)
+
+    def __contains__(self, entity_id) -> bool:
+        return entity_id in self.positions
+
+    @property
+    def record_count(self) -> int:
+        return int(self.dates.size)
+
+    def get(self, entity_id: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Date ordinals and quantities of one entity (empty arrays if unknown)"""
+        position = self.positions.get(entity_id)
+        if position is None:
+            return self.dates[:0], self.quantities[:0]
+        start, end = self.offsets[position], self.offsets[position + 1]
+        return self.dates[start:end], self.quantities[start:end]
+
+    def history(self, entity_id: str) -> SalesHistory:
+        """SalesHistory of one entity, sharing this object's arrays (no copy)"""
+        dates, quantities = self.get(entity_id)
+        return SalesHistory(entity_id, dates, quantities, presorted=True)
+
+    def attach(self, entities: Iterable) -> Tuple[int, int]:
+        """Add the sales of each entity to its sales_history
+
+        Entities without earlier sales get a SalesHistory over slices of this
+        object's arrays; existing histories are merged with the new sales.
+
+        Returns:
+            (matched entities, attached records)
+        """
+        matched_entities = 0
+        matched_records = 0
+        for entity in entities:
+            history = self.history(entity.id)
+            if not len(history):
+                continue
+            matched_entities += 1
+            matched_records += len(history)
+            if len(entity.sales_history):
+                history = SalesHistory.concat(
+                    [SalesHistory.from_records(entity.sales_history, entity.id), history], entity.id
+                )
+            entity.sales_history = history
+        return matched_entities, matched_records
+
+    def to_arrays(self, prefix: str) -> Dict[str, np.ndarray]:
+        """Plain arrays for serialization (see from_arrays)"""
+        return {
+            f"{prefix}_ids": np.asarray(self.ids, dtype=str),
+            f"{prefix}_offsets": self.offsets,
+            f"{prefix}_dates": self.dates,
+            f"{prefix}_quantities": self.quantities,
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays, prefix: str) -> "GroupedSales":
+        return cls(
+            ids=arrays[f"{prefix}_ids"].tolist(),
+            offsets=arrays[f"{prefix}_offsets"],
+            dates=arrays[f"{prefix}_dates"],
+            quantities=arrays[f"{prefix}_quantities"],
+        )
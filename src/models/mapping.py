@@ -1,19 +1,20 @@
 from dataclasses import dataclass
-from typing import Dict, List
-from src.models.sales_record import SalesRecord
+from typing import Dict, Iterable, Mapping
+from src.models.sales_history import SalesHistory
+from src.models.sales_record import SalesRecord, intern_identifier
 
 
-@dataclass
+@dataclass(slots=True)
 class Room:
     """room with multiple 12NCs and its sales history"""
 
     id: str
     description: str
-    components: Dict[str, int]  # {12NC: quantity}
-    sales_history: List[SalesRecord]  # {12NC: SalesRecord}
+    components: Mapping[str, int]  # {12NC: quantity}, usually a BomView
+    sales_history: SalesHistory  # date-sorted sales; a list of SalesRecords is converted
 
     @property
-    def twelve_ncs(self) -> Dict[str, int]:
+    def twelve_ncs(self) -> Mapping[str, int]:
         """Alias for components field"""
         return self.components
 
@@ -39,33 +40,41 @@ class Room:
             )
 
     def filter_sales_by_date(self, start_date, end_date) -> Dict[str, SalesRecord]:
-        """Filter sales records by date range"""
-        filtered_sales = {}
-        for record in self.sales_history:
-            if start_date <= record.date <= end_date:
-                filtered_sales[record.identifier] = record
-        return filtered_sales
+        """Filter sales records by date range (binary search on the sorted history)"""
+        return _latest_record_per_identifier(self.sales_history.window(start_date, end_date))
 
     def __post_init__(self):
         """Validate data on initialization"""
-        if not self.id:
-            raise ValueError("Room cannot be empty")
-        if not self.description:
-            raise ValueError("Room description cannot be empty")
-
-
-@dataclass
+        validate_entity_fields("Room", [self.id], [self.description])
+        self.id = intern_identifier(self.id)
+        if not isinstance(self.sales_history, SalesHistory):
+            self.sales_history = SalesHistory.from_records(self.sales_history, self.id)
+
+    @classmethod
+    def trusted(
+        cls, id: str, description: str, components: Mapping[str, int], sales_history: SalesHistory
+    ) -> "Room":
+        """Room from fields batch-validated at ingest (skips __post_init__, see validate_entity_fields)"""
+        room = cls.__new__(cls)
+        room.id = intern_identifier(id)
+        room.description = description
+        room.components = components
+        room.sales_history = sales_history
+        return room
+
+
+@dataclass(slots=True)
 class TwelveNC:
     """Mapping between 12NCs and rooms"""
 
     id: str
     description: str
     igt: str
-    components: Dict[str, int]  # {room: quantity}
-    sales_history: List[SalesRecord]  # {room: SalesRecord}
+    components: Mapping[str, int]  # {room: quantity}, usually a BomView
+    sales_history: SalesHistory  # date-sorted sales; a list of SalesRecords is converted
 
     @property
-    def rooms(self) -> Dict[str, int]:
+    def rooms(self) -> Mapping[str, int]:
         """Alias for components field"""
         return self.components
 
@@ -91,22 +100,36 @@ class TwelveNC:
             )
 
     def filter_sales_by_date(self, start_date, end_date) -> Dict[str, SalesRecord]:
-        """Filter sales records by date range"""
-        filtered_sales = {}
-        for record in self.sales_history:
-            if start_date <= record.date <= end_date:
-                filtered_sales[record.identifier] = record
-        return filtered_sales
+        """Filter sales records by date range (binary search on the sorted history)"""
+        return _latest_record_per_identifier(self.sales_history.window(start_date, end_date))
 
     def __post_init__(self):
         """Validate data on initialization"""
-        if not self.id:
-            raise ValueError("12NC cannot be empty")
-        if not self.description:
-            raise ValueError("12NC description cannot be empty")
-
-
-@dataclass
+        validate_entity_fields("12NC", [self.id], [self.description])
+        self.id = intern_identifier(self.id)
+        if not isinstance(self.sales_history, SalesHistory):
+            self.sales_history = SalesHistory.from_records(self.sales_history, self.id)
+
+    @classmethod
+    def trusted(
+        cls,
+        id: str,
+        description: str,
+        igt: str,
+        components: Mapping[str, int],
+        sales_history: SalesHistory,
+    ) -> "TwelveNC":
+        """12NC from fields batch-validated at ingest (skips __post_init__, see validate_entity_fields)"""
+        nc12 = cls.__new__(cls)
+        nc12.id = intern_identifier(id)
+        nc12.description = description
+        nc12.igt = igt
+        nc12.components = components
+        nc12.sales_history = sales_history
+        return nc12
+
+
+@dataclass(slots=True)
 class G_entity:
     """Base class for Room and 12NC entities"""
 
@@ -119,3 +142,33 @@ def __init__(self, g_entity: Room | TwelveNC, entity_type: str):
         raise ValueError("entity_type must be 'room' or '12NC'")
     self.g_entity = g_entity
     self.entity_type = entity_type
+
+
+def _latest_record_per_identifier(window: SalesHistory) -> Dict[str, SalesRecord]:
+    """{identifier: last record} of a date-sorted window"""
+    if not len(window):
+        return {}
+    if window.identifiers is None:
+        return {window.identifier: window[-1]}
+    return {record.identifier: record for record in window}
+
+
+def validate_entity_fields(kind: str, ids: Iterable[str], descriptions: Iterable[str]) -> None:
+    """Check the required Room / 12NC fields of many entities in one pass
+
+    Ingest validates whole columns with this once and then builds the entities
+    with Room.trusted / TwelveNC.trusted; __post_init__ runs the same check per object.
+
+    input:
+        - kind: "Room" or "12NC", used in the error message
+        - ids / descriptions: parallel iterables of entity fields
+    output:
+        - None
+    raises:
+        - ValueError: for the first empty ID or description
+    """
+    for entity_id, description in zip(ids, descriptions):
+        if not entity_id:
+            raise ValueError(f"{kind} cannot be empty")
+        if not description:
+            raise ValueError(f"{kind} description cannot be empty ({entity_id})")
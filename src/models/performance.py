@@ -1,20 +1,28 @@
 from dataclasses import dataclass
 from typing import List
+
+import numpy as np
+import pandas as pd
+
 from src.models.mapping import G_entity
+from src.utils.periods import format_period
 
 
-@dataclass
+@dataclass(slots=True)
 class TimePeriod:
     """Simple time period definition
     label - e.g. "2021-Q1", "2021", "Jan 2021"
     quantity - total quantity sold in that period
+    index - period number in the granularity of its PerformanceData (see utils.periods),
+            None for periods only known by label
     """
 
     label: str
     quantity: int
+    index: int | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class PerformanceData:
     """Performance summary over time"""
 
@@ -45,3 +53,25 @@ class PerformanceData:
 
     def get_entity_id(self) -> str:
         return self.g_entity.g_entity.id
+
+
+@dataclass(slots=True)
+class PerformanceTable:
+    """Period totals of many entities at once (see PerformanceAnalyzer.analyze_all)"""
+
+    entity_type: str  # "room" or "12NC"
+    granularity: str  # "monthly", "quarterly", "yearly"
+    ids: List[str]  # one per row
+    periods: np.ndarray  # period numbers of the columns (see utils.periods), every period of the window
+    quantities: np.ndarray  # int64 (entities, periods)
+    totals: np.ndarray  # int64 per entity
+    averages: np.ndarray  # float64 per entity: total / periods with a sale, 0.0 without sales
+
+    @property
+    def labels(self) -> List[str]:
+        """Column labels, as in PerformanceData periods"""
+        return [format_period(period, self.granularity) for period in self.periods.tolist()]
+
+    def to_frame(self) -> pd.DataFrame:
+        """Wide DataFrame: one row per entity ID, one column per period label"""
+        return pd.DataFrame(self.quantities, index=pd.Index(self.ids, name="id"), columns=self.labels)
@@ -2,7 +2,7 @@ from dataclasses import dataclass
 from src.models.mapping import G_entity
 
 
-@dataclass
+@dataclass(slots=True)
 class Prediction:
     """Prediction for a future period"""
 
@@ -0,0 +1,235 @@
+# Columnar, date-sorted sales history of one Room or 12NC
+from collections.abc import Sequence
+from datetime import date
+from functools import lru_cache
+from typing import Iterable, Iterator, List
+
+import numpy as np
+
+from src.models.sales_record import SalesRecord, intern_identifier
+
+# Records built from a history share one date object per day
+_date_of = lru_cache(maxsize=1 << 16)(date.fromordinal)
+
+# Shared by every empty history (most entities start without sales)
+_NO_DATES = np.empty(0, np.int32)
+_NO_QUANTITIES = np.empty(0, np.int64)
+_NO_DATES.flags.writeable = _NO_QUANTITIES.flags.writeable = False
+
+
+class SalesHistory(Sequence):
+    """Read-only sales of one entity as two parallel arrays sorted by date
+
+    dates holds int32 date ordinals (date.toordinal) and quantities int64, so one
+    sale costs 12 bytes. The arrays are usually slices of a GroupedSales, shared
+    rather than copied. Indexing and iteration build SalesRecord objects on
+    demand for callers that work record by record; slicing returns another
+    SalesHistory.
+
+    Date-range queries binary-search the sorted dates (O(log n)); range totals
+    use a cumulative quantity array built on first use (O(1) per query after that).
+    """
+
+    __slots__ = ("identifier", "dates", "quantities", "identifiers", "_prefix")
+
+    def __init__(
+        self,
+        identifier: str = "",
+        dates: np.ndarray | None = None,
+        quantities: np.ndarray | None = None,
+        identifiers: np.ndarray | None = None,
+        presorted: bool = False,
+    ):
+        """
+        Args:
+            identifier: Entity ID given to every record
+            dates: Date ordinals
+            quantities: Quantity per sale, non-negative
+            identifiers: Optional per-sale identifiers (only for histories built from
+                records with differing identifiers)
+            presorted: dates are known to be sorted (skips the sort)
+
+        Raises:
+            ValueError: If the arrays differ in length or a quantity is negative
+        """
+        dates = _NO_DATES if dates is None else np.asarray(dates, dtype=np.int32)
+        quantities = _NO_QUANTITIES if quantities is None else np.asarray(quantities, dtype=np.int64)
+        if dates.shape != quantities.shape or dates.ndim != 1:
+            raise ValueError("dates and quantities must be 1-D arrays of equal length")
+        if quantities.size and quantities.min() < 0:
+            raise ValueError("Quantity cannot be negative")
+        if not presorted and dates.size > 1 and np.any(dates[1:] < dates[:-1]):
+            order = np.argsort(dates, kind="stable")
+            dates, quantities = dates[order], quantities[order]
+            if identifiers is not None:
+                identifiers = np.asarray(identifiers, dtype=object)[order]
+
+        self.identifier = intern_identifier(identifier)
+        self.dates = dates
+        self.quantities = quantities
+        self.identifiers = identifiers
+        self._prefix = None
+
+    @classmethod
+    def from_records(cls, records: Iterable[SalesRecord], identifier: str = "") -> "SalesHistory":
+        """Build a history from SalesRecord objects (or anything with identifier/date/quantity)"""
+        if isinstance(records, SalesHistory):
+            return records
+        records = list(records)
+        if not records:
+            return cls(identifier)
+        record_ids = [record.identifier for record in records]
+        identifiers = None
+        if any(record_id != record_ids[0] for record_id in record_ids):
+            identifiers = np.asarray(record_ids, dtype=object)
+        else:
+            identifier = record_ids[0]
+        return cls(
+            identifier,
+            np.fromiter((record.date.toordinal() for record in records), np.int32, len(records)),
+            np.fromiter((record.quantity for record in records), np.int64, len(records)),
+            identifiers=identifiers,
+        )
+
+    @classmethod
+    def concat(cls, histories: Iterable["SalesHistory"], identifier: str = "") -> "SalesHistory":
+        """Merge several histories of one entity, re-sorting by date"""
+        histories = [history for history in histories if len(history)]
+        if not histories:
+            return cls(identifier)
+        if len(histories) == 1:
+            return histories[0]
+        identifiers = None
+        if any(h.identifiers is not None or h.identifier != histories[0].identifier for h in histories):
+            identifiers = np.concatenate([h._identifier_array() for h in histories])
+        return cls(
+            histories[0].identifier,
+            np.concatenate([h.dates for h in histories]),
+            np.concatenate([h.quantities for h in histories]),
+            identifiers=identifiers,
+        )
+
+    def _identifier_array(self) -> np.ndarray:
+        if self.identifiers is not None:
+            return self.identifiers
+        return np.full(len(self), self.identifier, dtype=object)
+
+    def _record(self, index: int) -> SalesRecord:
+        identifier = self.identifier if self.identifiers is None else self.identifiers[index]
+        return SalesRecord.trusted(
+            identifier, int(self.quantities[index]), _date_of(int(self.dates[index]))
+        )
+
+    def __len__(self) -> int:
+        return int(self.dates.size)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            if index.step is not None and index.step < 0:
+                # A history is date-sorted by definition: reversed selections are record lists
+                return [self._record(position) for position in range(*index.indices(len(self)))]
+            return SalesHistory(
+                self.identifier,
+                self.dates[index],
+                self.quantities[index],
+                None if self.identifiers is None else self.identifiers[index],
+                presorted=True,
+            )
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("sales history index out of range")
+        return self._record(index)
+
+    def __iter__(self) -> Iterator[SalesRecord]:
+        if self.identifiers is None:
+            identifier = self.identifier
+            for ordinal, quantity in zip(self.dates.tolist(), self.quantities.tolist()):
+                yield SalesRecord.trusted(identifier, quantity, _date_of(ordinal))
+        else:
+            for index in range(len(self)):
+                yield self._record(index)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, SalesHistory):
+            return (
+                np.array_equal(self.dates, other.dates)
+                and np.array_equal(self.quantities, other.quantities)
+                and self._identifier_array().tolist() == other._identifier_array().tolist()
+            )
+        if isinstance(other, (list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"SalesHistory({self.identifier!r}, {len(self)} sales)"
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the arrays (shared slices included)"""
+        return self.dates.nbytes + self.quantities.nbytes
+
+    @property
+    def first_date(self) -> date | None:
+        return date.fromordinal(int(self.dates[0])) if len(self) else None
+
+    @property
+    def last_date(self) -> date | None:
+        return date.fromordinal(int(self.dates[-1])) if len(self) else None
+
+    def total_quantity(self) -> int:
+        """Sum of all quantities"""
+        return int(self.prefix[-1])
+
+    @property
+    def prefix(self) -> np.ndarray:
+        """Cumulative quantities with a leading 0: prefix[j] - prefix[i] is the total of sales i..j-1"""
+        if self._prefix is None:
+            prefix = np.zeros(len(self) + 1, dtype=np.int64)
+            np.cumsum(self.quantities, out=prefix[1:])
+            self._prefix = prefix
+        return self._prefix
+
+    def bounds(self, start: date | None = None, end: date | None = None) -> tuple[int, int]:
+        """Index range [i, j) of the sales dated start..end (both inclusive, None = open)"""
+        i = 0 if start is None else int(np.searchsorted(self.dates, start.toordinal(), "left"))
+        j = len(self) if end is None else int(np.searchsorted(self.dates, end.toordinal(), "right"))
+        return i, max(i, j)
+
+    def window(self, start: date | None = None, end: date | None = None) -> "SalesHistory":
+        """Sales dated start..end (inclusive), as a slice sharing these arrays"""
+        i, j = self.bounds(start, end)
+        return self[i:j]
+
+    def total_between(self, start: date | None = None, end: date | None = None) -> int:
+        """Total quantity sold from start to end (inclusive)"""
+        i, j = self.bounds(start, end)
+        prefix = self.prefix
+        return int(prefix[j] - prefix[i])
+
+    def totals_between(self, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+        """Total quantity of many [start, end] windows at once
+
+        Args:
+            starts / ends: Date ordinals of the first and last day of each window
+
+        Returns:
+            int64 array with one total per window
+        """
+        i = np.searchsorted(self.dates, np.asarray(starts), "left")
+        j = np.maximum(i, np.searchsorted(self.dates, np.asarray(ends), "right"))
+        prefix = self.prefix
+        return prefix[j] - prefix[i]
+
+    def years(self) -> List[int]:
+        """Sorted distinct years with at least one sale"""
+        if not len(self):
+            return []
+        first, last = self.first_date.year, self.last_date.year
+        if first == last:
+            return [first]
+        bounds = np.array([date(year, 1, 1).toordinal() for year in range(first, last + 2)])
+        counts = np.diff(np.searchsorted(self.dates, bounds))
+        return [first + offset for offset in np.flatnonzero(counts).tolist()]
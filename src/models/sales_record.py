@@ -1,11 +1,17 @@
 # Data class for individual sales records in the Room-12NC Performance Center application
+import sys
 from dataclasses import dataclass
 from datetime import date
 
 
-@dataclass
+def intern_identifier(value):
+    """Interned copy of an identifier string, so all objects of one entity share it"""
+    return sys.intern(value) if type(value) is str else value
+
+
+@dataclass(slots=True)
 class SalesRecord:
-    """Individual sales transaction"""
+    """Individual sales transaction (slotted; the identifier string is interned)"""
 
     identifier: str  # Could be room or 12NC depending on context
     quantity: int
@@ -17,6 +23,16 @@ class SalesRecord:
             raise ValueError("Quantity cannot be negative")
         if not self.identifier:
             raise ValueError("Identifier cannot be empty")
+        self.identifier = intern_identifier(self.identifier)
+
+    @classmethod
+    def trusted(cls, identifier: str, quantity: int, date: date) -> "SalesRecord":
+        """Record from values validated at ingest (skips __post_init__, see SalesHistory)"""
+        record = cls.__new__(cls)
+        record.identifier = intern_identifier(identifier)
+        record.quantity = quantity
+        record.date = date
+        return record
 
     def recognize_type(self) -> str:
         """Determine if identifier is a 12NC or Room based on format"""
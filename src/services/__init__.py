@@ -1,5 +1,6 @@
 """Services package - main service orchestration and business logic for Room 12NC Performance Center"""
 
+from .entity_catalog import EntityCatalog
 from .performance_center import PerformanceCenter
 
-__all__ = ['PerformanceCenter']
+__all__ = ['EntityCatalog', 'PerformanceCenter']
@@ -0,0 +1,257 @@
+"""Entity Catalog - loaded Rooms and 12NCs with lookup indexes built once per load"""
+
+import itertools
+from datetime import date
+from typing import Dict, FrozenSet, Iterable, List, Set, Tuple
+
+import numpy as np
+
+from ..analysis.demand_cube import DemandCube
+from ..models import GroupedSales, Room, TwelveNC
+from .search_index import MAX_SEARCH_RESULTS, IdSearchIndex, TokenSearchIndex, tokenize
+
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+# Every catalog (one per data load) gets the next data version; caches of older versions are stale
+_versions = itertools.count(1)
+
+
+def normalize_kind(kind: str) -> str:
+    """Map the UI modes / G_entity types ("room", "12nc", "12NC") to "room" or "12NC" """
+    if kind.lower() == "room":
+        return "room"
+    if kind.lower() == "12nc":
+        return "12NC"
+    raise ValueError(f"Unknown entity kind: {kind}")
+
+
+class _KindIndex:
+    """Indexes of one entity kind; per-entity arrays are aligned with the sorted IDs"""
+
+    def __init__(self, entities: Iterable[Room | TwelveNC]):
+        self.by_id: Dict[str, Room | TwelveNC] = {entity.id: entity for entity in entities}
+        self.ids: List[str] = sorted(self.by_id)
+        self.positions: Dict[str, int] = {entity_id: i for i, entity_id in enumerate(self.ids)}
+        # Search indexes, built on the first search
+        self.id_index: IdSearchIndex | None = None
+        self.text_index: TokenSearchIndex | None = None
+        # Entities x months sales matrix, built on the first analysis
+        self.cube: DemandCube | None = None
+        # Flat sales arrays of all entities and the histories they were built from, built on first use
+        self.sales: GroupedSales | None = None
+        self.sales_histories: List | None = None
+        # Description (and 12NC IGT) words; descriptions repeat a lot, tokenize each distinct one once
+        token_memo: Dict[tuple, FrozenSet[str]] = {}
+        self.tokens: Dict[str, FrozenSet[str]] = {}
+        # IDs per distinct (description, IGT), for substring search
+        self.ids_by_text: Dict[tuple, List[str]] = {}
+        for entity_id in self.ids:
+            entity = self.by_id[entity_id]
+            text = (entity.description, getattr(entity, "igt", ""))
+            tokens = token_memo.get(text)
+            if tokens is None:
+                tokens = token_memo[text] = tokenize(text[0]) | tokenize(text[1])
+                self.ids_by_text[text] = []
+            self.tokens[entity_id] = tokens
+            self.ids_by_text[text].append(entity_id)
+
+        # One pass over all sales of the kind: per-entity date range and totals
+        histories = [self.by_id[entity_id].sales_history for entity_id in self.ids]
+        counts = np.fromiter((len(history) for history in histories), np.int64, len(histories))
+        offsets = np.zeros(len(histories) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        dates = np.concatenate([history.dates for history in histories] or [np.empty(0, np.int32)])
+        prefix = np.zeros(dates.size + 1, dtype=np.int64)
+        if histories:
+            np.cumsum(np.concatenate([history.quantities for history in histories]), out=prefix[1:])
+
+        has_sales = counts > 0
+        self.sale_count = int(dates.size)
+        self.totals = prefix[offsets[1:]] - prefix[offsets[:-1]]
+        self.first = np.full(len(histories), -1, dtype=np.int64)
+        self.last = np.full(len(histories), -1, dtype=np.int64)
+        self.first[has_sales] = dates[offsets[:-1][has_sales]]
+        self.last[has_sales] = dates[offsets[1:][has_sales] - 1]
+
+        # Years with at least one sale: the calendar years of the distinct sale days
+        self.years: List[int] = []
+        if dates.size:
+            low = int(dates.min())
+            days = np.flatnonzero(np.bincount(dates - low)) + (low - EPOCH_ORDINAL)
+            sale_years = days.astype("datetime64[D]").astype("datetime64[Y]").astype(np.int64)
+            self.years = (np.unique(sale_years) + 1970).tolist()
+
+
+class EntityCatalog:
+    """Rooms and 12NCs of one load with precomputed indexes
+
+    Built once after loading (O(total sales)); afterwards entity lookups, date
+    ranges, lifetime totals and description tokens are O(1). Kinds are "room"
+    and "12NC" (the UI's "12nc" is accepted too).
+    """
+
+    def __init__(self, rooms: Iterable[Room], nc12s: Iterable[TwelveNC]):
+        """
+        Args:
+            rooms: Room objects
+            nc12s: TwelveNC objects
+        """
+        self._kinds = {"room": _KindIndex(rooms), "12NC": _KindIndex(nc12s)}
+        # Data version of this load (see PerformanceCache)
+        self.version = next(_versions)
+        # Sorted years with at least one sale of any entity
+        self.years: List[int] = sorted(set(self._kinds["room"].years) | set(self._kinds["12NC"].years))
+
+    @classmethod
+    def empty(cls) -> "EntityCatalog":
+        return cls([], [])
+
+    def _index(self, kind: str) -> _KindIndex:
+        return self._kinds[normalize_kind(kind)]
+
+    @property
+    def rooms(self) -> Dict[str, Room]:
+        """{room ID: Room}"""
+        return self._kinds["room"].by_id
+
+    @property
+    def nc12s(self) -> Dict[str, TwelveNC]:
+        """{12NC: TwelveNC}"""
+        return self._kinds["12NC"].by_id
+
+    @property
+    def sale_count(self) -> int:
+        """Number of sales over all entities"""
+        return self._kinds["room"].sale_count + self._kinds["12NC"].sale_count
+
+    def count(self, kind: str) -> int:
+        return len(self._index(kind).ids)
+
+    def ids(self, kind: str) -> List[str]:
+        """Sorted IDs of one kind (shared list, do not modify)"""
+        return self._index(kind).ids
+
+    def entities(self, kind: str) -> List[Room | TwelveNC]:
+        """Entities of one kind in ID order"""
+        index = self._index(kind)
+        return [index.by_id[entity_id] for entity_id in index.ids]
+
+    def get(self, kind: str, entity_id: str) -> Room | TwelveNC | None:
+        return self._index(kind).by_id.get(entity_id)
+
+    def description(self, kind: str, entity_id: str) -> str:
+        entity = self.get(kind, entity_id)
+        return entity.description if entity else ""
+
+    def date_range(self, kind: str, entity_id: str) -> Tuple[date, date] | None:
+        """First and last sale date of an entity, None without sales"""
+        index = self._index(kind)
+        position = index.positions.get(entity_id)
+        if position is None or index.first[position] < 0:
+            return None
+        return date.fromordinal(int(index.first[position])), date.fromordinal(int(index.last[position]))
+
+    def id_index(self, kind: str) -> IdSearchIndex:
+        """Prefix / substring index over the IDs of one kind (built once, on first use)"""
+        index = self._index(kind)
+        if index.id_index is None:
+            index.id_index = IdSearchIndex(index.ids)
+        return index.id_index
+
+    def cube(self, kind: str) -> DemandCube:
+        """Monthly demand of every entity of a kind (rows in ID order), built once"""
+        index = self._index(kind)
+        if index.cube is None:
+            index.cube = DemandCube.from_histories(
+                index.ids, [index.by_id[entity_id].sales_history for entity_id in index.ids]
+            )
+        return index.cube
+
+    def sales(self, kind: str) -> GroupedSales:
+        """Sales of every entity of a kind as flat arrays (groups in ID order, empty ones included), built once"""
+        index = self._index(kind)
+        if index.sales is None:
+            index.sales_histories = [index.by_id[entity_id].sales_history for entity_id in index.ids]
+            index.sales = GroupedSales.from_histories(index.ids, index.sales_histories)
+        return index.sales
+
+    def sales_row(self, kind: str, entity: Room | TwelveNC) -> int | None:
+        """Group of an entity in sales(kind), None if unknown or its sales changed since they were built"""
+        grouped = self.sales(kind)
+        position = grouped.positions.get(entity.id)
+        if position is None or self._index(kind).sales_histories[position] is not entity.sales_history:
+            return None
+        return position
+
+    def search_ids(self, kind: str, text: str, limit: int = MAX_SEARCH_RESULTS) -> List[str]:
+        """Ranked IDs of one kind containing text (see IdSearchIndex.search)"""
+        return self.id_index(kind).search(text, limit)
+
+    def text_index(self, kind: str) -> TokenSearchIndex:
+        """Inverted index over the description / IGT tokens of one kind (built once, on first use)"""
+        index = self._index(kind)
+        if index.text_index is None:
+            index.text_index = TokenSearchIndex(index.ids, index.tokens)
+        return index.text_index
+
+    def search_text(self, kind: str, text: str, limit: int = MAX_SEARCH_RESULTS) -> List[str]:
+        """Ranked IDs of one kind whose description / IGT words match text (see TokenSearchIndex.search)"""
+        return self.text_index(kind).search(text, limit)
+
+    def search(self, kind: str, text: str, limit: int = MAX_SEARCH_RESULTS) -> List[str]:
+        """Ranked IDs of one kind matching text: ID matches first, then description / IGT matches"""
+        results = self.search_ids(kind, text, limit)
+        if len(results) < limit:
+            found = set(results)
+            for entity_id in self.search_text(kind, text, limit):
+                if entity_id not in found:
+                    results.append(entity_id)
+                    if len(results) == limit:
+                        break
+        return results
+
+    def matching_ids(self, kind: str, text: str) -> Set[str]:
+        """
+        All IDs of one kind whose ID, description or IGT contains text (case-insensitive),
+        plus those whose description / IGT words match it (see TokenSearchIndex.search)
+        """
+        limit = self.count(kind)
+        matches = set(self.search_ids(kind, text, limit)) | set(self.search_text(kind, text, limit))
+        # Substring matches inside words ("ssor" in "Processor"); each distinct text is scanned once
+        needle = text.strip().casefold()
+        if needle:
+            for (description, igt), entity_ids in self._index(kind).ids_by_text.items():
+                if needle in description.casefold() or needle in igt.casefold():
+                    matches.update(entity_ids)
+        return matches
+
+    def date_span(self) -> Tuple[date, date] | None:
+        """First and last sale date over all entities, None without sales"""
+        firsts = [index.first[index.first >= 0] for index in self._kinds.values()]
+        lasts = np.concatenate([index.last for index in self._kinds.values()])
+        if not any(first.size for first in firsts):
+            return None
+        return date.fromordinal(int(np.concatenate(firsts).min())), date.fromordinal(int(lasts.max()))
+
+    def lifetime_total(self, kind: str, entity_id: str) -> int:
+        """Total quantity ever sold of an entity (0 if unknown)"""
+        index = self._index(kind)
+        position = index.positions.get(entity_id)
+        return 0 if position is None else int(index.totals[position])
+
+    def tokens(self, kind: str, entity_id: str) -> FrozenSet[str]:
+        """Case-folded description words of an entity"""
+        return self._index(kind).tokens.get(entity_id, frozenset())
+
+    def kind_years(self, kind: str) -> List[int]:
+        """Sorted years with at least one sale of this kind"""
+        return self._index(kind).years
+
+    def years_of(self, kind: str, entity_ids: Iterable[str]) -> List[int]:
+        """Sorted years with a sale of any of the given entities (O(log n) per entity)"""
+        by_id = self._index(kind).by_id
+        years = set()
+        for entity_id in entity_ids:
+            entity = by_id.get(entity_id)
+            if entity is not None:
+                years.update(entity.sales_history.years())
+        return sorted(years)
@@ -1,33 +1,48 @@
 """Performance Center - High-level service orchestrating all features"""
 
-from typing import List, Dict
+from dataclasses import asdict
+from datetime import date
+from typing import List, Dict, Literal, Sequence
 
+from src.utils.clock import SessionClock, session_clock
 from src.utils.date_utils import _infer_granularity
-from ..models import PerformanceData, Prediction, Room, TwelveNC, G_entity
+from ..models import PerformanceData, PerformanceTable, Prediction, Room, TwelveNC, G_entity
 from ..analysis import PerformanceAnalyzer, Predictor
+from .entity_catalog import EntityCatalog
+from .search_index import MAX_SEARCH_RESULTS
 
 
 class PerformanceCenter:
     """High-level API combining all features for Room-12NC Performance Analysis"""
 
-    def __init__(self, rooms: List[Room], nc12s: List[TwelveNC]):
+    def __init__(
+        self,
+        rooms: List[Room],
+        nc12s: List[TwelveNC],
+        catalog: EntityCatalog | None = None,
+        clock: SessionClock | None = None,
+    ):
         """
         Initialize Performance Center with sales data and CBOM data
 
         Args:
-            sales_data: List of historical sales records coming from ymbd and fit reports
-            rooms: List of Room objects (CBOM data)
-            nc12s: List of TwelveNC objects (CBOM data)
+            rooms: List of Room objects (CBOM data, with their sales history)
+            nc12s: List of TwelveNC objects (CBOM data, with their sales history)
+            catalog: EntityCatalog of the same entities, built here if not given
+            clock: "today" of calls without an explicit as_of (default: the session clock)
         """
         self.rooms = rooms
         self.nc12s = nc12s
-        self.analyzer = PerformanceAnalyzer()
+        self.catalog = catalog if catalog is not None else EntityCatalog(rooms, nc12s)
+        self.clock = clock if clock is not None else session_clock
+        self.analyzer = PerformanceAnalyzer(cube_source=self.catalog, clock=self.clock)
 
     def analyze_entity_performance(
         self,
         analyzed_obj: G_entity,
         lookback_years: int = 3,
         granularity: str = "monthly",
+        as_of: date | None = None,
     ) -> PerformanceData:
         """
         Analyze historical performance for a specific entity (Room or TwelveNC)
@@ -36,12 +51,38 @@ class PerformanceCenter:
             analyzed_obj: Room or TwelveNC object
             lookback_years: Number of years of history to analyze
             granularity: Time granularity ("monthly", "quarterly", "yearly")
+            as_of: Last day of the analyzed window (default: the clock's today)
 
         Returns:
             PerformanceData object with historical performance
         """
         return self.analyzer.analyze(
-            analyzed_obj, lookback_years=lookback_years, granularity=granularity
+            analyzed_obj, lookback_years=lookback_years, granularity=granularity, as_of=as_of
+        )
+
+    def analyze_all(
+        self,
+        entity_type: str = "12NC",
+        entity_ids: Sequence[str] | Literal["all"] = "all",
+        lookback_years: int = 3,
+        granularity: str = "monthly",
+        as_of: date | None = None,
+    ) -> PerformanceTable:
+        """
+        Analyze many entities of one type at once
+
+        Args:
+            entity_type: "room" or "12NC"
+            entity_ids: IDs to analyze, or "all"
+            lookback_years: Number of years of history to analyze
+            granularity: Time granularity ("monthly", "quarterly", "yearly")
+            as_of: Last day of the analyzed window (default: the clock's today)
+
+        Returns:
+            PerformanceTable of period totals (see PerformanceTable.to_frame), totals and averages
+        """
+        return self.analyzer.analyze_all(
+            entity_type, entity_ids, lookback_years=lookback_years, granularity=granularity, as_of=as_of
         )
 
     def predict_entity_demand(
@@ -51,6 +92,7 @@ class PerformanceCenter:
         lookback_years: int = 3,
         method: str = "average",
         buffer_percentage: float = 10.0,
+        as_of: date | None = None,
     ) -> Prediction:
         """
         Predict future demand for an entity (Room or TwelveNC) (Feature 2 + Feature 3 combined)
@@ -60,20 +102,23 @@ class PerformanceCenter:
             lookback_years: Years of history to use for prediction
             method: Prediction method ("average", "last", "trend")
             buffer_percentage: Safety buffer percentage
+            as_of: Date of the analysis and prediction (default: the clock's today)
 
         Returns:
             Prediction object with forecasted demand
         """
         granularity = _infer_granularity(target_time)
+        # Analysis and prediction use the same as-of date
+        as_of = self.clock.resolve(as_of)
         # First analyze historical performance
         performance = self.analyze_entity_performance(
-            entity, lookback_years=lookback_years, granularity=granularity
+            entity, lookback_years=lookback_years, granularity=granularity, as_of=as_of
         )
 
         # Then predict based on performance
-        predictor = Predictor(performance)
+        predictor = Predictor(performance, clock=self.clock)
         return predictor.predict(
-            target_time=target_time, method=method, buffer_percentage=buffer_percentage
+            target_time=target_time, method=method, buffer_percentage=buffer_percentage, as_of=as_of
         )
 
     def get_entity_components(self, entity: G_entity) -> Dict[str, int] | None:
@@ -86,19 +131,38 @@ class PerformanceCenter:
         Returns:
             Dictionary of 12NC components or None if not found
         """
-        if isinstance(entity.g_entity, Room):
-            for room_obj in self.rooms:
-                if room_obj.id == entity.g_entity.id:
-                    return room_obj.components
-        elif isinstance(entity.g_entity, TwelveNC):
-            for tnc_obj in self.nc12s:
-                if tnc_obj.id == entity.g_entity.id:
-                    return tnc_obj.components
-        else:
+        if not isinstance(entity.g_entity, (Room, TwelveNC)):
             raise ValueError("Entity must be of type Room or TwelveNC")
+        kind = "room" if isinstance(entity.g_entity, Room) else "12NC"
+        catalog_entity = self.catalog.get(kind, entity.g_entity.id)
+        return catalog_entity.components if catalog_entity is not None else None
+
+    def search_entities(
+        self, text: str, entity_type: str = "12NC", limit: int = MAX_SEARCH_RESULTS
+    ) -> List[Room | TwelveNC]:
+        """
+        Find entities by ID, description or IGT number
+
+        Args:
+            text: Query; an ID fragment or description / IGT words (AND of word prefixes)
+            entity_type: "room" or "12NC"
+            limit: Maximum number of results
+
+        Returns:
+            Ranked Room or TwelveNC objects: ID matches first, then description / IGT matches
+        """
+        return [
+            self.catalog.get(entity_type, entity_id)
+            for entity_id in self.catalog.search(entity_type, text, limit)
+        ]
 
     def analyze_multiple_entities(
-        self, entities: List[G_entity], lookback_years: int = 3, granularity: str = "monthly"
+        self,
+        entities: List[G_entity],
+        lookback_years: int = 3,
+        granularity: str = "monthly",
+        as_of: date | None = None,
+        workers: int = 1,
     ) -> dict[str, List[PerformanceData]]:
         """
         Analyze performance for multiple entities (Room or TwelveNC) at once
@@ -107,12 +171,15 @@ class PerformanceCenter:
             entities: List of G_entity objects to analyze
             lookback_years: Years of history to analyze
             granularity: Time granularity
+            as_of: Last day of the analyzed windows (default: the clock's today)
+            workers: Worker processes for the period totals (1: in this process); see
+                PerformanceAnalyzer.multi_item_analyze
 
         Returns:
             Dictionary of PerformanceData objects keyed by entity identifier
         """
         return self.analyzer.multi_item_analyze(
-            entities, lookback_years=lookback_years, granularity=granularity
+            entities, lookback_years=lookback_years, granularity=granularity, as_of=as_of, workers=workers
         )
 
     def get_summary_stats(self) -> Dict:
@@ -122,12 +189,14 @@ class PerformanceCenter:
         Returns:
             Dictionary with counts and summary info
         """
+        date_span = self.catalog.date_span()
         return {
-            "total_sales_records": len(self.sales_data),
-            "total_rooms_in_cbom": len(self.room_mappings),
-            "total_12ncs_in_cbom": len(self.nc12_mappings),
+            "total_sales_records": self.catalog.sale_count,
+            "total_rooms_in_cbom": self.catalog.count("room"),
+            "total_12ncs_in_cbom": self.catalog.count("12NC"),
             "date_range": {
-                "earliest": min(s.date for s in self.sales_data) if self.sales_data else None,
-                "latest": max(s.date for s in self.sales_data) if self.sales_data else None,
+                "earliest": date_span[0] if date_span else None,
+                "latest": date_span[1] if date_span else None,
             },
+            "analysis_cache": asdict(self.analyzer.cache.stats),
         }
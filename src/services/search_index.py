@@ -0,0 +1,179 @@
+"""Search indexes over entity IDs and descriptions, built once per load (see EntityCatalog)"""
+
+import re
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Dict, FrozenSet, Iterable, List, Mapping, Sequence
+
+import numpy as np
+
+MAX_SEARCH_RESULTS = 200
+_TOKEN = re.compile(r"\w+")
+# Sorts after every string that starts with a given prefix
+_PREFIX_END = "\U0010ffff"
+
+
+def tokenize(text: str) -> FrozenSet[str]:
+    """Case-folded words of a text (descriptions, IGT numbers, queries)"""
+    return frozenset(_TOKEN.findall(text.casefold())) if text else frozenset()
+
+
+def _trigrams(text: str) -> set:
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+class IdSearchIndex:
+    """Case-insensitive prefix and substring search over a list of IDs
+
+    Prefix queries bisect a sorted array of case-folded IDs (O(log n + k));
+    substring queries intersect the posting lists of the query's trigrams and
+    only verify the remaining candidates. Results are ranked: exact match,
+    then prefix matches, then other substring matches (earlier match first),
+    each group in case-insensitive ID order, and capped at a limit.
+    """
+
+    def __init__(self, ids: Sequence[str]):
+        """
+        Args:
+            ids: Entity IDs
+        """
+        self.ids: List[str] = list(ids)
+        keys = [entity_id.casefold() for entity_id in self.ids]
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        # Positions in sorted key order: sorted_keys[i] belongs to ids[order[i]]
+        self._sorted_keys = [keys[i] for i in order]
+        self._order = order
+
+        postings: Dict[str, List[int]] = defaultdict(list)
+        for rank, key in enumerate(self._sorted_keys):
+            for trigram in _trigrams(key):
+                postings[trigram].append(rank)
+        # Ranks are appended in increasing order, so every posting list is sorted
+        self._postings: Dict[str, np.ndarray] = {
+            trigram: np.array(ranks, dtype=np.int32) for trigram, ranks in postings.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _prefix_ranks(self, key: str) -> range:
+        keys = self._sorted_keys
+        start = bisect_left(keys, key)
+        return range(start, bisect_left(keys, key + _PREFIX_END, start))
+
+    def _substring_ranks(self, key: str) -> np.ndarray:
+        """Sorted ranks of the keys containing key"""
+        if len(key) < 3:
+            return np.array([rank for rank, k in enumerate(self._sorted_keys) if key in k], dtype=np.int32)
+        lists = []
+        for trigram in _trigrams(key):
+            posting = self._postings.get(trigram)
+            if posting is None:
+                return np.empty(0, dtype=np.int32)
+            lists.append(posting)
+        lists.sort(key=len)
+        candidates = lists[0]
+        for posting in lists[1:]:
+            candidates = np.intersect1d(candidates, posting, assume_unique=True)
+            if not candidates.size:
+                break
+        # Trigrams can all occur without the whole string; verify
+        keys = self._sorted_keys
+        return np.array([rank for rank in candidates.tolist() if key in keys[rank]], dtype=np.int32)
+
+    def prefix(self, text: str, limit: int = MAX_SEARCH_RESULTS) -> List[str]:
+        """IDs starting with text (case-insensitive), in ID order"""
+        ranks = self._prefix_ranks(text.casefold())
+        return [self.ids[self._order[rank]] for rank in ranks[:limit]]
+
+    def search(self, text: str, limit: int = MAX_SEARCH_RESULTS) -> List[str]:
+        """Ranked IDs containing text (case-insensitive), at most limit
+
+        Args:
+            text: Query; surrounding whitespace is ignored
+            limit: Maximum number of results
+
+        Returns:
+            Exact match, then prefix matches, then other substring matches
+        """
+        key = text.strip().casefold()
+        if not key or limit <= 0:
+            return []
+        # An exact match sorts first among the prefix matches
+        prefix_ranks = self._prefix_ranks(key)
+        ranked = list(prefix_ranks[:limit])
+        if len(ranked) < limit:
+            others = self._substring_ranks(key)
+            others = others[(others < prefix_ranks.start) | (others >= prefix_ranks.stop)]
+            if others.size:
+                keys = self._sorted_keys
+                positions = np.fromiter((keys[rank].find(key) for rank in others.tolist()), np.int64, others.size)
+                # Stable: equal match positions keep ID order
+                others = others[np.argsort(positions, kind="stable")]
+                ranked.extend(others[: limit - len(ranked)].tolist())
+        return [self.ids[self._order[rank]] for rank in ranked]
+
+
+class TokenSearchIndex:
+    """Inverted index from description / IGT tokens to entities
+
+    A query matches the entities having, for every query word, a token that
+    starts with it (AND of prefix matches). Results are ranked by the number of
+    query words matching a token exactly, then by fewer tokens (a more specific
+    description), then in ID order.
+    """
+
+    def __init__(self, ids: Sequence[str], tokens: Mapping[str, Iterable[str]]):
+        """
+        Args:
+            ids: Entity IDs, in the order results are tie-broken
+            tokens: {entity ID: its tokens} (see tokenize)
+        """
+        self.ids: List[str] = list(ids)
+        postings: Dict[str, List[int]] = defaultdict(list)
+        token_counts = np.zeros(len(self.ids), dtype=np.int32)
+        for position, entity_id in enumerate(self.ids):
+            entity_tokens = tokens.get(entity_id, ())
+            for token in entity_tokens:
+                postings[token].append(position)
+            token_counts[position] = len(entity_tokens)
+        self._vocabulary: List[str] = sorted(postings)
+        self._postings: Dict[str, np.ndarray] = {
+            token: np.array(positions, dtype=np.int32) for token, positions in postings.items()
+        }
+        self._token_counts = token_counts
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _prefix_matches(self, word: str) -> np.ndarray:
+        """Sorted positions of the entities with a token starting with word"""
+        vocabulary = self._vocabulary
+        start = bisect_left(vocabulary, word)
+        end = bisect_left(vocabulary, word + _PREFIX_END, start)
+        if start == end:
+            return np.empty(0, dtype=np.int32)
+        if end - start == 1:
+            return self._postings[vocabulary[start]]
+        return np.unique(np.concatenate([self._postings[token] for token in vocabulary[start:end]]))
+
+    def search(self, text: str, limit: int = MAX_SEARCH_RESULTS) -> List[str]:
+        """Ranked IDs of the entities matching every word of text, at most limit"""
+        words = sorted(tokenize(text))
+        if not words or limit <= 0:
+            return []
+        candidates = None
+        for word in words:
+            matches = self._prefix_matches(word)
+            candidates = matches if candidates is None else np.intersect1d(candidates, matches, assume_unique=True)
+            if not candidates.size:
+                return []
+
+        exact = np.zeros(candidates.size, dtype=np.int32)
+        for word in words:
+            posting = self._postings.get(word)
+            if posting is not None:
+                exact += np.isin(candidates, posting, assume_unique=True)
+        # lexsort: last key is primary
+        order = np.lexsort((candidates, self._token_counts[candidates], -exact))
+        return [self.ids[position] for position in candidates[order[:limit]].tolist()]
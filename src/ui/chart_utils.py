@@ -1,7 +1,10 @@
 """Shared chart utility functions for UI components"""
 
 import calendar
-from typing import List, Optional
+from typing import List, Optional, Tuple
+
+from src.models.performance import TimePeriod
+from src.utils.periods import format_period_ui, period_year
 
 
 def extract_year_from_period(period_label: str, analyzer_granularity: str) -> int | None:
@@ -56,6 +59,24 @@ def convert_period_label_to_ui(period_label: str, analyzer_granularity: str) ->
     return period_label
 
 
+def split_period(period: TimePeriod, analyzer_granularity: str) -> Tuple[int | None, str]:
+    """Year and UI label of an analyzer period
+    Args:
+        period: TimePeriod from the analyzer
+        analyzer_granularity: The granularity used by analyzer ("monthly", "quarterly", "yearly")
+    Does: Computes both from the period number when the analyzer set one (no label parsing);
+         otherwise falls back to extract_year_from_period / convert_period_label_to_ui on the label.
+    Returns:
+        (year or None, UI-friendly label such as "Mar", "Q1", "2024")
+    """
+    if period.index is not None:
+        return period_year(period.index, analyzer_granularity), format_period_ui(period.index, analyzer_granularity)
+    return (
+        extract_year_from_period(period.label, analyzer_granularity),
+        convert_period_label_to_ui(period.label, analyzer_granularity),
+    )
+
+
 def get_all_period_labels(granularity: str, available_years: Optional[List[int]] = None) -> List[str]:
     """Get all possible period labels for given granularity
     Args:
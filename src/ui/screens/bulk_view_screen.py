@@ -7,24 +7,27 @@ from tkinter import messagebox
 from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from typing import Dict, List, Set
+from datetime import date
 from collections import defaultdict
 from pathlib import Path
 
 # Project imports
 from src.analysis.performance_analyzer import PerformanceAnalyzer
-from src.models.performance import PerformanceData
 from src.models.mapping import G_entity
 from src.ui.theme import COLORS, FONT_SIZES, YEAR_COLORS, GRANULARITY_MAP, GRANULARITY_PERIODS
 from src.ui.chart_utils import (
-    extract_year_from_period,
-    convert_period_label_to_ui,
+    split_period,
     get_all_period_labels,
     add_bar_value_labels
 )
-from src.ui.ui_utils import FontCache
+from src.ui.ui_utils import FontCache, get_catalog
 from src.ui.export_utils import export_data_to_excel, get_export_folder, export_screen_to_pdf
 
 
+# Years of history behind the chart and the sales sort of the entity list
+BULK_LOOKBACK_YEARS = 4
+
+
 class BulkViewScreen(ctk.CTkFrame):
     """Bulk analysis screen for comparing multiple entities"""
     
@@ -137,13 +140,8 @@ class BulkViewScreen(ctk.CTkFrame):
             Returns: None
         """
         # Check if data is loaded
-        if not hasattr(self.app_controller, 'current_data') or not self.app_controller.current_data:
-            return
-        
-        rooms_dict = self.app_controller.current_data.get('rooms_dict', {})
-        nc12s_dict = self.app_controller.current_data.get('nc12s_dict', {})
-       
-        if not rooms_dict or not nc12s_dict:
+        catalog = get_catalog(self.app_controller)
+        if not catalog.count("room") or not catalog.count("12NC"):
             return
         
         # Initialize years from data
@@ -156,16 +154,10 @@ class BulkViewScreen(ctk.CTkFrame):
     def _initialize_available_years(self):
         """Initialize available years from all entities
             Args: None
-            Does: Extracts all years from sales history of entities and initializes selected_years set
+            Does: Takes the years with sales of the current mode's entities (precomputed by the catalog) and initializes selected_years set
             Returns: None
         """
-        years = set()
-        
-        entities = self._get_current_entities()
-        for entity in entities:
-            if hasattr(entity, 'sales_history'):
-                for record in entity.sales_history:
-                    years.add(record.date.year)
+        years = get_catalog(self.app_controller).kind_years(self.current_mode)
         
         # Select up to 4 most recent years
         sorted_years = sorted(years, reverse=True)[:4]
@@ -174,18 +166,23 @@ class BulkViewScreen(ctk.CTkFrame):
     def _get_current_entities(self):
         """Get list of entities for current mode
             Args: None
-            Does: Retrieves the list of entities (12NC or Room) based on current mode from app controller
+            Does: Retrieves the entities (12NC or Room) of the current mode from the catalog, in ID order
             Returns: List of entity objects
         """
-        if not hasattr(self.app_controller, 'current_data') or not self.app_controller.current_data:
-            return []
-        
-        if self.current_mode == "12nc":
-            nc12s_dict = self.app_controller.current_data.get('nc12s_dict', {})
-            return list(nc12s_dict.values())
-        else:
-            rooms_dict = self.app_controller.current_data.get('rooms_dict', {})
-            return list(rooms_dict.values())
+        return get_catalog(self.app_controller).entities(self.current_mode)
+    
+    def _filter_by_search(self, entities):
+        """Filter entities by the current search text
+            Args:
+                entities: Entity objects of the current mode
+            Does: Keeps the entities whose ID, description or IGT contains the search text
+                (case-insensitive), or whose description / IGT words match it, using the catalog
+            Returns: List of matching entities, in their original order
+        """
+        if not self.search_text.strip():
+            return list(entities)
+        matches = get_catalog(self.app_controller).matching_ids(self.current_mode, self.search_text)
+        return [entity for entity in entities if entity.id in matches]
     
     def _get_selected_entities(self) -> Set[str]:
         """Get selected entity IDs for current mode
@@ -705,15 +702,8 @@ class BulkViewScreen(ctk.CTkFrame):
             Does: Extracts the set of years from the sales history of the currently selected entities, then returns a sorted list of up to 4 most recent years
             Returns: List of available years sorted in descending order (most recent first)
         """
-        years = set()
-        
         selected_ids = self._get_selected_entities()
-        entities = self._get_current_entities()
-        
-        for entity in entities:
-            if entity.id in selected_ids and hasattr(entity, 'sales_history'):
-                for record in entity.sales_history:
-                    years.add(record.date.year)
+        years = get_catalog(self.app_controller).years_of(self.current_mode, selected_ids)
         
         sorted_years = sorted(years, reverse=True)
         return sorted_years[:4]  # Up to 4 most recent years
@@ -738,8 +728,8 @@ class BulkViewScreen(ctk.CTkFrame):
     def _aggregate_bulk_sales_data(self) -> Dict[int, Dict[str, int]]:
         """Aggregate sales data from all selected entities with robustness checks
             Args: None
-            Does: For each selected entity, analyzes its performance data and aggregates the quantity sold for each period, 
-                with checks to ensure data integrity and handle missing or malformed data gracefully
+            Does: Sums the quantity sold per period over all selected entities (a row-sum of the demand cube,
+                see PerformanceAnalyzer.aggregate) and keeps the periods of the selected years
             Returns: A nested dictionary where the first key is the year (int) and the second 
                 key is the period label (str), with the value being the total quantity sold (int) for that period across all selected entities
         """
@@ -747,51 +737,35 @@ class BulkViewScreen(ctk.CTkFrame):
         if not selected_ids:
             return {}
         
-        entities = self._get_current_entities()
+        catalog = get_catalog(self.app_controller)
+        entities = [catalog.get(self.current_mode, entity_id) for entity_id in sorted(selected_ids)]
+        entities = [entity for entity in entities if entity is not None]
         if not entities:
             return {}
         
         analyzer_granularity = self.granularity_map.get(self.granularity, "monthly")
+        entity_type = "12NC" if self.current_mode == "12nc" else "room"
         
-        # Aggregate data across all selected entities
-        aggregated_data = defaultdict(lambda: defaultdict(int))
+        # One row-sum over the selected entities in the catalog's demand cube
+        self.analyzer.cube_source = catalog
+        try:
+            periods = self.analyzer.aggregate(
+                [G_entity(g_entity=entity, entity_type=entity_type) for entity in entities],
+                lookback_years=BULK_LOOKBACK_YEARS,
+                granularity=analyzer_granularity
+            )
+        except Exception as e:
+            print(f"Error aggregating {len(entities)} entities: {e}")
+            return {}
         
-        for entity in entities:
-            if entity.id not in selected_ids:
-                continue
-            
-            # Robustness check: verify entity has sales history
-            if not hasattr(entity, 'sales_history') or not entity.sales_history:
+        # Keep only the selected years
+        aggregated_data = defaultdict(lambda: defaultdict(int))
+        for period in periods:
+            year, ui_label = split_period(period, analyzer_granularity)
+            if year is None or year not in self.selected_years:
                 continue
             
-            try:
-                # Wrap entity in G_entity for analyzer
-                entity_type = "12NC" if self.current_mode == "12nc" else "room"
-                g_entity_obj = G_entity(g_entity=entity, entity_type=entity_type) # Cast to G_entity for analyzer compatibility
-                
-                # Analyze performance
-                performance_data: PerformanceData = self.analyzer.analyze(
-                    analyzed_obj=g_entity_obj,
-                    lookback_years=4,
-                    granularity=analyzer_granularity
-                )
-                
-                # Robustness check: verify periods exist
-                if not hasattr(performance_data, 'periods') or not performance_data.periods:
-                    continue
-                
-                # Add to aggregated data - only for selected years
-                for period in performance_data.periods:
-                    year = extract_year_from_period(period.label, analyzer_granularity)
-                    if year is None or year not in self.selected_years:
-                        continue
-                    
-                    ui_label = convert_period_label_to_ui(period.label, analyzer_granularity)
-                    aggregated_data[year][ui_label] += period.quantity
-                    
-            except Exception as e:
-                print(f"Error analyzing entity {entity.id}: {e}")
-                continue
+            aggregated_data[year][ui_label] += period.quantity
         
         return dict(aggregated_data)# Convert defaultdict to regular dict for easier handling in charting
     
@@ -1000,46 +974,25 @@ class BulkViewScreen(ctk.CTkFrame):
             return
         
         #-------------------------
-        # Filter by search (ID only)
+        # Filter by search (ID substring or description / IGT words, via the catalog's indexes)
          #-------------------------
-        filtered_entities = []
-        search_lower = self.search_text.lower()
-        for entity in entities:
-            if search_lower:
-                if search_lower not in entity.id.lower():
-                    continue
-            filtered_entities.append(entity)
+        filtered_entities = self._filter_by_search(entities)
         
         # Calculate total sales for sorting - MATCHED TO CHART CALCULATION
-        # Use same logic as _aggregate_bulk_sales_data to ensure consistency
+        # Same analyzer window and selected years as _aggregate_bulk_sales_data; every
+        # granularity is calendar-year aligned, so the per-year range totals of the
+        # date-sorted history equal the chart's summed periods
+        start_date, end_date = self.analyzer.lookback_window(BULK_LOOKBACK_YEARS)
+        windows = [
+            (max(date(year, 1, 1), start_date), min(date(year, 12, 31), end_date))
+            for year in self.selected_years
+        ]
         entity_sales = {}
-        analyzer_granularity = self.granularity_map.get(self.granularity, "monthly")
         
         for entity in filtered_entities:
             total = 0
             if hasattr(entity, 'sales_history') and entity.sales_history:
-                try:
-                    # Wrap entity for analyzer
-                    entity_type = "12NC" if self.current_mode == "12nc" else "room"
-                    g_entity_obj = G_entity(g_entity=entity, entity_type=entity_type)
-                    
-                    # Analyze performance
-                    performance_data: PerformanceData = self.analyzer.analyze(
-                        analyzed_obj=g_entity_obj,
-                        lookback_years=4,
-                        granularity=analyzer_granularity
-                    )
-                    
-                    # Sum up quantities for selected years only
-                    for period in performance_data.periods:
-                        year = extract_year_from_period(period.label, analyzer_granularity)
-                        if year and year in self.selected_years:
-                            total += period.quantity
-                except Exception as e:
-                    # Fallback to raw sales history
-                    for record in entity.sales_history:
-                        if record.date.year in self.selected_years:
-                            total += record.quantity
+                total = sum(entity.sales_history.total_between(start, end) for start, end in windows)
             
             entity_sales[entity.id] = total
         
@@ -1200,17 +1153,10 @@ class BulkViewScreen(ctk.CTkFrame):
             entities, then updates the year checkboxes and chart to reflect the new selection
             Returns: None
         """
-        entities = self._get_current_entities()
-        search_lower = self.search_text.lower()
+        entities = self._filter_by_search(self._get_current_entities())
         
         selected = self._get_selected_entities()
-        
-        for entity in entities:
-            # Apply search filter
-            if search_lower:
-                if search_lower not in entity.id.lower() and search_lower not in entity.description.lower():
-                    continue
-            selected.add(entity.id)
+        selected.update(entity.id for entity in entities)
         
         self._set_selected_entities(selected)
         self._refresh_entity_list()
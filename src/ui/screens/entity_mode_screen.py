@@ -13,10 +13,18 @@ from src.ui.screens.panels import (
     PredictionPanel
 )
 from src.ui.theme import COLORS, FONT_SIZES, MODE_CONFIG
-from src.ui.ui_utils import FontCache
+from src.ui.ui_utils import FontCache, get_catalog
+from src.services.entity_catalog import EntityCatalog
+from src.services.search_index import MAX_SEARCH_RESULTS, IdSearchIndex
 from src.ui.export_utils import get_export_folder, export_screen_to_pdf
 
 
+# Delay between the last keystroke and the dropdown search
+SEARCH_DEBOUNCE_MS = 150
+# Between the ID and the description of dropdown rows found by description
+DESCRIPTION_SEPARATOR = "  —  "
+
+
 class EntityModeScreen(ctk.CTkFrame):
     """Main analysis screen with 2x2 grid layout for 12NC and Room modes"""
     
@@ -39,6 +47,13 @@ class EntityModeScreen(ctk.CTkFrame):
         # Store all items for current mode (for filtering)
         self.all_items = self.MODE_CONFIG[mode]["items"]
         
+        # Search state: rows currently in the dropdown Listbox and the pending debounced search
+        self._dropdown_items = []
+        self._dropdown_ids = []
+        self._search_after_id = None
+        self._search_index = None
+        self._search_index_items = None
+        
         # Configure grid weights for responsive layout
         self.grid_rowconfigure(0, weight=0)  # Title header (fixed)
         self.grid_rowconfigure(1, weight=0)  # Search area (fixed)
@@ -107,43 +122,38 @@ class EntityModeScreen(ctk.CTkFrame):
             Returns: None
         """
         try:
-            # Try to get loaded data from the app controller
-            if hasattr(self.app_controller, 'current_data') and self.app_controller.current_data:
-                current_data = self.app_controller.current_data
-                
-                # Extract Room and TwelveNC IDs for dropdown lists
-                if 'rooms_dict' in current_data:
-                    room_ids = sorted(current_data['rooms_dict'].keys())
-                    self.MODE_CONFIG["room"]["items"] = room_ids
-                
-                if 'nc12s_dict' in current_data:
-                    nc12_ids = sorted(current_data['nc12s_dict'].keys())
-                    self.MODE_CONFIG["12nc"]["items"] = nc12_ids
+            # Sorted ID lists come precomputed from the catalog of the loaded data
+            catalog = get_catalog(self.app_controller)
+            if catalog.count("room"):
+                self.MODE_CONFIG["room"]["items"] = catalog.ids("room")
+            if catalog.count("12NC"):
+                self.MODE_CONFIG["12nc"]["items"] = catalog.ids("12NC")
         except (AttributeError, KeyError, TypeError):
             # If data isn't available or in expected format, keep empty lists
             pass
     
-    def reload_data_from_uploaded_files(self, rooms_dict, nc12s_dict):
+    def reload_data_from_uploaded_files(self, rooms_dict, nc12s_dict, catalog=None):
         """Update data when new CBOM files are uploaded and processed
         Args:
             rooms_dict: Dictionary {room_id: Room object}
             nc12s_dict: Dictionary {nc12_id: TwelveNC object}
+            catalog: EntityCatalog of the same entities (built here if not given)
         Does: Updates the MODE_CONFIG items with new entity IDs from the uploaded files and refreshes the dropdown
         Returns: None
         """
         print(f"\n[ENTITY_MODE] reload_data_from_uploaded_files called: {len(rooms_dict)} rooms, {len(nc12s_dict)} 12NCs")
-        # Extract and sort IDs from the dictionaries
-        room_ids = sorted(rooms_dict.keys())
-        nc12_ids = sorted(nc12s_dict.keys())
+        if catalog is None:
+            catalog = EntityCatalog(rooms_dict.values(), nc12s_dict.values())
         
-        # Update MODE_CONFIG with actual loaded data
-        self.MODE_CONFIG["room"]["items"] = room_ids
-        self.MODE_CONFIG["12nc"]["items"] = nc12_ids
+        # Update MODE_CONFIG with the catalog's sorted IDs
+        self.MODE_CONFIG["room"]["items"] = catalog.ids("room")
+        self.MODE_CONFIG["12nc"]["items"] = catalog.ids("12NC")
         
         # Update app controller's lookup dictionaries for all screens to use
         if hasattr(self.app_controller, 'current_data') and self.app_controller.current_data:
             self.app_controller.current_data['rooms_dict'] = rooms_dict
             self.app_controller.current_data['nc12s_dict'] = nc12s_dict
+            self.app_controller.current_data['catalog'] = catalog
             print(f"[ENTITY_MODE] Updated app_controller.current_data")
         else:
             print(f"[ENTITY_MODE] WARNING: app_controller.current_data not available!")
@@ -666,48 +676,92 @@ class EntityModeScreen(ctk.CTkFrame):
             self._populate_dropdown(self.all_items)
             self._show_dropdown()
 
-    def _populate_dropdown(self, items):
-        """Populate dropdown with items
+    def _populate_dropdown(self, items, ids=None):
+        """Populate dropdown with items (incrementally)
             Args:
-                items: List of items to populate the dropdown
-            Does: Clears the dropdown and inserts the provided items
+                items: List of items (row labels) to populate the dropdown
+                ids: Entity ID of each row, default the labels themselves
+            Does: Keeps the rows the dropdown already shows in the same place, deletes the rest and
+                inserts the remaining items in a single call
             Returns: None
         """
-        self.dropdown_listbox.delete(0, tk.END)
-        for item in items:
-            self.dropdown_listbox.insert(tk.END, item)
+        self._dropdown_ids = list(items if ids is None else ids)
+        shown = self._dropdown_items
+        common = 0
+        for old, new in zip(shown, items):
+            if old != new:
+                break
+            common += 1
+        if common < len(shown):
+            self.dropdown_listbox.delete(common, tk.END)
+        if common < len(items):
+            self.dropdown_listbox.insert(tk.END, *items[common:])
+        self._dropdown_items = list(items)
 
     def _filter_and_show_dropdown(self, search_text):
-        """Filter items and show dropdown (optimized - no double clearing)
+        """Filter items and show dropdown
             Args:
                 search_text: The text to filter the dropdown items by
-            Does: Filters the list of all items based on the search text and updates the dropdown accordingly
+            Does: Queries the ID search index of all_items (exact, prefix, then substring matches), then
+                the catalog's description / IGT token index, ranked and capped at MAX_SEARCH_RESULTS, and
+                updates the dropdown accordingly
             Returns: None
         """
         if not search_text:
             self._hide_dropdown()
             return
 
-        filtered = [item for item in self.all_items if item.lower().startswith(search_text.lower())]
+        ids = self._get_search_index().search(search_text, MAX_SEARCH_RESULTS)
+        labels = list(ids)
 
-        # Clear and populate in one step
-        self.dropdown_listbox.delete(0, tk.END)
-        if filtered:
-            for item in filtered:
-                self.dropdown_listbox.insert(tk.END, item)
-        else:
-            self.dropdown_listbox.insert(tk.END, "No matches found")
+        # Then entities whose description / IGT words match, labelled with their description
+        if len(ids) < MAX_SEARCH_RESULTS:
+            catalog = get_catalog(self.app_controller)
+            found = set(ids)
+            for entity_id in catalog.search_text(self.current_mode, search_text, MAX_SEARCH_RESULTS):
+                if entity_id in found:
+                    continue
+                ids.append(entity_id)
+                labels.append(f"{entity_id}{DESCRIPTION_SEPARATOR}{catalog.description(self.current_mode, entity_id)}")
+                if len(ids) == MAX_SEARCH_RESULTS:
+                    break
 
+        if ids:
+            self._populate_dropdown(labels, ids)
+        else:
+            self._populate_dropdown(["No matches found"])
         self._show_dropdown()
 
+    def _get_search_index(self):
+        """Get the search index over all_items
+            Args: None
+            Does: Uses the catalog's index when all_items are the catalog's IDs (built once per load);
+                otherwise builds an index over all_items, kept until all_items changes
+            Returns: IdSearchIndex
+        """
+        catalog = get_catalog(self.app_controller)
+        if self.all_items is catalog.ids(self.current_mode):
+            return catalog.id_index(self.current_mode)
+        if self._search_index is None or self._search_index_items is not self.all_items:
+            self._search_index = IdSearchIndex(self.all_items)
+            self._search_index_items = self.all_items
+        return self._search_index
+
     def _on_search_change(self, *args):
-        """Handle search text changes
+        """Handle search text changes (debounced)
             Args: None
-            Does: Filters the dropdown items based on the current search text whenever it changes
+            Does: Schedules the dropdown filtering SEARCH_DEBOUNCE_MS after the last keystroke, so that fast
+                typing runs one search instead of one per character
             Returns: None
         """
-        search_text = self.search_var.get().strip()
-        self._filter_and_show_dropdown(search_text)
+        if self._search_after_id is not None:
+            self.after_cancel(self._search_after_id)
+        self._search_after_id = self.after(SEARCH_DEBOUNCE_MS, self._run_pending_search)
+
+    def _run_pending_search(self):
+        """Run the debounced search for the current search text"""
+        self._search_after_id = None
+        self._filter_and_show_dropdown(self.search_var.get().strip())
 
     def _on_entry_focus(self, event):
         """Show all items when entry gets focus
@@ -749,7 +803,7 @@ class EntityModeScreen(ctk.CTkFrame):
         """
         selection = self.dropdown_listbox.curselection()
         if selection:
-            selected = self.dropdown_listbox.get(selection[0])
+            selected = self._dropdown_entity_id(selection[0])
             if selected != "No matches found":
                 self.search_var.set(selected)
                 # Hide on click, keep open on selection for preview
@@ -757,6 +811,17 @@ class EntityModeScreen(ctk.CTkFrame):
                     self._hide_dropdown()
                     self.search_entry.focus()
 
+    def _dropdown_entity_id(self, index):
+        """Get the entity ID of a dropdown row
+            Args:
+                index: Row index in the dropdown
+            Does: Maps the row to its entity ID (rows found by description also show the description)
+            Returns: The entity ID, or the row text for rows without an ID
+        """
+        if index < len(self._dropdown_ids):
+            return self._dropdown_ids[index]
+        return self.dropdown_listbox.get(index)
+
     def _show_dropdown(self):
         """Show the dropdown list
             Args: None
@@ -802,7 +867,7 @@ class EntityModeScreen(ctk.CTkFrame):
         """
         selection = self.dropdown_listbox.curselection()
         if selection:
-            selected = self.dropdown_listbox.get(selection[0])
+            selected = self._dropdown_entity_id(selection[0])
             if selected != "No matches found":
                 self.search_var.set(selected)
                 self._hide_dropdown()
@@ -927,16 +992,8 @@ class EntityModeScreen(ctk.CTkFrame):
             Returns: The entity object if found, None otherwise
         """
         print(f"[ENTITY_MODE] _get_entity_object({entity_id}) for mode={self.current_mode}")
-        # Use app controller's lookup dictionaries for O(1) access
-        if not hasattr(self.app_controller, 'current_data') or not self.app_controller.current_data:
-            print(f"[ENTITY_MODE] ERROR: app_controller.current_data not available!")
-            return None
-        
-        current_data = self.app_controller.current_data
-        if self.current_mode == "room":
-            return current_data.get('rooms_dict', {}).get(entity_id)
-        else:  # 12nc mode
-            return current_data.get('nc12s_dict', {}).get(entity_id)
+        # Use the catalog of the loaded data for O(1) access
+        return get_catalog(self.app_controller).get(self.current_mode, entity_id)
     
     def _get_entity_description(self, entity_id: str, entity_type: str) -> str:
         """Get description for an entity (used by belonging panel) - O(1) lookup
@@ -948,17 +1005,8 @@ class EntityModeScreen(ctk.CTkFrame):
         Returns:
             Entity description or empty string if not found
         """
-        # Use app controller's lookup dictionaries for O(1) access
-        if not hasattr(self.app_controller, 'current_data') or not self.app_controller.current_data:
-            return ""
-        
-        current_data = self.app_controller.current_data
-        if entity_type == "room":
-            entity = current_data.get('rooms_dict', {}).get(entity_id)
-            return entity.description if entity else ""
-        else:  # 12nc
-            entity = current_data.get('nc12s_dict', {}).get(entity_id)
-            return entity.description if entity else ""
+        # Use the catalog of the loaded data for O(1) access
+        return get_catalog(self.app_controller).description(entity_type, entity_id)
     
     def _navigate_to_entity(self, entity_id: str, target_mode: str):
         """Navigate to a different entity (used by belonging panel clicks)
@@ -1018,19 +1066,23 @@ class EntityModeScreen(ctk.CTkFrame):
         """Update performance panel with sales data
             Args:
                 entity_obj: Room or TwelveNC object
-            Does: Delegates to PerformancePanel manager
+            Does: Points the panel's analyzer at the loaded data's demand cubes, then
+                delegates to PerformancePanel manager
             Returns: None
         """
+        self.performance_panel_manager.analyzer.cube_source = get_catalog(self.app_controller)
         self.performance_panel_manager.update(entity_obj, self.current_mode)
     
     def _update_prediction_panel(self, entity_obj):
         """Update prediction panel with forecast data
             Args:
                 entity_obj: Room or TwelveNC object
-            Does: Delegates to PredictionPanel manager  
+            Does: Points the panel's analyzer at the loaded data's demand cubes, then
+                delegates to PredictionPanel manager
             Returns: None
         """
         print(f"[ENTITY_MODE] Calling prediction panel update for {entity_obj}")
+        self.prediction_panel_manager.analyzer.cube_source = get_catalog(self.app_controller)
         self.prediction_panel_manager.update(entity_obj, self.current_mode)
     
     # ============================================================================
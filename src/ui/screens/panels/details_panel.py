@@ -69,7 +69,7 @@ class DetailsPanel:
         # Sales history summary
         self._add_detail_separator(details_container)
         sales_count = len(entity_obj.sales_history)
-        total_quantity = sum(record.quantity for record in entity_obj.sales_history) if entity_obj.sales_history else 0
+        total_quantity = entity_obj.sales_history.total_quantity()
         self._add_detail_row(details_container, "Sales Records:", str(sales_count))
         self._add_detail_row(details_container, "Total Sold Quantity:", str(total_quantity))
     
@@ -261,7 +261,7 @@ class DetailsPanel:
         ws[f'B{row}'] = sales_count
         
         row += 1
-        total_quantity = sum(record.quantity for record in entity.sales_history) if entity.sales_history else 0
+        total_quantity = entity.sales_history.total_quantity()
         ws[f'A{row}'] = "Total Sold Quantity:"
         ws[f'A{row}'].font = label_font
         ws[f'B{row}'] = total_quantity
@@ -14,8 +14,7 @@ from src.models.performance import PerformanceData, TimePeriod
 from src.models.mapping import G_entity
 from src.ui.theme import YEAR_COLORS, GRANULARITY_MAP, GRANULARITY_PERIODS
 from src.ui.chart_utils import (
-    extract_year_from_period,
-    convert_period_label_to_ui,
+    split_period,
     get_all_period_labels,
     add_bar_value_labels
 )
@@ -133,7 +132,7 @@ class PerformancePanel:
         if not self.entity_obj or not self.entity_obj.sales_history:
             return []
         
-        years = set(record.date.year for record in self.entity_obj.sales_history)
+        years = self.entity_obj.sales_history.years()
         sorted_years = sorted(years, reverse=True)
         # Return up to 4 most recent years
         return sorted_years[:4]
@@ -349,13 +348,10 @@ class PerformancePanel:
             # Group periods by year
             data = {}
             for period in performance_data.periods:
-                # Extract year from period label
-                year = extract_year_from_period(period.label, analyzer_granularity)
+                # Year and UI label from the period number
+                year, ui_label = split_period(period, analyzer_granularity)
                 if year is None:
                     continue
-                    
-                # Convert period label to UI format
-                ui_label = convert_period_label_to_ui(period.label, analyzer_granularity)
                 
                 # Initialize year dict if needed
                 if year not in data:
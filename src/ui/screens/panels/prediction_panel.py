@@ -3,11 +3,12 @@
 from tkinter import messagebox
 
 import customtkinter as ctk
-from datetime import date, datetime
+from datetime import datetime
 from pathlib import Path
 from src.analysis.performance_analyzer import PerformanceAnalyzer
 from src.analysis.predictor import Predictor
 from src.models.mapping import G_entity
+from src.utils.clock import session_clock
 from src.utils.date_utils import get_next_period_label
 try:
     import openpyxl
@@ -119,16 +120,11 @@ class PredictionPanel:
             self.max_periods = 12
             return
         
-        # Get all unique dates from sales history
-        dates = [record.date for record in self.entity_obj.sales_history]
-        if not dates:
-            self.max_years = 3
-            self.max_periods = 12
-            return
+        # Sales history is sorted by date: first and last sale bound the span
+        min_date = self.entity_obj.sales_history.first_date
+        max_date = self.entity_obj.sales_history.last_date
         
         # Calculate years span
-        min_date = min(dates)
-        max_date = max(dates)
         years_span = max_date.year - min_date.year + 1 # Add 1 to include both start and end years 
         self.max_years = max(1, min(years_span, 10))
         
@@ -402,7 +398,7 @@ class PredictionPanel:
             label.pack(side="left")
         else:  # avg_same_period_previous_years
             # Show dropdowns based on granularity
-            today = date.today()
+            today = session_clock.today()
             
             if granularity == "yearly":
                 # Year only
@@ -1,21 +1,22 @@
 """Welcome screen - Landing page with file loading and system overview"""
 
 import customtkinter as ctk
-from tkinter import filedialog
+from tkinter import filedialog, messagebox
 from datetime import datetime
 from pathlib import Path
 import sys
 
 from src.models.mapping import Room, TwelveNC
+from src.services.entity_catalog import EntityCatalog
 
 # Add project root to path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-from src.infrastructure import load_cbom
-from src.infrastructure.data_loaders import read_file
-from src.infrastructure.data_transformer import transform_cbom_data, parse_ymbd_to_sales_records, parse_fit_cvi_to_sales_records
-from src.utils import load_config
+from src.infrastructure.background_load import BackgroundLoad
+from src.infrastructure.data_loaders import FileReadError
+from src.infrastructure.parse_cache import ParseCache
+from src.utils import get_config, session_clock
 from src.utils.config_util import get_last_files, save_last_files
 
 
@@ -31,6 +32,8 @@ class WelcomeScreen(ctk.CTkFrame):
             "ymbd": "",
             "fit_cvi": ""
         }
+        self._load = None
+        self._auto_loading = False
         
         # Main container
         main_container = ctk.CTkFrame(self, fg_color="transparent")
@@ -128,6 +131,33 @@ class WelcomeScreen(ctk.CTkFrame):
         )
         self.status_label.pack(pady=(0, 25))
         self.status_label.pack(pady=(0, 20))
+        
+        # Progress bar and cancel button (shown only while loading)
+        self.progress_frame = ctk.CTkFrame(file_frame, fg_color="transparent")
+        self.progress_bar = ctk.CTkProgressBar(
+            self.progress_frame,
+            width=420,
+            height=12,
+            corner_radius=6,
+            progress_color="#35586E"
+        )
+        self.progress_bar.set(0)
+        self.progress_bar.pack(side="left", padx=8)
+        self.cancel_btn = ctk.CTkButton(
+            self.progress_frame,
+            text="Cancel",
+            command=self.cancel_load,
+            width=110,
+            height=36,
+            corner_radius=8,
+            fg_color="#E7EDF3",
+            hover_color="#DCE4EC",
+            text_color="#2B3A44",
+            border_width=1,
+            border_color="#D8E0E8",
+            font=ctk.CTkFont(family="Segoe UI", size=15, weight="bold")
+        )
+        self.cancel_btn.pack(side="left", padx=8)
     
     def _create_file_row(self, parent, label, key, description):
         """Create a file selection row"""
@@ -281,7 +311,10 @@ class WelcomeScreen(ctk.CTkFrame):
             self.status_label.configure(text="")
     
     def load_files(self):
-        """Load and process all selected files"""
+        """Start loading all selected files on a background thread"""
+        if self._load is not None and self._load.running:
+            return
+        
         missing_files = [key for key, path in self.loaded_files.items() if not path]
         
         if missing_files:
@@ -289,73 +322,105 @@ class WelcomeScreen(ctk.CTkFrame):
                 text=f"⚠️ Please select all files. Missing: {', '.join(missing_files)}",
                 text_color="#ef4444"
             )
+            self._auto_loading = False
             return
         
         try:
             # Load configuration
-            config = load_config("config/config.json")
-            
-            # Load CBOM file
+            config = get_config("config/config.json")
+        except Exception as e:
             self.status_label.configure(
-                text="⏳ Loading CBOM file...",
-                text_color="#f59e0b"
+                text=f"❌ Error loading files: {str(e)}",
+                text_color="#ef4444"
             )
-            self.update()
-            
-            cbom_path = Path(self.loaded_files["cbom"])
-            room_data, data_12nc = load_cbom(cbom_path, config)
-            
-            if not room_data or not data_12nc:
-                self.status_label.configure(
-                    text="❌ Error: CBOM file is empty or invalid",
-                    text_color="#ef4444"
-                )
+            self._auto_loading = False
+            return
+        
+        # Parse the files (or reuse the cached parse of unchanged files) off the UI thread
+        self._load = BackgroundLoad(self.loaded_files, config, cache=ParseCache.from_config(config)).start()
+        self.status_label.configure(text="⏳ Loading files...", text_color="#f59e0b")
+        self.progress_bar.set(0)
+        self.cancel_btn.configure(state="normal")
+        self.progress_frame.pack(pady=(0, 20), before=self.status_label)
+        self.after(100, self._poll_load)
+    
+    def cancel_load(self):
+        """Cancel the running load; it stops at the next chunk or stage"""
+        if self._load is not None and self._load.running:
+            self._load.cancel()
+            self.cancel_btn.configure(state="disabled")
+            self.status_label.configure(text="⏳ Cancelling...", text_color="#f59e0b")
+    
+    def _poll_load(self):
+        """Apply the progress events posted by the background load"""
+        load = self._load
+        if load is None:
+            return
+        
+        for event in load.poll():
+            if event.kind == "stage":
+                if event.progress is not None:
+                    self.progress_bar.set(event.progress)
+                if not load.cancel_event.is_set():
+                    self.status_label.configure(text=f"⏳ {event.message}", text_color="#f59e0b")
+            elif event.kind == "rows":
+                file_type, rows = event.payload
+                if not load.cancel_event.is_set():
+                    self.status_label.configure(
+                        text=f"⏳ Reading {file_type.upper()} sales... {rows:,} rows",
+                        text_color="#f59e0b"
+                    )
+            elif event.kind == "error":
+                messagebox.showerror(event.payload.title, event.payload.message)
+            elif event.kind == "done":
+                self._end_load()
+                self._finish_load(event.payload)
                 return
+            elif event.kind == "failed":
+                self._end_load()
+                error = event.payload
+                if isinstance(error, FileReadError):
+                    messagebox.showerror(error.title, error.message)
+                    text = f"❌ Error: {error.title}"
+                elif isinstance(error, ValueError):
+                    text = f"❌ Error: {error}"
+                else:
+                    text = f"❌ Error loading files: {error}"
+                self.status_label.configure(text=text, text_color="#ef4444")
+                return
+            elif event.kind == "cancelled":
+                self._end_load()
+                self.status_label.configure(text="⚠️ Loading cancelled", text_color="#f59e0b")
+                return
+        
+        self.after(100, self._poll_load)
+    
+    def _end_load(self):
+        self._load = None
+        self.progress_frame.pack_forget()
+    
+    def _finish_load(self, catalog: EntityCatalog):
+        """Hand the loaded entities to the other screens
+        
+        The catalog (lookup dictionaries, sorted IDs, sale ranges and totals, built
+        once by the background load) gives O(1) entity access across all screens.
+        """
+        auto_loaded = self._auto_loading
+        self._auto_loading = False
+        try:
+            # One as-of date per loaded session: analyses and cached results don't shift at midnight
+            session_clock.pin()
+            rooms_dict: dict[str, Room] = catalog.rooms
+            nc12s_dict: dict[str, TwelveNC] = catalog.nc12s
+            print(f"\n[WELCOME] Created catalog: {len(rooms_dict)} rooms, {len(nc12s_dict)} 12NCs")
+            print(f"[WELCOME] Sample room keys: {catalog.ids('room')[:3] if rooms_dict else 'None'}")
+            print(f"[WELCOME] Sample 12NC keys: {catalog.ids('12NC')[:3] if nc12s_dict else 'None'}")
             
-            # Transform CBOM data into Room and TwelveNC objects
-            self.status_label.configure(
-                text="⏳ Processing data...",
-                text_color="#f59e0b"
-            )
-            self.update()
-            
-            rooms, nc12s = transform_cbom_data(room_data, data_12nc, config)
-            
-            # Load and process YMBD sales data for 12NCs
-            self.status_label.configure(
-                text="⏳ Loading YMBD sales data...",
-                text_color="#f59e0b"
-            )
-            self.update()
-            
-            ymbd_path = Path(self.loaded_files["ymbd"])
-            ymbd_df = read_file(ymbd_path, "ymbd", header=0)
-            if ymbd_df is not None:
-                nc12s = parse_ymbd_to_sales_records(nc12s, ymbd_df)
-            
-            # Load and process FIT_CVI sales data for Rooms
-            self.status_label.configure(
-                text="⏳ Loading FIT_CVI sales data...",
-                text_color="#f59e0b"
-            )
-            self.update()
-            
-            fit_cvi_path = Path(self.loaded_files["fit_cvi"])
-            fit_cvi_df = read_file(fit_cvi_path, "fit_cvi", header=0)
-            if fit_cvi_df is not None:
-                rooms = parse_fit_cvi_to_sales_records(rooms, fit_cvi_df)
-            
-            # Build lookup dictionaries for O(1) entity access across all screens
-            rooms_dict: dict[str, Room] = {room.id: room for room in rooms}
-            nc12s_dict: dict[str, TwelveNC] = {nc12.id: nc12 for nc12 in nc12s}
-            print(f"\n[WELCOME] Created dictionaries: {len(rooms_dict)} rooms, {len(nc12s_dict)} 12NCs")
-            print(f"[WELCOME] Sample room keys: {list(rooms_dict.keys())[:3] if rooms_dict else 'None'}")
-            print(f"[WELCOME] Sample 12NC keys: {list(nc12s_dict.keys())[:3] if nc12s_dict else 'None'}")
-            
-            # Store dictionaries for all screens (entity mode and bulk view)
+            # Store catalog and dictionaries for all screens (entity mode and bulk view)
             self.app_controller.current_data = {
                 "rooms_dict": rooms_dict,
-                "nc12s_dict": nc12s_dict
+                "nc12s_dict": nc12s_dict,
+                "catalog": catalog
             }
             print(f"[WELCOME] Stored in app_controller.current_data")
             
@@ -366,7 +431,7 @@ class WelcomeScreen(ctk.CTkFrame):
             if "entity_mode" in self.app_controller.screens:
                 entity_screen = self.app_controller.screens["entity_mode"]
                 print(f"[WELCOME] Calling entity_screen.reload_data_from_uploaded_files()")
-                entity_screen.reload_data_from_uploaded_files(rooms_dict, nc12s_dict)
+                entity_screen.reload_data_from_uploaded_files(rooms_dict, nc12s_dict, catalog)
                 print(f"[WELCOME] Entity screen updated")
             
             # Update bulk view screen if it exists
@@ -377,10 +442,10 @@ class WelcomeScreen(ctk.CTkFrame):
                 print(f"[WELCOME] Bulk view screen updated")
             
             # Success message with counts
-            self.status_label.configure(
-                text=f"✓ Files loaded successfully! ({len(rooms_dict)} Rooms, {len(nc12s_dict)} 12NCs)",
-                text_color="#10b981"
-            )
+            text = f"✓ Files loaded successfully! ({len(rooms_dict)} Rooms, {len(nc12s_dict)} 12NCs)"
+            if auto_loaded:
+                text = f"🔄 {text} (auto-loaded from previous session)"
+            self.status_label.configure(text=text, text_color="#10b981")
             
             # Save file paths for next session
             save_last_files(self.loaded_files)
@@ -413,23 +478,10 @@ class WelcomeScreen(ctk.CTkFrame):
                     if path_var:
                         path_var.set(Path(last_files[key]).name)
                 
-                # Show loading message
-                self.status_label.configure(
-                    text="⏳ Auto-loading previous files...",
-                    text_color="#f59e0b"
-                )
-                self.update()
-                
-                # Automatically load and process the files
+                # Automatically load and process the files; the success message
+                # notes the auto-load once the background load finishes
+                self._auto_loading = True
                 self.load_files()
-                
-                # Update success message to indicate auto-load
-                if "✓" in self.status_label.cget("text"):
-                    current_text = self.status_label.cget("text")
-                    self.status_label.configure(
-                        text=f"🔄 {current_text} (auto-loaded from previous session)",
-                        text_color="#10b981"
-                    )
         except Exception as e:
             # Silent fail - user can load manually
             print(f"Could not auto-load last files: {e}")
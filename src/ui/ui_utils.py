@@ -3,6 +3,8 @@
 import customtkinter as ctk
 from typing import Dict, Tuple
 
+from src.services.entity_catalog import EntityCatalog
+
 
 class FontCache:
     """Shared font cache to avoid recreating fonts repeatedly"""
@@ -32,3 +34,24 @@ class FontCache:
     def clear_cache(cls):
         """Clear the font cache (useful for testing or memory management)"""
         cls._cache.clear()
+
+
+def get_catalog(app_controller) -> EntityCatalog:
+    """Get the EntityCatalog of the loaded data
+    Args:
+        app_controller: Application controller holding current_data
+    Does: Returns current_data["catalog"] (set by the welcome screen after each load); for
+        controllers that only hold rooms_dict / nc12s_dict, builds one and stores it
+    Returns:
+        EntityCatalog, empty before any data is loaded
+    """
+    current_data = getattr(app_controller, "current_data", None)
+    if not isinstance(current_data, dict):
+        return EntityCatalog.empty()
+    catalog = current_data.get("catalog")
+    if catalog is None:
+        catalog = EntityCatalog(
+            current_data.get("rooms_dict", {}).values(), current_data.get("nc12s_dict", {}).values()
+        )
+        current_data["catalog"] = catalog
+    return catalog
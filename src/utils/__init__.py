@@ -1,21 +1,47 @@
 """Utility functions for Room 12NC Performance Center"""
 
-from .config_util import load_config, save_config, get_last_files, save_last_files
+from .config_util import (
+    AppConfig,
+    load_config,
+    get_config,
+    clear_config_cache,
+    save_config,
+    get_last_files,
+    save_last_files,
+)
+from .clock import SessionClock, session_clock
 from .date_utils import get_period_key, get_next_period_label
+from .periods import format_period, parse_period, period_of, periods_of
+from .process_pool import spawn_context, spawn_pool, terminate_pool
 from .excel_utils import pick_sheet, col_letter_to_index, find_column_by_canon
 from .file_utils import file_in_use, ensure_file_not_open, compute_output_path
 from .logging_utils import setup_logger
-from .string_utils import normalize_identifier, canon_header
+from .string_utils import normalize_identifier, normalize_identifiers, validate_identifiers, canon_header
 
 __all__ = [
     # Config utilities
+    'AppConfig',
     'load_config',
+    'get_config',
+    'clear_config_cache',
     'save_config',
     'get_last_files',
     'save_last_files',
+    # Session clock
+    'SessionClock',
+    'session_clock',
     # Date utilities
     'get_period_key',
     'get_next_period_label',
+    # Period numbers
+    'format_period',
+    'parse_period',
+    'period_of',
+    'periods_of',
+    # Worker processes
+    'spawn_context',
+    'spawn_pool',
+    'terminate_pool',
     # Excel utilities
     'pick_sheet',
     'col_letter_to_index',
@@ -28,5 +54,7 @@ __all__ = [
     'setup_logger',
     # String utilities
     'normalize_identifier',
+    'normalize_identifiers',
+    'validate_identifiers',
     'canon_header',
 ]
@@ -0,0 +1,42 @@
+"""Session clock: the "today" that lookback windows and future-target checks are relative to
+
+Live (date.today()) unless pinned. The app pins it when data is loaded, so every
+analysis, cached result and forecast of a session uses the same as-of date even
+across midnight; batch runs and benchmarks pin it (or pass as_of) to replay results.
+"""
+
+from datetime import date
+
+
+class SessionClock:
+    """Current as-of date of an analysis session"""
+
+    def __init__(self, as_of: date | None = None):
+        """
+        Args:
+            as_of: Pinned date, None for a live clock
+        """
+        self._pinned = as_of
+
+    @property
+    def pinned(self) -> bool:
+        return self._pinned is not None
+
+    def today(self) -> date:
+        return self._pinned if self._pinned is not None else date.today()
+
+    def resolve(self, as_of: date | None = None) -> date:
+        """An explicit as_of wins over the clock"""
+        return as_of if as_of is not None else self.today()
+
+    def pin(self, as_of: date | None = None) -> date:
+        """Freeze the clock at as_of (default: the current date) and return it"""
+        self._pinned = as_of if as_of is not None else date.today()
+        return self._pinned
+
+    def unpin(self) -> None:
+        self._pinned = None
+
+
+# The app's clock; analyzers, predictors and screens default to it
+session_clock = SessionClock()
@@ -1,11 +1,27 @@
 """
 Configuration utility functions for loading and managing application configuration.
+
+load_config returns a fresh, mutable dictionary (for editing and saving). Code that
+only reads the configuration uses get_config, which returns a process-wide cached,
+read-only AppConfig that is reloaded when the file's modification time changes.
 """
 
 import json
+import re
+import threading
+from collections.abc import Mapping
+from dataclasses import dataclass, field
 from pathlib import Path
+from types import MappingProxyType
 from typing import Dict, Any, Union
 
+from .date_utils import strptime_format
+from .excel_utils import col_letter_to_index
+
+# Default CBOM layout (column letters) used when config["cbom"]["columns"] omits one
+DEFAULT_CBOM_COLUMNS = {"room_start": "G", "12nc": "C", "12nc_description": "D", "IGT_12nc": "A"}
+SALES_FILE_TYPES = ("ymbd", "fit_cvi")
+
 
 def load_config(config_path: Union[str, Path] = "config/config.json") -> Dict[str, Any]:
     """
@@ -51,6 +67,145 @@ def load_config(config_path: Union[str, Path] = "config/config.json") -> Dict[st
         raise Exception(f"Error loading configuration file: {str(e)}")
 
 
+def _resolve_config_path(config_path: Union[str, Path]) -> Path:
+    """Absolute config path (relative paths are taken from the project root)"""
+    config_path = Path(config_path)
+    if not config_path.is_absolute():
+        config_path = Path(__file__).parent.parent.parent / config_path
+    return config_path
+
+
+def _freeze(value):
+    """Read-only deep copy of parsed JSON (dicts -> mapping proxies, lists -> tuples)"""
+    if isinstance(value, Mapping):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _thaw(value):
+    """Mutable deep copy of a frozen configuration value"""
+    if isinstance(value, Mapping):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    return value
+
+
+@dataclass(frozen=True, eq=False)
+class AppConfig(Mapping):
+    """Immutable configuration with the values needed in parsing loops precomputed
+
+    Behaves like the read-only configuration dictionary (config["cbom"]["rows"], ...)
+    and adds:
+        - patterns: config["validation"]["patterns"] compiled once
+        - date_formats: strptime format per sales file type ("ymbd", "fit_cvi")
+        - cbom_columns: CBOM column letters as zero-based indices (defaults filled in)
+    """
+
+    data: Mapping[str, Any]
+    path: Path | None = None
+    stamp: tuple | None = None  # (mtime_ns, size) of the file when it was loaded
+    patterns: Mapping[str, re.Pattern] = field(init=False, repr=False)
+    date_formats: Mapping[str, str] = field(init=False, repr=False)
+    cbom_columns: Mapping[str, int] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        data = _freeze(self.data)
+        validation = data.get("validation", {})
+        patterns = {name: re.compile(pattern) for name, pattern in validation.get("patterns", {}).items()}
+        date_formats = {
+            file_type: strptime_format(data.get(file_type, {}).get("date_format"))
+            for file_type in SALES_FILE_TYPES
+        }
+        letters = {**DEFAULT_CBOM_COLUMNS, **data.get("cbom", {}).get("columns", {})}
+        cbom_columns = {name: col_letter_to_index(letter) for name, letter in letters.items() if letter}
+
+        object.__setattr__(self, "data", data)
+        object.__setattr__(self, "patterns", MappingProxyType(patterns))
+        object.__setattr__(self, "date_formats", MappingProxyType(date_formats))
+        object.__setattr__(self, "cbom_columns", MappingProxyType(cbom_columns))
+
+    @classmethod
+    def of(cls, config) -> "AppConfig":
+        """Return config as an AppConfig (plain dictionaries are wrapped)"""
+        return config if isinstance(config, cls) else cls(config)
+
+    def __getitem__(self, key):
+        return self.data[key]
+
+    def __iter__(self):
+        return iter(self.data)
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __reduce__(self):
+        # Mapping proxies cannot be pickled; rebuild from plain data (e.g. in worker processes)
+        return (type(self), (self.to_dict(), self.path, self.stamp))
+
+    @property
+    def room_pattern(self) -> re.Pattern:
+        return self.patterns["room_normalized"]
+
+    @property
+    def nc12_pattern(self) -> re.Pattern:
+        return self.patterns["12nc_normalized"]
+
+    @property
+    def label_date_format(self) -> str:
+        """Date format name used for period labels (config["validation"]["date_format"])"""
+        return self.data.get("validation", {}).get("date_format", "MM-DD-YYYY")
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Mutable deep copy of the configuration (e.g. for save_config)"""
+        return _thaw(self.data)
+
+
+_config_cache: Dict[Path, AppConfig] = {}
+_config_lock = threading.Lock()
+
+
+def get_config(config_path: Union[str, Path] = "config/config.json") -> AppConfig:
+    """
+    Return the cached configuration, reloading it if the file changed on disk.
+
+    Every call costs one stat() of the file; the JSON is only parsed again when
+    its modification time or size changed since the cached copy was loaded.
+
+    Args:
+        config_path: Path to the configuration JSON file (relative to project root)
+
+    Returns:
+        AppConfig shared by all callers (read-only)
+
+    Raises:
+        FileNotFoundError: If the configuration file doesn't exist
+        json.JSONDecodeError: If the configuration file is not valid JSON
+    """
+    path = _resolve_config_path(config_path)
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        _config_cache.pop(path, None)
+        return AppConfig(load_config(path))
+    stamp = (stat.st_mtime_ns, stat.st_size)
+
+    with _config_lock:
+        cached = _config_cache.get(path)
+        if cached is None or cached.stamp != stamp:
+            cached = AppConfig(load_config(path), path=path, stamp=stamp)
+            _config_cache[path] = cached
+        return cached
+
+
+def clear_config_cache() -> None:
+    """Drop every cached configuration (the next get_config reads the file)"""
+    with _config_lock:
+        _config_cache.clear()
+
+
 def save_config(
     config: Dict[str, Any], config_path: Union[str, Path] = "config/config.json"
 ) -> None:
@@ -70,10 +225,17 @@ def save_config(
         project_root = Path(__file__).parent.parent.parent
         config_path = project_root / config_path
 
+    if isinstance(config, AppConfig):
+        config = config.to_dict()
+
     # Save with pretty formatting
     with open(config_path, "w", encoding="utf-8") as f:
         json.dump(config, f, indent=2, ensure_ascii=False)
 
+    # Do not rely on the mtime alone: a quick rewrite can keep the same timestamp
+    with _config_lock:
+        _config_cache.pop(config_path, None)
+
 
 def get_last_files(config_path: Union[str, Path] = "config/config.json") -> Dict[str, str]:
     """Get last used file paths from config
@@ -84,8 +246,8 @@ def get_last_files(config_path: Union[str, Path] = "config/config.json") -> Dict
     Returns:
         Dictionary with last file paths (cbom, ymbd, fit_cvi)
     """
-    config = load_config(config_path)
-    return config.get("last_files", {"cbom": "", "ymbd": "", "fit_cvi": ""})
+    config = get_config(config_path)
+    return dict(config.get("last_files", {"cbom": "", "ymbd": "", "fit_cvi": ""}))
 
 
 def save_last_files(
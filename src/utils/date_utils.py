@@ -1,7 +1,186 @@
-"""Date utility functions for period key generation and next period labeling"""
+"""Date utility functions for period key generation, next period labeling and bulk date parsing"""
 
-from datetime import datetime, date, timedelta
-from src.utils import load_config
+import time
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Dict, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+# Module import: config_util imports this module while it initializes
+from . import config_util
+from .periods import GRANULARITIES, current_period, format_period, parse_period, period_of, period_start
+
+# config "date_format" names -> strptime formats
+DATE_FORMAT_MAP = {
+    "MM-DD-YYYY": "%m-%d-%Y",
+    "DD-MMM-YYYY": "%d-%b-%Y",
+    "YYYY-MM-DD": "%Y-%m-%d",
+    "YYYY-MM-DD HH:MM:SS": "%Y-%m-%d %H:%M:%S",
+}
+DEFAULT_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+# Tried in order for sales dates not matching the configured format
+FALLBACK_DATE_FORMATS = ["%Y-%m-%d %H:%M:%S", "%Y-%m-%d", "%m-%d-%Y", "%d-%b-%Y"]
+
+
+def strptime_format(date_format: str | None) -> str:
+    """strptime format for a config "date_format" name (default: YYYY-MM-DD HH:MM:SS)"""
+    return DATE_FORMAT_MAP.get(date_format, DEFAULT_DATE_FORMAT)
+
+
+# Distinct strings checked per candidate format when detecting a column's format
+DATE_SAMPLE_SIZE = 500
+# Distinct date strings remembered per DateParser (a few thousand in a typical export)
+DATE_MEMO_SIZE = 200_000
+
+
+def detect_date_format(
+    values: pd.Series, candidates: Sequence[str], sample_size: int = DATE_SAMPLE_SIZE
+) -> str | None:
+    """Return the candidate strptime format matching most of a sample of values
+
+    input:
+        - values: date strings (a Series of distinct values is best)
+        - candidates: strptime formats, in order of preference (ties go to the earlier one)
+        - sample_size: number of values tried, evenly spread over the Series
+    output:
+        - the dominant format, or None if no candidate matches any sampled value
+    """
+    if values.empty:
+        return None
+    if len(values) > sample_size:
+        values = values.iloc[np.linspace(0, len(values) - 1, sample_size).astype(np.intp)]
+    best, best_hits = None, 0
+    for fmt in candidates:
+        hits = int(pd.to_datetime(values, format=fmt, errors="coerce").notna().sum())
+        if hits > best_hits:
+            best, best_hits = fmt, hits
+    return best
+
+
+@dataclass
+class DateParseStats:
+    """Counters of one DateParser"""
+
+    rows: int = 0  # values parsed (including failures)
+    distinct: int = 0  # distinct strings actually parsed (memo misses)
+    memo_hits: int = 0  # distinct strings answered from the memo
+    failed_rows: int = 0  # values matching no format
+    seconds: float = 0.0
+    formats: Dict[str, int] = field(default_factory=dict)  # strptime format -> rows parsed with it
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"{self.rows:,} dates ({self.distinct:,} distinct parsed, {self.memo_hits:,} memo hits, "
+            f"{self.failed_rows:,} failed) at {self.rows_per_second:,.0f} rows/s"
+        )
+
+
+class DateParser:
+    """Bulk parser for a date column in one of a few known formats
+
+    Each call parses only the distinct strings it has not seen before. Their
+    dominant format is detected on a sample and applied to all of them in one
+    vectorized pass; only the strings it does not match are retried with the
+    remaining formats. Results (including failures) are memoized, so the chunks of
+    a streamed file re-parse nothing but new dates.
+    """
+
+    def __init__(
+        self,
+        date_format: str | None = None,
+        fallback_formats: Sequence[str] = FALLBACK_DATE_FORMATS,
+        sample_size: int = DATE_SAMPLE_SIZE,
+        max_memo: int = DATE_MEMO_SIZE,
+    ):
+        """
+        Args:
+            date_format: Expected strptime format (preferred on ties)
+            fallback_formats: Other strptime formats to accept
+            sample_size: Distinct values sampled for format detection
+            max_memo: Maximum number of memoized strings
+        """
+        self.date_format = date_format
+        self.formats: List[str] = list(dict.fromkeys([f for f in [date_format, *fallback_formats] if f]))
+        self.sample_size = sample_size
+        self.max_memo = max_memo
+        self.memo: Dict[str, tuple] = {}  # date string -> (datetime64 or NaT, format or None)
+        self.stats = DateParseStats()
+
+    def parse(self, values: pd.Series) -> tuple[pd.Series, Dict[str, int]]:
+        """Parse a column of dates
+
+        input:
+            - values: Series of date strings (or datetimes; datetime columns pass through)
+        output:
+            - datetime Series aligned with values, NaT where no format matched
+            - rows parsed per strptime format
+        """
+        start = time.perf_counter()
+        self.stats.rows += len(values)
+        if pd.api.types.is_datetime64_any_dtype(values):
+            self.stats.failed_rows += int(values.isna().sum())
+            self.stats.seconds += time.perf_counter() - start
+            return values, {}
+
+        codes, uniques = pd.factorize(values)
+        strings = pd.Series(uniques, dtype=object).astype(str).str.strip()
+
+        parsed = np.full(len(strings) + 1, np.datetime64("NaT"), dtype="datetime64[us]")
+        formats = np.full(len(strings) + 1, None, dtype=object)
+        pending = []
+        for position, string in enumerate(strings.tolist()):
+            cached = self.memo.get(string)
+            if cached is None:
+                pending.append(position)
+            else:
+                parsed[position], formats[position] = cached
+        self.stats.memo_hits += len(strings) - len(pending)
+
+        if pending:
+            new_strings = strings.iloc[pending]
+            new_parsed, new_formats = self._parse_distinct(new_strings)
+            parsed[pending] = new_parsed
+            formats[pending] = new_formats
+            self.stats.distinct += len(pending)
+            room = self.max_memo - len(self.memo)
+            if room > 0:
+                self.memo.update(
+                    zip(new_strings.tolist()[:room], zip(new_parsed[:room], new_formats[:room]))
+                )
+
+        # Count per row, not per distinct value (missing values have code -1)
+        row_formats = pd.Series(formats[codes], dtype=object)
+        format_counts = row_formats.value_counts().to_dict()
+        for fmt, count in format_counts.items():
+            self.stats.formats[fmt] = self.stats.formats.get(fmt, 0) + count
+        result = pd.Series(parsed[codes], index=values.index)
+        self.stats.failed_rows += int(row_formats.isna().sum())
+        self.stats.seconds += time.perf_counter() - start
+        return result, format_counts
+
+    def _parse_distinct(self, strings: pd.Series) -> tuple[np.ndarray, np.ndarray]:
+        """Parse distinct strings: dominant format first, then the residue with the others"""
+        dominant = detect_date_format(strings, self.formats, self.sample_size)
+        order = self.formats if dominant is None else [dominant] + [f for f in self.formats if f != dominant]
+
+        parsed = pd.Series(pd.NaT, index=strings.index, dtype="datetime64[us]")
+        formats = pd.Series(None, index=strings.index, dtype=object)
+        pending = strings
+        for fmt in order:
+            if pending.empty:
+                break
+            retried = pd.to_datetime(pending, format=fmt, errors="coerce")
+            hits = retried.index[retried.notna()]
+            parsed[hits] = retried[hits]
+            formats[hits] = fmt
+            pending = pending[retried.isna()]
+        return parsed.to_numpy(dtype="datetime64[us]"), formats.to_numpy()
 
 
 def get_period_key(dt: date, granularity: str) -> str:
@@ -12,42 +191,20 @@ def get_period_key(dt: date, granularity: str) -> str:
     output:
         - String representing the period key in MM-DD-YYYY compatible format
     """
-    if granularity == "monthly":
-        return f"{dt.month:02d}-{dt.year}"  # MM-YYYY
-    elif granularity == "quarterly":
-        quarter = (dt.month - 1) // 3 + 1
-        return f"{dt.year}-Q{quarter}"
-    else:  # yearly
-        return str(dt.year)
+    if granularity not in GRANULARITIES:
+        granularity = "yearly"
+    return format_period(period_of(dt, granularity), granularity)
 
 
-def get_next_period_label(granularity: str) -> str:
+def get_next_period_label(granularity: str, as_of: date | None = None) -> str:
     """Generate the next period label based on granularity
 
-    Returns labels in MM-DD-YYYY compatible format from config
+    Returns labels in MM-DD-YYYY compatible format from config; the period after the one
+    containing as_of (default: the session clock's date)
     """
-    now = datetime.now()
-
-    if granularity == "yearly":
-        return str(now.year + 1)
-    elif granularity == "quarterly":
-        current_quarter = (now.month - 1) // 3 + 1
-        next_quarter = current_quarter + 1
-        next_year = now.year
-        if next_quarter > 4:
-            next_quarter = 1
-            next_year += 1
-        return f"{next_year}-Q{next_quarter}"
-    elif granularity == "monthly":
-        next_month = now.month + 1
-        next_year = now.year
-        if next_month > 12:
-            next_month = 1
-            next_year += 1
-        # Return MM-YYYY format
-        return f"{next_month:02d}-{next_year}"
-    else:
-        return str(now.year + 1)
+    if granularity not in GRANULARITIES:
+        granularity = "yearly"
+    return format_period(current_period(granularity, as_of) + 1, granularity)
 
 
 def match_granularity(target_time: str, granularity: str) -> str:
@@ -68,8 +225,7 @@ def match_granularity(target_time: str, granularity: str) -> str:
         Adjusted target_time matching data granularity
     """
 
-    config = load_config()
-    date_format = config["validation"].get("date_format", "MM-DD-YYYY")
+    date_format = config_util.get_config().label_date_format
     target_time = str(target_time)
     label_granularity = get_granularity_from_label(target_time, date_format)
 
@@ -91,35 +247,10 @@ def match_granularity(target_time: str, granularity: str) -> str:
         )
 
         try:
-            # Parse based on label granularity using MM-DD-YYYY format
-            if label_granularity == "monthly":
-                # Parse MM-YYYY format
-                date_obj = datetime.strptime(target_time, "%m-%Y")
-            elif label_granularity == "quarterly":
-                parts = target_time.split("-Q")
-                year = int(parts[0])
-                quarter = int(parts[1])
-                month = quarter * 3 - 2  # First month of quarter
-                date_obj = datetime(year, month, 1)
-            elif label_granularity == "yearly":
-                date_obj = datetime(int(target_time), 1, 1)
-            else:
-                return target_time  # Can't parse, return as-is
-
-            # Convert to data's granularity using MM-DD-YYYY format
-            if granularity == "yearly":
-                return f"{date_obj.year}"
-            elif granularity == "quarterly":
-                quarter = (date_obj.month - 1) // 3 + 1
-                return f"{date_obj.year}-Q{quarter}"
-            elif granularity == "monthly":
-                # Return in MM-YYYY format
-                return f"{date_obj.month:02d}-{date_obj.year}"
-            else:
-                # Unknown granularity, return as-is
-                return target_time
-
-        except (ValueError, IndexError, AttributeError) as e:
+            # The period of the data's granularity that holds the label's first day
+            first_day = period_start(parse_period(target_time, label_granularity), label_granularity)
+            return format_period(period_of(first_day, granularity), granularity)
+        except ValueError as e:
             print(f"⚠️  Error parsing target time '{target_time}': {e}. Using as-is.")
             return target_time
 
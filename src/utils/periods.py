@@ -0,0 +1,138 @@
+"""Integer period numbers for monthly / quarterly / yearly analysis
+
+A period is a plain int in a given granularity:
+    - monthly: months since January 1970 (0 = 01-1970)
+    - quarterly: quarters since 1970-Q1
+    - yearly: the calendar year
+so the next period is p + 1, the same period last year is p - periods_per_year,
+and sorting periods is sorting ints. Labels ("03-2024", "2024-Q1", "2024") are
+only formatted / parsed at the UI and export boundary.
+"""
+
+import calendar
+from datetime import date
+
+import numpy as np
+
+from .clock import session_clock
+
+EPOCH_YEAR = 1970
+EPOCH_ORDINAL = date(EPOCH_YEAR, 1, 1).toordinal()
+GRANULARITIES = ("monthly", "quarterly", "yearly")
+MONTHS_PER_PERIOD = {"monthly": 1, "quarterly": 3, "yearly": 12}
+PERIODS_PER_YEAR = {"monthly": 12, "quarterly": 4, "yearly": 1}
+
+
+def _check(granularity: str) -> None:
+    if granularity not in MONTHS_PER_PERIOD:
+        raise ValueError(f"Unknown granularity: {granularity}")
+
+
+def month_index(ordinals: np.ndarray) -> np.ndarray:
+    """Months since January 1970 of date ordinals (vectorized)
+
+    Only the days in the span are converted; every date then is a table lookup.
+    """
+    ordinals = np.asarray(ordinals, dtype=np.int64)
+    if not ordinals.size:
+        return np.empty(0, dtype=np.int64)
+    low = int(ordinals.min())
+    days = np.arange(low, int(ordinals.max()) + 1) - EPOCH_ORDINAL
+    table = days.astype("datetime64[D]").astype("datetime64[M]").astype(np.int64)
+    return table[ordinals - low]
+
+
+def months_to_periods(months, granularity: str):
+    """Period numbers of month indexes (ints or arrays)"""
+    _check(granularity)
+    if granularity == "yearly":
+        return months // 12 + EPOCH_YEAR
+    return months // MONTHS_PER_PERIOD[granularity]
+
+
+def periods_to_months(periods, granularity: str):
+    """Month index of the first month of periods (ints or arrays)"""
+    _check(granularity)
+    if granularity == "yearly":
+        return (periods - EPOCH_YEAR) * 12
+    return periods * MONTHS_PER_PERIOD[granularity]
+
+
+def period_of(dt: date, granularity: str) -> int:
+    """Period number of a date"""
+    return months_to_periods((dt.year - EPOCH_YEAR) * 12 + dt.month - 1, granularity)
+
+
+def periods_of(ordinals: np.ndarray, granularity: str) -> np.ndarray:
+    """Period numbers of an array of date ordinals"""
+    return months_to_periods(month_index(ordinals), granularity)
+
+
+def period_start(period: int, granularity: str) -> date:
+    """First day of a period"""
+    month = periods_to_months(period, granularity)
+    return date(EPOCH_YEAR + month // 12, month % 12 + 1, 1)
+
+
+def period_year(period: int, granularity: str) -> int:
+    """Calendar year of a period"""
+    return periods_to_months(period, granularity) // 12 + EPOCH_YEAR
+
+
+def period_in_year(period: int, granularity: str) -> int:
+    """Month (1-12) or quarter (1-4) number of a period; 1 for years"""
+    if granularity == "yearly":
+        return 1
+    return period % PERIODS_PER_YEAR[granularity] + 1
+
+
+def same_period_last_year(period: int, granularity: str) -> int:
+    return period - PERIODS_PER_YEAR[granularity]
+
+
+def current_period(granularity: str, today: date | None = None) -> int:
+    """Period containing today (default: the session clock's date)"""
+    return period_of(session_clock.resolve(today), granularity)
+
+
+def format_period(period: int, granularity: str) -> str:
+    """Analyzer / export label of a period: "MM-YYYY", "YYYY-Qn" or "YYYY" """
+    year = period_year(period, granularity)
+    if granularity == "monthly":
+        return f"{period_in_year(period, granularity):02d}-{year}"
+    if granularity == "quarterly":
+        return f"{year}-Q{period_in_year(period, granularity)}"
+    return str(year)
+
+
+def format_period_ui(period: int, granularity: str) -> str:
+    """Short chart label of a period within its year: "Mar", "Q1" or "2024" """
+    if granularity == "monthly":
+        return calendar.month_abbr[period_in_year(period, granularity)]
+    if granularity == "quarterly":
+        return f"Q{period_in_year(period, granularity)}"
+    return str(period)
+
+
+def parse_period(label: str, granularity: str) -> int:
+    """Period number of a label written by format_period
+
+    Raises:
+        ValueError: if the label is not a period of that granularity
+    """
+    _check(granularity)
+    label = str(label).strip()
+    try:
+        if granularity == "monthly":
+            month, year = label.split("-")
+            if len(month) <= 2 and len(year) == 4 and 1 <= int(month) <= 12:
+                return (int(year) - EPOCH_YEAR) * 12 + int(month) - 1
+        elif granularity == "quarterly":
+            year, quarter = label.split("-Q")
+            if len(year) == 4 and 1 <= int(quarter) <= 4:
+                return (int(year) - EPOCH_YEAR) * 4 + int(quarter) - 1
+        elif len(label) == 4:
+            return int(label)
+    except ValueError:
+        pass
+    raise ValueError(f"Invalid {granularity} period label: {label!r}")
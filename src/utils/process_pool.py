@@ -0,0 +1,45 @@
+"""Worker process pools (file parsing, portfolio-wide analysis)"""
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable
+
+# spawn, never fork: the app runs a Tk event loop, and a forked child would inherit
+# its state (and any lock another thread holds) mid-flight. Queues and events shared
+# with the workers must come from this context too.
+spawn_context = multiprocessing.get_context("spawn")
+
+
+def spawn_pool(
+    max_workers: int, initializer: Callable | None = None, initargs: tuple = ()
+) -> ProcessPoolExecutor:
+    """
+    Process pool whose workers are started with the spawn method
+
+    Args:
+        max_workers: Number of worker processes
+        initializer: Optional function run in each worker on start-up
+        initargs: Arguments of initializer (picklable; spawn_context queues and events)
+
+    Returns:
+        ProcessPoolExecutor
+    """
+    return ProcessPoolExecutor(
+        max_workers=max_workers, mp_context=spawn_context, initializer=initializer, initargs=initargs
+    )
+
+
+def terminate_pool(pool: ProcessPoolExecutor) -> None:
+    """
+    Kill the pool's worker processes and shut it down, dropping queued and running work
+
+    For abandoned work that cannot stop on its own (a single long read); the pool is
+    broken afterwards and its pending futures fail.
+    """
+    terminate_workers = getattr(pool, "terminate_workers", None)  # Python 3.14+
+    if terminate_workers is not None:
+        terminate_workers()
+        return
+    for process in list((pool._processes or {}).values()):
+        process.terminate()
+    pool.shutdown(wait=True, cancel_futures=True)
@@ -1,6 +1,14 @@
 """String utility functions for normalizing identifiers and canonicalizing headers"""
+import re
+import sys
+
+import numpy as np
 import pandas as pd
 
+# Characters removed from identifiers (see normalize_identifier)
+_IDENTIFIER_SEPARATORS = re.compile(r"[ \-_]")
+
+
 def normalize_identifier(value):
     """
     Normalize an identifier (like room number or 12NC) by:
@@ -30,6 +38,68 @@ def normalize_identifier(value):
     return normalized
 
 
+def normalize_identifiers(values, memo: dict | None = None) -> np.ndarray:
+    """
+    Bulk normalize_identifier for a Series, array or list, with identical results.
+
+    Each distinct value is normalized once, with vectorized string operations;
+    the results are broadcast back to every position. Sales files repeat a few
+    thousand IDs over millions of rows, so this is far cheaper than a per-cell call.
+
+    input:
+        - values: Series / array / list of raw identifiers (any type, missing allowed)
+        - memo: optional dict {raw value: normalized} reused across calls (e.g. the
+          chunks of one streamed file); values already in it are not normalized again
+          and new ones are added
+    output:
+        - object ndarray of interned normalized strings ("" for missing values), aligned
+          with values, so every object referring to one ID shares a single string
+    """
+    codes, uniques = pd.factorize(pd.Series(values, dtype=object), use_na_sentinel=True)
+    uniques = pd.Series(uniques, dtype=object)
+
+    known = None
+    if memo:
+        known = uniques.map(memo)
+        pending = uniques[known.isna()]
+    else:
+        pending = uniques
+
+    normalized = (
+        pending.astype(str)
+        .str.strip()
+        .str.split(".", n=1)
+        .str[0]
+        .str.replace(_IDENTIFIER_SEPARATORS, "", regex=True)
+        .map(sys.intern)
+    )
+    if memo is not None:
+        memo.update(zip(pending.tolist(), normalized.tolist()))
+    if known is not None:
+        known[normalized.index] = normalized
+        normalized = known
+
+    # Missing values (code -1) become ""
+    return np.append(normalized.to_numpy(dtype=object), "")[codes]
+
+
+def validate_identifiers(identifiers, pattern) -> np.ndarray:
+    """
+    Boolean mask of normalized identifiers matching a validation pattern.
+
+    input:
+        - identifiers: normalized IDs (e.g. from normalize_identifiers)
+        - pattern: regex string or compiled pattern, e.g. AppConfig.nc12_pattern
+    output:
+        - bool ndarray, False for empty or non-matching IDs
+    """
+    ids = pd.Series(identifiers, dtype=object)
+    if ids.empty:
+        return np.zeros(0, dtype=bool)
+    matches = ids.str.match(pattern) & (ids != "")
+    return matches.fillna(False).to_numpy(dtype=bool)
+
+
 def canon_header(s: str) -> str:
     """
     Canonicalize a header for robust matching
@@ -0,0 +1,195 @@
+"""
+CBOM Matrix Parser Test Suite
+Tests the vectorized CBOM quantity-matrix parsing and the sparse BillOfMaterials
+store on a synthetic sheet.
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.infrastructure import data_loaders
+from src.infrastructure.data_loaders import load_cbom, parse_cbom_matrix
+from src.infrastructure.data_transformer import transform_bom, transform_cbom_data
+from src.models.bom import BillOfMaterials, BomView
+
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+
+@pytest.fixture
+def cbom_config():
+    """Minimal CBOM configuration (rooms from column G, 12NCs from row 9)"""
+    return {
+        "cbom": {
+            "columns": {"room_start": "G", "12nc": "C", "12nc_description": "D", "IGT_12nc": "A"},
+            "rows": {"room_numbers": 5, "room_descriptions": 4, "12nc_start": 9},
+        },
+        "validation": {
+            "patterns": {"room_normalized": r"^[A-Z0-9]+$", "12nc_normalized": r"^\d{12}$"}
+        },
+    }
+
+
+@pytest.fixture
+def cbom_sheet():
+    """Raw CBOM sheet: 3 room columns (one duplicate) x 4 12NC rows (one invalid)"""
+    data = np.full((12, 9), np.nan, dtype=object)
+    # Room descriptions (row 4) and room numbers (row 5)
+    data[3, 6:9] = ["Cath Lab", "Cath Lab copy", "Hybrid OR"]
+    data[4, 6:9] = ["R-100", "R 100", "R_200"]
+    # 12NC rows from row 9: IGT (A), 12NC (C), description (D)
+    data[8, [0, 2, 3]] = ["IGT1", 989606130501.0, "  Cable  "]
+    data[9, [0, 2, 3]] = ["IGT2", "9896-0613-0502", "Monitor"]
+    data[10, [0, 2, 3]] = ["IGT3", "12345", "Too short"]
+    data[11, [0, 2, 3]] = [np.nan, 989606130503, np.nan]
+    # Quantities
+    data[8, 6:9] = [2, 7, np.nan]
+    data[9, 6:9] = [0, 1, "3"]
+    data[10, 6:9] = [5, 5, 5]
+    data[11, 6:9] = [np.nan, np.nan, np.nan]
+    return pd.DataFrame(data)
+
+
+# ============================================================================
+# MATRIX PARSER TESTS
+# ============================================================================
+
+
+class TestParseCbomMatrix:
+    """Test suite for the sparse matrix parser"""
+
+    def test_identifiers_normalized_and_deduplicated(self, cbom_sheet, cbom_config):
+        """Header row and ID column are normalized, validated and deduplicated"""
+        bom = parse_cbom_matrix(cbom_sheet, cbom_config)
+
+        assert bom.room_ids == ["R100", "R200"]
+        assert bom.room_descriptions == ["Cath Lab", "Hybrid OR"]
+        assert bom.nc12_ids == ["989606130501", "989606130502", "989606130503"]
+        assert bom.nc12_descriptions == ["Cable", "Monitor", ""]
+        assert bom.nc12_igts == ["IGT1", "IGT2", ""]
+
+    def test_only_positive_cells_are_stored(self, cbom_sheet, cbom_config):
+        """Empty and zero cells are masked out, text quantities are converted"""
+        bom = parse_cbom_matrix(cbom_sheet, cbom_config)
+
+        assert bom.nnz == 2
+        assert bom.room_row(0)[0].tolist() == [0]
+        assert bom.room_row(1)[1].tolist() == [3]
+        assert bom.nc12_column(2)[0].size == 0
+
+
+# ============================================================================
+# BILL OF MATERIALS TESTS
+# ============================================================================
+
+
+class TestBillOfMaterials:
+    """Test suite for the CSR/CSC store and its lazy views"""
+
+    @pytest.fixture
+    def bom(self):
+        return BillOfMaterials.from_triples(
+            ["R1", "R2", "R3"],
+            ["A", "B", "C"],
+            room_codes=np.array([1, 0, 0, 2, 1]),
+            nc12_codes=np.array([2, 1, 0, 2, 0]),
+            quantities=np.array([4, 2, 1, 3, 0]),
+        )
+
+    def test_csr_and_csc_agree(self, bom):
+        """Row and column slices describe the same non-zero entries"""
+        assert bom.nnz == 4
+        assert bom.room_indptr.tolist() == [0, 2, 3, 4]
+        assert bom.room_row(0)[0].tolist() == [0, 1]
+        assert bom.nc12_indptr.tolist() == [0, 1, 2, 4]
+        assert bom.nc12_column(2)[0].tolist() == [1, 2]
+        assert bom.nc12_column(2)[1].tolist() == [4, 3]
+
+    def test_views_behave_like_dicts(self, bom):
+        """Component views support lookups, membership, iteration and items"""
+        room_view = bom.room_components("R1")
+        nc12_view = bom.nc12_components("C")
+
+        assert isinstance(room_view, BomView)
+        assert dict(room_view) == {"A": 1, "B": 2}
+        assert room_view["B"] == 2
+        assert "C" not in room_view
+        assert "unknown" not in room_view
+        assert list(nc12_view.items()) == [("R2", 4), ("R3", 3)]
+        assert sum(nc12_view.values()) == nc12_view.total() == 7
+        with pytest.raises(KeyError):
+            room_view["C"]
+
+    def test_transform_bom_shares_store(self, bom):
+        """Entities get lazy views over one shared store"""
+        bom.room_descriptions = ["Room 1", "Room 2", "Room 3"]
+        bom.nc12_descriptions = ["Part A", "Part B", "Part C"]
+        bom.nc12_igts = ["", "", ""]
+        rooms, nc12s = transform_bom(bom)
+
+        assert [room.id for room in rooms] == ["R1", "R2", "R3"]
+        assert rooms[0].components.bom is nc12s[0].components.bom
+        assert rooms[0].total_items == 3
+        assert nc12s[2].has_room("R3")
+
+
+# ============================================================================
+# LOAD_CBOM TESTS
+# ============================================================================
+
+
+class TestLoadCbom:
+    """Test suite for the dictionary format derived from the sparse store"""
+
+    @pytest.fixture(autouse=True)
+    def _patch_reader(self, monkeypatch, cbom_sheet):
+        monkeypatch.setattr(data_loaders, "read_file", lambda *args, **kwargs: cbom_sheet)
+
+    def test_room_data(self, cbom_config):
+        """Each valid room lists its non-zero 12NCs"""
+        room_data, _ = load_cbom("cbom.xlsx", cbom_config)
+
+        assert list(room_data) == ["R100", "R200"]
+        assert room_data["R100"]["description"] == "Cath Lab"
+        assert room_data["R100"]["tnc_list"].to_dict("records") == [
+            {"12NC": "989606130501", "Quantity": 2}
+        ]
+        assert room_data["R200"]["tnc_list"]["12NC"].tolist() == ["989606130502"]
+
+    def test_data_12nc(self, cbom_config):
+        """Each valid 12NC lists its rooms, including 12NCs without any room"""
+        _, data_12nc = load_cbom("cbom.xlsx", cbom_config)
+
+        assert list(data_12nc) == ["989606130501", "989606130502", "989606130503"]
+        assert data_12nc["989606130501"]["12NC_Description"] == "Cable"
+        assert data_12nc["989606130501"]["12NC_IGT"] == "IGT1"
+        assert data_12nc["989606130502"]["room_list"].to_dict("records") == [
+            {"Room": "R200", "Quantity": 3}
+        ]
+        assert data_12nc["989606130503"]["room_list"].empty
+
+    def test_transform_cbom_data_round_trip(self, cbom_config):
+        """The dictionary format converts back into the same components"""
+        room_data, data_12nc = load_cbom("cbom.xlsx", cbom_config)
+        data_12nc["989606130503"]["12NC_Description"] = "Spare"
+        rooms, nc12s = transform_cbom_data(room_data, data_12nc, cbom_config)
+
+        assert {room.id: dict(room.components) for room in rooms} == {
+            "R100": {"989606130501": 2},
+            "R200": {"989606130502": 3},
+        }
+        assert {nc12.id: dict(nc12.components) for nc12 in nc12s} == {
+            "989606130501": {"R100": 2},
+            "989606130502": {"R200": 3},
+            "989606130503": {},
+        }
@@ -0,0 +1,118 @@
+"""
+Configuration Test Suite
+Tests the cached, read-only AppConfig: precomputed patterns / formats / column
+indices, mtime-based reloading and pickling for worker processes.
+"""
+
+import json
+import os
+import pickle
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import pytest
+
+from src.utils.config_util import AppConfig, clear_config_cache, get_config, save_config
+
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+
+@pytest.fixture
+def config_data():
+    return {
+        "cbom": {"columns": {"room_start": "AB", "12nc": "C"}, "rows": {"12nc_start": 9}},
+        "ymbd": {"date_format": "YYYY-MM-DD"},
+        "fit_cvi": {"date_format": "DD-MMM-YYYY"},
+        "validation": {"patterns": {"room_normalized": r"^[A-Z0-9]+$", "12nc_normalized": r"^\d{12}$"}},
+        "last_files": {"cbom": "", "ymbd": "", "fit_cvi": ""},
+    }
+
+
+@pytest.fixture
+def config_file(tmp_path, config_data):
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps(config_data))
+    yield path
+    clear_config_cache()
+
+
+# ============================================================================
+# APPCONFIG TESTS
+# ============================================================================
+
+
+class TestAppConfig:
+    """Test suite for the precomputed, immutable configuration"""
+
+    def test_precomputed_values(self, config_data):
+        """Patterns are compiled, formats resolved and column letters indexed once"""
+        config = AppConfig(config_data)
+
+        assert config.room_pattern.match("R100")
+        assert not config.nc12_pattern.match("12345")
+        assert config.date_formats == {"ymbd": "%Y-%m-%d", "fit_cvi": "%d-%b-%Y"}
+        assert config.cbom_columns["room_start"] == 27
+        assert config.cbom_columns["12nc_description"] == 3  # default column D
+        assert config["cbom"]["rows"]["12nc_start"] == 9
+
+    def test_read_only(self, config_data):
+        """Neither the object nor nested sections can be modified"""
+        config = AppConfig(config_data)
+
+        with pytest.raises(TypeError):
+            config["cbom"]["rows"]["12nc_start"] = 10
+        with pytest.raises(AttributeError):
+            config.data = {}
+        config_data["cbom"]["rows"]["12nc_start"] = 10
+        assert config["cbom"]["rows"]["12nc_start"] == 9
+
+    def test_pickle_and_to_dict(self, config_data):
+        """Worker processes receive an equivalent config; to_dict is mutable JSON data"""
+        config = pickle.loads(pickle.dumps(AppConfig(config_data)))
+
+        assert config.cbom_columns["room_start"] == 27
+        assert config.to_dict() == config_data
+        assert AppConfig.of(config) is config
+
+
+# ============================================================================
+# GET_CONFIG TESTS
+# ============================================================================
+
+
+class TestGetConfig:
+    """Test suite for the process-wide config cache"""
+
+    def test_cached_until_file_changes(self, config_file):
+        """Unchanged files return the same object, edits are picked up"""
+        first = get_config(config_file)
+        assert get_config(config_file) is first
+
+        data = first.to_dict()
+        data["ymbd"]["date_format"] = "MM-DD-YYYY"
+        config_file.write_text(json.dumps(data))
+        stat = config_file.stat()
+        os.utime(config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        reloaded = get_config(config_file)
+        assert reloaded is not first
+        assert reloaded.date_formats["ymbd"] == "%m-%d-%Y"
+
+    def test_save_config_invalidates(self, config_file):
+        """save_config drops the cached copy even if the mtime does not move"""
+        data = get_config(config_file).to_dict()
+        data["last_files"]["cbom"] = "cbom.xlsx"
+        save_config(data, config_file)
+
+        assert get_config(config_file)["last_files"]["cbom"] == "cbom.xlsx"
+
+    def test_missing_file(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            get_config(tmp_path / "missing.json")
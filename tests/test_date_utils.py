@@ -0,0 +1,125 @@
+"""
+Date Parsing Test Suite
+Tests dominant-format detection and the memoizing bulk DateParser used by the
+sales parsers.
+"""
+
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import pandas as pd
+import pytest
+
+from src.utils import AppConfig, config_util
+from src.utils.date_utils import FALLBACK_DATE_FORMATS, DateParser, detect_date_format, match_granularity
+
+
+# ============================================================================
+# FORMAT DETECTION TESTS
+# ============================================================================
+
+
+class TestDetectDateFormat:
+    """Test suite for sampling a column's dominant format"""
+
+    def test_majority_wins(self):
+        values = pd.Series(["05-Mar-2024", "07-Feb-2024", "2024-01-02"])
+        assert detect_date_format(values, FALLBACK_DATE_FORMATS) == "%d-%b-%Y"
+
+    def test_tie_prefers_earlier_candidate(self):
+        """01-02-2024 is valid as MM-DD and DD-MM; the preferred format wins"""
+        values = pd.Series(["01-02-2024"])
+        assert detect_date_format(values, ["%m-%d-%Y", "%d-%m-%Y"]) == "%m-%d-%Y"
+        assert detect_date_format(values, ["%d-%m-%Y", "%m-%d-%Y"]) == "%d-%m-%Y"
+
+    def test_no_match(self):
+        assert detect_date_format(pd.Series(["soon"]), FALLBACK_DATE_FORMATS) is None
+        assert detect_date_format(pd.Series([], dtype=object), FALLBACK_DATE_FORMATS) is None
+
+
+# ============================================================================
+# DATE PARSER TESTS
+# ============================================================================
+
+
+class TestDateParser:
+    """Test suite for bulk, memoized date parsing"""
+
+    @pytest.fixture
+    def values(self):
+        return pd.Series(
+            ["2024-03-01 00:00:00", " 2024-01-05 ", "01-15-2024", None, "not a date", "2024-03-01 00:00:00"],
+            index=range(10, 16),
+        )
+
+    def test_parse_with_residue_formats(self, values):
+        """The dominant format parses most rows; the residue uses the other formats"""
+        parser = DateParser("%Y-%m-%d %H:%M:%S")
+        parsed, format_counts = parser.parse(values)
+
+        assert list(parsed.index) == list(values.index)
+        assert parsed[10] == parsed[15] == datetime(2024, 3, 1)
+        assert parsed[11] == datetime(2024, 1, 5)
+        assert parsed[12] == datetime(2024, 1, 15)
+        assert parsed[[13, 14]].isna().all()
+        assert format_counts == {"%Y-%m-%d %H:%M:%S": 2, "%Y-%m-%d": 1, "%m-%d-%Y": 1}
+
+    def test_memo_and_stats(self, values):
+        """A second chunk only parses strings not seen before"""
+        parser = DateParser("%Y-%m-%d %H:%M:%S")
+        parser.parse(values)
+        distinct = parser.stats.distinct
+        parser.parse(pd.Series(["2024-03-01 00:00:00", "2024-04-01 00:00:00", "not a date"]))
+
+        assert distinct == 4
+        assert parser.stats.distinct == 5
+        assert parser.stats.memo_hits == 2
+        assert parser.stats.rows == 9
+        assert parser.stats.failed_rows == 3
+        assert parser.stats.formats["%Y-%m-%d %H:%M:%S"] == 4
+        assert "9 dates" in parser.stats.summary()
+
+    def test_memo_is_bounded(self, values):
+        parser = DateParser("%Y-%m-%d", max_memo=2)
+        parser.parse(values)
+        assert len(parser.memo) == 2
+
+    def test_datetime_column_passes_through(self):
+        values = pd.Series(pd.to_datetime(["2024-05-02", None]))
+        parser = DateParser()
+        parsed, format_counts = parser.parse(values)
+
+        assert parsed is values
+        assert format_counts == {}
+        assert parser.stats.failed_rows == 1
+
+
+# ============================================================================
+# GRANULARITY MATCHING TESTS
+# ============================================================================
+
+
+class TestMatchGranularity:
+    """Test suite for coarsening prediction targets to the data's granularity"""
+
+    @pytest.fixture(autouse=True)
+    def _config(self, monkeypatch):
+        monkeypatch.setattr(config_util, "get_config", lambda *args, **kwargs: AppConfig({}))
+
+    @pytest.mark.parametrize(
+        "target, granularity, expected",
+        [
+            ("03-2024", "quarterly", "2024-Q1"),
+            ("12-2024", "yearly", "2024"),
+            ("2024-Q3", "yearly", "2024"),
+            ("2024-Q3", "monthly", "2024-Q3"),
+            ("13-2024", "quarterly", "13-2024"),
+        ],
+    )
+    def test_targets(self, target, granularity, expected):
+        assert match_granularity(target, granularity) == expected
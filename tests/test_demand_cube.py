@@ -0,0 +1,173 @@
+"""
+Demand Cube Test Suite
+Tests the entities x months sales matrix and the PerformanceAnalyzer results
+read from it, which must match the ones computed from the raw sales.
+"""
+
+import sys
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+import pytest
+
+from src.analysis import PerformanceAnalyzer, demand_cube
+from src.analysis.demand_cube import DemandCube, month_index, month_start
+from src.models import G_entity, Room, SalesHistory, SalesRecord
+from src.services import EntityCatalog, PerformanceCenter
+
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+
+def _room(room_id, days, quantities):
+    sales = [SalesRecord(identifier=room_id, quantity=q, date=d) for d, q in zip(days, quantities)]
+    return Room(id=room_id, description=f"Room {room_id}", components={}, sales_history=sales)
+
+
+@pytest.fixture
+def rooms():
+    """Rooms with sales spread over the last five years, including zero-quantity sales"""
+    rng = np.random.default_rng(7)
+    today = datetime.now().date()
+    rooms = []
+    for n in range(6):
+        offsets = rng.integers(0, 5 * 366, size=40)
+        days = [today - timedelta(days=int(offset)) for offset in offsets]
+        quantities = rng.integers(0, 5, size=40).tolist()
+        rooms.append(_room(f"R{n}", days, quantities))
+    rooms.append(_room("R_EMPTY", [], []))
+    return rooms
+
+
+@pytest.fixture
+def catalog(rooms):
+    return EntityCatalog(rooms, [])
+
+
+# ============================================================================
+# CUBE TESTS
+# ============================================================================
+
+
+class TestDemandCube:
+    """Test suite for building and slicing the cube"""
+
+    def test_month_index(self):
+        ordinals = np.array([date(1970, 1, 31).toordinal(), date(2024, 2, 29).toordinal()])
+        assert month_index(ordinals).tolist() == [0, 54 * 12 + 1]
+        assert month_start(54 * 12 + 1) == date(2024, 2, 1)
+
+    def test_cells_and_views(self):
+        history = SalesHistory.from_records(
+            [
+                SalesRecord("A", 2, date(2023, 1, 10)),
+                SalesRecord("A", 3, date(2023, 1, 20)),
+                SalesRecord("A", 0, date(2023, 5, 1)),
+                SalesRecord("A", 4, date(2024, 12, 31)),
+            ]
+        )
+        cube = DemandCube.from_histories(["A", "B"], [history, SalesHistory()])
+        assert cube.first_month == month_index(np.array([date(2023, 1, 1).toordinal()]))[0]
+        assert cube.n_months == 24
+        assert cube.quantities[0, [0, 4, 23]].tolist() == [5, 0, 4]
+        assert cube.present[0, 4] and not cube.present[0, 5] and not cube.present[1].any()
+
+        yearly, present, starts = cube.view("yearly")
+        assert yearly.tolist() == [[5, 4], [0, 0]]
+        assert present[0].tolist() == [True, True]
+        assert starts.tolist() == [2023, 2024]
+        quarterly, _, _ = cube.view("quarterly")
+        assert quarterly[0].tolist() == [5, 0, 0, 0, 0, 0, 0, 4]
+
+    def test_window_cuts_boundary_months(self):
+        history = SalesHistory.from_records(
+            [SalesRecord("A", 1, date(2023, 1, day)) for day in (5, 15, 25)]
+            + [SalesRecord("A", 10, date(2023, 3, day)) for day in (5, 15, 25)]
+        )
+        cube = DemandCube.from_histories(["A"], [history])
+        months, quantities, present = cube.monthly_window([0], date(2023, 1, 10), date(2023, 3, 20))
+        assert quantities[0].tolist() == [2, 0, 20]
+        assert present[0].tolist() == [True, False, True]
+        _, quantities, _ = cube.periods([0], date(2023, 1, 10), date(2023, 1, 20), "quarterly")
+        assert quantities.tolist() == [[1]]
+        # Outside the cube's years
+        _, quantities, present = cube.periods([0], date(2019, 6, 1), date(2026, 6, 1), "yearly")
+        assert quantities[0].sum() == 33 and present[0].sum() == 1
+
+    def test_stale_rows(self, rooms):
+        cube = EntityCatalog(rooms, []).cube("room")
+        assert cube.row(rooms[0]) == 0
+        rooms[0].sales_history = SalesHistory()
+        assert cube.row(rooms[0]) is None
+
+
+class TestCubeAnalysis:
+    """Test suite for PerformanceAnalyzer results read from the cube"""
+
+    @pytest.mark.parametrize("granularity", ["monthly", "quarterly", "yearly"])
+    @pytest.mark.parametrize("lookback_years", [1, 3])
+    def test_same_as_raw_sales(self, rooms, catalog, granularity, lookback_years):
+        plain, cubed = PerformanceAnalyzer(), PerformanceAnalyzer(cube_source=catalog)
+        for room in rooms[:-1]:
+            g_entity = G_entity(room, "room")
+            expected = plain.analyze(g_entity, lookback_years, granularity)
+            result = cubed.analyze(g_entity, lookback_years, granularity)
+            assert result.periods == expected.periods
+            assert (result.total, result.average) == (expected.total, expected.average)
+
+    def test_no_sales_still_raises(self, rooms, catalog):
+        with pytest.raises(ValueError):
+            PerformanceAnalyzer(cube_source=catalog).analyze(G_entity(rooms[-1], "room"))
+
+    def test_aggregate_is_sum_of_analyses(self, rooms, catalog):
+        g_entities = [G_entity(room, "room") for room in rooms]
+        expected = PerformanceAnalyzer().aggregate(g_entities, 4, "quarterly")
+        assert PerformanceAnalyzer(cube_source=catalog).aggregate(g_entities, 4, "quarterly") == expected
+        totals = {}
+        for g_entity in g_entities[:-1]:
+            for period in PerformanceAnalyzer().analyze(g_entity, 4, "quarterly").periods:
+                totals[period.label] = totals.get(period.label, 0) + period.quantity
+        assert {period.label: period.quantity for period in expected} == totals
+
+    def test_vectorized_boundary_cut(self, rooms, catalog, monkeypatch):
+        """The bincount path for many rows matches the per-row binary searches"""
+        cube = catalog.cube("room")
+        rows = list(range(len(cube.ids)))
+        start, end = datetime.now().date() - timedelta(days=400), datetime.now().date() - timedelta(days=20)
+        expected = cube.periods(rows, start, end, "monthly")
+        monkeypatch.setattr(demand_cube, "VECTORIZED_EDGE_ROWS", 0)
+        for got, want in zip(cube.periods(rows, start, end, "monthly"), expected):
+            assert np.array_equal(got, want)
+
+
+class TestAnalyzeAll:
+    """Test suite for the batch entities x periods analysis"""
+
+    def test_rows_match_analyze(self, rooms, catalog):
+        analyzer = PerformanceAnalyzer(cube_source=catalog)
+        table = analyzer.analyze_all("room", "all", lookback_years=3, granularity="quarterly")
+        assert table.ids == catalog.ids("room")
+        frame = table.to_frame()
+        assert frame.shape == (len(rooms), len(table.periods))
+        for room in rooms[:-1]:
+            data = analyzer.analyze(G_entity(room, "room"), 3, "quarterly")
+            row = table.ids.index(room.id)
+            assert {p.label: p.quantity for p in data.periods}.items() <= frame.loc[room.id].to_dict().items()
+            assert table.totals[row] == data.total and table.averages[row] == pytest.approx(data.average)
+        assert table.totals[table.ids.index("R_EMPTY")] == 0 and table.averages[table.ids.index("R_EMPTY")] == 0
+
+    def test_selected_ids_and_errors(self, catalog):
+        center = PerformanceCenter([catalog.get("room", "R1"), catalog.get("room", "R0")], [])
+        table = center.analyze_all("room", ["R1", "R0"], granularity="yearly")
+        assert table.ids == ["R1", "R0"] and table.quantities.shape[0] == 2
+        with pytest.raises(ValueError):
+            center.analyze_all("room", ["R1", "NOPE"])
+        with pytest.raises(ValueError):
+            PerformanceAnalyzer().analyze_all("room")
@@ -0,0 +1,125 @@
+"""
+Entity Catalog Test Suite
+Tests the precomputed Room / 12NC indexes shared by the screens and the
+PerformanceCenter.
+"""
+
+import sys
+from datetime import date
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import pytest
+
+from src.models import G_entity, Room, SalesRecord, TwelveNC
+from src.services import EntityCatalog, PerformanceCenter
+
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+
+def _sales(identifier, *entries):
+    return [SalesRecord(identifier=identifier, quantity=qty, date=day) for day, qty in entries]
+
+
+@pytest.fixture
+def rooms():
+    return [
+        Room(
+            id="R200",
+            description="MR Suite",
+            components={"989606130501": 1},
+            sales_history=_sales("R200", (date(2022, 6, 1), 3), (date(2024, 2, 1), 4)),
+        ),
+        Room(id="R100", description="CT Room", components={}, sales_history=[]),
+    ]
+
+
+@pytest.fixture
+def nc12s():
+    return [
+        TwelveNC(
+            id="989606130501",
+            description="Patient Table, Rev-B",
+            igt="",
+            components={"R200": 1},
+            sales_history=_sales("989606130501", (date(2021, 1, 5), 10)),
+        )
+    ]
+
+
+@pytest.fixture
+def catalog(rooms, nc12s):
+    return EntityCatalog(rooms, nc12s)
+
+
+# ============================================================================
+# CATALOG TESTS
+# ============================================================================
+
+
+class TestEntityCatalog:
+    """Test suite for the per-load entity indexes"""
+
+    def test_lookups(self, catalog, rooms):
+        """IDs are sorted; lookups accept both UI and model kind names"""
+        assert catalog.ids("room") == ["R100", "R200"]
+        assert catalog.get("room", "R200") is rooms[0]
+        assert catalog.get("12nc", "989606130501") is catalog.get("12NC", "989606130501")
+        assert catalog.get("room", "R999") is None
+        assert catalog.description("room", "R100") == "CT Room"
+        assert catalog.description("room", "R999") == ""
+        with pytest.raises(ValueError):
+            catalog.ids("building")
+
+    def test_sales_indexes(self, catalog):
+        """Date ranges, totals and years match the sales histories"""
+        assert catalog.date_range("room", "R200") == (date(2022, 6, 1), date(2024, 2, 1))
+        assert catalog.date_range("room", "R100") is None
+        assert catalog.lifetime_total("room", "R200") == 7
+        assert catalog.lifetime_total("room", "R100") == 0
+        assert catalog.years == [2021, 2022, 2024]
+        assert catalog.kind_years("room") == [2022, 2024]
+        assert catalog.years_of("room", ["R100", "R200", "R999"]) == [2022, 2024]
+        assert catalog.sale_count == 3
+        assert catalog.date_span() == (date(2021, 1, 5), date(2024, 2, 1))
+
+    def test_description_tokens(self, catalog):
+        assert catalog.tokens("12NC", "989606130501") == {"patient", "table", "rev", "b"}
+
+    def test_search(self, catalog):
+        """ID matches first, then description matches"""
+        assert catalog.search("room", "R1") == ["R100"]
+        assert catalog.search("room", "suite") == ["R200"]
+        assert catalog.search("12nc", "pat tab") == ["989606130501"]
+        assert catalog.matching_ids("room", "r") == {"R100", "R200"}
+
+    def test_matching_ids_keeps_substring_search(self, catalog):
+        """The bulk view filter still finds text inside words, as the old substring scan did"""
+        assert catalog.matching_ids("room", "uit") == {"R200"}
+        assert catalog.matching_ids("12nc", "ATIENT TAB") == {"989606130501"}
+        assert catalog.matching_ids("12nc", "table patient") == {"989606130501"}
+        assert catalog.matching_ids("room", "xyz") == set()
+
+    def test_empty(self):
+        catalog = EntityCatalog.empty()
+        assert catalog.ids("room") == [] and catalog.years == []
+        assert catalog.date_span() is None
+
+
+class TestPerformanceCenterCatalog:
+    """Test suite for the PerformanceCenter queries served by the catalog"""
+
+    def test_components_and_summary(self, rooms, nc12s):
+        center = PerformanceCenter(rooms, nc12s)
+        assert center.get_entity_components(G_entity(rooms[0], "room")) == {"989606130501": 1}
+        assert center.search_entities("ct", entity_type="room") == [rooms[1]]
+        stats = center.get_summary_stats()
+        assert stats["total_sales_records"] == 3
+        assert stats["total_rooms_in_cbom"] == 2
+        assert stats["date_range"]["earliest"] == date(2021, 1, 5)
@@ -0,0 +1,117 @@
+"""
+Memory Benchmark Suite
+Measures the footprint of the entity graph (Rooms and 12NCs with their sales
+histories) and of materialized SalesRecords on a synthetic 10M-sale dataset,
+with tracemalloc.
+
+Skipped by default (it peaks at about 550 MB of RAM); run it with
+    RUN_BENCHMARKS=1 python -m pytest -s tests/test_memory_benchmark.py
+It only uses APIs that predate the slotted models, so the same file can be run
+on an older checkout to compare footprints.
+"""
+
+import gc
+import os
+import sys
+import tracemalloc
+from datetime import date
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+import pytest
+
+from src.infrastructure.data_transformer import transform_bom
+from src.models import BillOfMaterials, GroupedSales
+
+pytestmark = pytest.mark.skipif(
+    not os.environ.get("RUN_BENCHMARKS"), reason="memory benchmark, set RUN_BENCHMARKS=1 to run"
+)
+
+N_SALES, N_ROOMS, N_NC12 = 10_000_000, 20_000, 60_000
+
+# Budgets: slotted, interned models measure 422 B/entity and 66 B/record;
+# the previous dict-based models took 471 B/entity and 137 B/record
+ENTITY_BYTES_BUDGET = 445
+RECORD_BYTES_BUDGET = 80
+
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+
+@pytest.fixture(scope="module")
+def synthetic_load():
+    """CBOM with 200k room-12NC pairs and 10M YMBD sales over about 7 years"""
+    rng = np.random.default_rng(1)
+    room_ids = [f"R{i:06d}" for i in range(N_ROOMS)]
+    nc12_ids = [f"{989600000000 + i}" for i in range(N_NC12)]
+    pairs = np.unique(np.stack([rng.integers(0, N_ROOMS, 200_000), rng.integers(0, N_NC12, 200_000)]), axis=1)
+    bom = BillOfMaterials.from_triples(
+        room_ids,
+        nc12_ids,
+        pairs[0],
+        pairs[1],
+        np.ones(pairs.shape[1]),
+        room_descriptions=["Room"] * N_ROOMS,
+        nc12_descriptions=["Part"] * N_NC12,
+        nc12_igts=[""] * N_NC12,
+    )
+    start = date(2019, 1, 1).toordinal()
+    sales = GroupedSales.from_codes(
+        rng.integers(0, N_NC12, N_SALES),
+        nc12_ids,
+        rng.integers(start, start + 2500, N_SALES),
+        rng.integers(1, 20, N_SALES),
+    )
+    return bom, sales
+
+
+def _traced(build):
+    """Run build under tracemalloc; returns (result, bytes still allocated)"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = build()
+        return result, tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+
+# ============================================================================
+# MEMORY BENCHMARKS
+# ============================================================================
+
+
+class TestMemoryFootprint:
+    """Benchmarks of the per-entity and per-record memory cost"""
+
+    def test_entity_graph(self, synthetic_load):
+        bom, sales = synthetic_load
+
+        def build():
+            rooms, nc12s = transform_bom(bom)
+            sales.attach(nc12s)
+            return rooms + nc12s
+
+        entities, graph_bytes = _traced(build)
+        per_entity = graph_bytes / len(entities)
+        print(
+            f"\nentity graph: {graph_bytes / 2**20:.1f} MiB for {len(entities)} entities "
+            f"({per_entity:.0f} B/entity; sales arrays of {sales.dates.nbytes + sales.quantities.nbytes:,} B shared)"
+        )
+        assert per_entity < ENTITY_BYTES_BUDGET
+
+    def test_materialized_records(self, synthetic_load):
+        bom, sales = synthetic_load
+        _, nc12s = transform_bom(bom)
+        sales.attach(nc12s)
+
+        records, record_bytes = _traced(lambda: [r for nc12 in nc12s[:2000] for r in nc12.sales_history])
+        per_record = record_bytes / len(records)
+        print(f"\n{len(records)} materialized records: {record_bytes / 2**20:.1f} MiB ({per_record:.0f} B/record)")
+        assert per_record < RECORD_BYTES_BUDGET
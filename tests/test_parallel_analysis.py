@@ -0,0 +1,140 @@
+"""
+Parallel Analysis Test Suite
+Tests the process pool over shared-memory sales arrays behind
+multi_item_analyze(workers > 1).
+"""
+
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import multiprocessing
+
+import numpy as np
+import pytest
+
+from src.analysis import PerformanceAnalyzer, parallel_analysis
+from src.analysis.parallel_analysis import _ranges, parallel_period_totals, period_block
+from src.models import G_entity, GroupedSales, SalesRecord, TwelveNC
+from src.services import EntityCatalog, PerformanceCenter
+from src.utils import SessionClock
+
+
+AS_OF = date(2025, 6, 15)
+
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+
+@pytest.fixture
+def nc12s():
+    """12NCs with random sales over five years, one without sales and one with only old sales"""
+    rng = np.random.default_rng(3)
+    nc12s = []
+    for n in range(40):
+        offsets = rng.integers(0, 5 * 366, size=int(rng.integers(1, 60)))
+        sales = [
+            SalesRecord(f"NC{n}", int(qty), AS_OF - timedelta(days=int(offset)))
+            for offset, qty in zip(offsets, rng.integers(0, 9, size=offsets.size))
+        ]
+        nc12s.append(TwelveNC(id=f"NC{n}", description="Part", igt="", components={}, sales_history=sales))
+    nc12s.append(TwelveNC(id="EMPTY", description="Part", igt="", components={}, sales_history=[]))
+    old = [SalesRecord("OLD", 5, date(2010, 1, 1))]
+    nc12s.append(TwelveNC(id="OLD", description="Part", igt="", components={}, sales_history=old))
+    return nc12s
+
+
+@pytest.fixture(autouse=True)
+def stop_pool():
+    """Each test starts without a pool or shared sales and leaves none behind"""
+    parallel_analysis.shutdown()
+    yield
+    parallel_analysis.shutdown()
+
+
+# ============================================================================
+# PARALLEL ANALYSIS TESTS
+# ============================================================================
+
+
+class TestParallelAnalysis:
+    """Test suite for the shared-memory process pool"""
+
+    def test_ranges_cover_all_entities(self):
+        offsets = np.array([0, 100, 100, 101, 300, 305, 900])
+        ranges = _ranges(offsets, 3)
+        assert ranges[0][0] == 0 and ranges[-1][1] == 6
+        assert all(a[1] == b[0] for a, b in zip(ranges, ranges[1:]))
+
+    def test_period_block(self):
+        dates = [date(2024, 1, 5), date(2024, 2, 5), date(2024, 2, 6)]
+        arrays = {
+            "dates": np.array([d.toordinal() for d in dates], dtype=np.int32),
+            "quantities": np.array([1, 2, 3]),
+            "offsets": np.array([0, 1, 1, 3]),
+        }
+        window = (date(2024, 1, 1), date(2024, 3, 31), "monthly")
+        quantities, present = period_block(arrays, np.arange(3), *window)
+        assert quantities.tolist() == [[1, 0, 0], [0, 0, 0], [0, 5, 0]]
+        assert present.tolist() == [[True, False, False], [False] * 3, [False, True, False]]
+        # Any rows, in any order
+        quantities, present = period_block(arrays, np.array([2, 0, 2]), *window)
+        assert quantities.tolist() == [[0, 5, 0], [1, 0, 0], [0, 5, 0]]
+
+    def test_same_as_serial(self, nc12s):
+        analyzer = PerformanceAnalyzer(clock=SessionClock(AS_OF))
+        g_entities = [G_entity(nc12, "12NC") for nc12 in nc12s]
+        serial = analyzer.multi_item_analyze(g_entities, 3, "quarterly")
+        parallel = analyzer.multi_item_analyze(g_entities, 3, "quarterly", workers=2)
+        assert list(parallel) == list(serial) == [f"NC{n}" for n in range(40)]
+        for entity_id, [expected] in serial.items():
+            [result] = parallel[entity_id]
+            assert result.periods == expected.periods
+            assert (result.total, result.average) == (expected.total, expected.average)
+        assert "OLD" not in parallel and parallel["NC0"][0].total > 0
+
+    def test_totals_shape(self, nc12s):
+        sales = GroupedSales.from_histories([nc12.id for nc12 in nc12s], [nc12.sales_history for nc12 in nc12s])
+        periods, quantities, present = parallel_period_totals(
+            sales, range(len(nc12s)), date(2021, 1, 1), date(2025, 6, 15), "yearly", workers=2
+        )
+        assert periods.tolist() == [2021, 2022, 2023, 2024, 2025]
+        assert quantities.shape == present.shape == (len(nc12s), 5)
+        assert quantities[-1].sum() == 0 and not present[-2].any()
+
+    def test_catalog_sales_same_as_serial(self, nc12s):
+        """Catalog entities are read from its flat arrays, the others are stacked per call"""
+        catalog = EntityCatalog([], nc12s[:30])
+        analyzer = PerformanceAnalyzer(cube_source=catalog, clock=SessionClock(AS_OF))
+        g_entities = [G_entity(nc12, "12NC") for nc12 in reversed(nc12s)]
+        serial = PerformanceAnalyzer(clock=SessionClock(AS_OF)).multi_item_analyze(g_entities, 2, "monthly")
+        parallel = analyzer.multi_item_analyze(g_entities, 2, "monthly", workers=2)
+        assert list(parallel) == list(serial)
+        assert all(parallel[key][0].periods == serial[key][0].periods for key in serial)
+        assert catalog.ids("12NC")[catalog.sales_row("12NC", nc12s[3])] == "NC3"
+        assert catalog.sales_row("12NC", nc12s[35]) is None
+        nc12s[3].sales_history = nc12s[4].sales_history
+        assert catalog.sales_row("12NC", nc12s[3]) is None
+
+    def test_pool_and_shared_sales_reused(self, nc12s):
+        """Later calls reuse the running pool and the shared copy of the catalog's sales"""
+        center = PerformanceCenter([], nc12s, clock=SessionClock(AS_OF))
+        g_entities = [G_entity(nc12, "12NC") for nc12 in nc12s]
+        first = center.analyze_multiple_entities(g_entities, 3, "yearly", workers=2)
+        pool, [(_, blocks, _)] = parallel_analysis._pool, parallel_analysis._shared
+        second = center.analyze_multiple_entities(g_entities[:5], 1, "quarterly", workers=2)
+        assert parallel_analysis._pool is pool and parallel_analysis._shared[0][1] is blocks
+        assert second["NC0"][0].total <= first["NC0"][0].total
+
+        # Another worker count restarts the pool; shutdown stops it
+        center.analyze_multiple_entities(g_entities[:5], 1, "quarterly", workers=3)
+        assert parallel_analysis._pool is not pool
+        parallel_analysis.shutdown()
+        assert parallel_analysis._pool is None and not parallel_analysis._shared
+        assert not multiprocessing.active_children()
@@ -0,0 +1,463 @@
+"""
+Parse Cache Test Suite
+Tests the on-disk cache of parsed CBOM/sales data (fingerprinting, round trips,
+invalidation, eviction), the serial / process-pool load pipeline and the
+background load with progress events and cancellation.
+"""
+
+import multiprocessing
+import os
+import sys
+import threading
+import time
+import zipfile
+from datetime import date
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.infrastructure import background_load, data_pipeline, parse_cache
+from src.infrastructure.background_load import BackgroundLoad
+from src.infrastructure.data_loaders import FileReadError
+from src.infrastructure.data_pipeline import LoadCancelled, load_dataset, parse_dataset
+from src.infrastructure.parse_cache import ParseCache, ParsedDataset, file_fingerprint
+from src.models.bom import BillOfMaterials
+from src.models.grouped_sales import GroupedSales
+from src.utils import spawn_pool, terminate_pool
+
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+
+@pytest.fixture
+def input_files(tmp_path):
+    """Three small input files"""
+    paths = {}
+    for name in ("cbom", "ymbd", "fit_cvi"):
+        path = tmp_path / f"{name}.csv"
+        path.write_text(f"{name} content\n")
+        paths[name] = str(path)
+    return paths
+
+
+@pytest.fixture
+def config():
+    return {"cbom": {"rows": {"12nc_start": 9}}, "ymbd": {}, "fit_cvi": {}, "validation": {}}
+
+
+@pytest.fixture
+def dataset():
+    bom = BillOfMaterials.from_triples(
+        ["R1", "R2"],
+        ["989606130501", "989606130502"],
+        room_codes=np.array([0, 1, 1]),
+        nc12_codes=np.array([0, 0, 1]),
+        quantities=np.array([2, 1, 5]),
+        room_descriptions=["Room 1", "Room 2"],
+        nc12_descriptions=["Cable", "Monitor"],
+        nc12_igts=["IGT1", ""],
+    )
+    d1, d2 = date(2024, 1, 15).toordinal(), date(2024, 3, 1).toordinal()
+    nc12_sales = GroupedSales.from_columns(
+        ["989606130502", "989606130501", "989606130502"], np.array([d2, d1, d1]), np.array([3, 4, 5])
+    )
+    room_sales = GroupedSales.from_columns(["R2"], np.array([d1]), np.array([1]))
+    return ParsedDataset(bom=bom, nc12_sales=nc12_sales, room_sales=room_sales)
+
+
+# ============================================================================
+# GROUPED SALES TESTS
+# ============================================================================
+
+
+class TestGroupedSales:
+    """Test suite for the columnar per-entity sales arrays"""
+
+    def test_grouped_by_entity_and_sorted_by_date(self, dataset):
+        """Groups follow first appearance, dates ascend inside each group"""
+        sales = dataset.nc12_sales
+
+        assert sales.ids == ["989606130502", "989606130501"]
+        dates, quantities = sales.get("989606130502")
+        assert [date.fromordinal(d) for d in dates.tolist()] == [date(2024, 1, 15), date(2024, 3, 1)]
+        assert quantities.tolist() == [5, 3]
+        assert sales.get("unknown")[0].size == 0
+
+    def test_attach_creates_sales_records(self, dataset):
+        """attach() fills sales_history of matching entities"""
+        _, nc12s = data_pipeline.transform_bom(dataset.bom)
+        matched = dataset.nc12_sales.attach(nc12s)
+
+        assert matched == (2, 3)
+        assert [r.quantity for r in nc12s[1].sales_history] == [5, 3]
+        assert nc12s[1].sales_history[0].identifier == "989606130502"
+
+
+# ============================================================================
+# PARSE CACHE TESTS
+# ============================================================================
+
+
+class TestParseCache:
+    """Test suite for cache keys, storage and eviction"""
+
+    def test_key_changes_with_content_and_config(self, tmp_path, input_files, config):
+        """Editing a file or a parse-relevant config section selects a new entry"""
+        cache = ParseCache(tmp_path / "cache")
+        key = cache.make_key(input_files, config)
+
+        assert cache.make_key(input_files, config) == key
+        assert cache.make_key(input_files, {**config, "last_files": {"cbom": "x"}}) == key
+
+        config["cbom"]["rows"]["12nc_start"] = 10
+        assert cache.make_key(input_files, config) != key
+        config["cbom"]["rows"]["12nc_start"] = 9
+
+        Path(input_files["ymbd"]).write_text("changed content\n")
+        assert cache.make_key(input_files, config) != key
+
+    def test_key_changes_with_parser_version(self, monkeypatch, tmp_path, input_files, config):
+        """Entries written by parsers with other rules are not reused"""
+        cache = ParseCache(tmp_path / "cache")
+        key = cache.make_key(input_files, config)
+        monkeypatch.setattr(parse_cache, "PARSER_VERSION", parse_cache.PARSER_VERSION + 1)
+
+        assert cache.make_key(input_files, config) != key
+
+    def test_fingerprint_tracks_content(self, input_files):
+        """Same size and path but different bytes give a different fingerprint"""
+        before = file_fingerprint(input_files["cbom"])
+        Path(input_files["cbom"]).write_text("CBOM content\n")
+        after = file_fingerprint(input_files["cbom"])
+
+        assert before["size"] == after["size"]
+        assert before["content"] != after["content"]
+
+    def test_store_and_load_round_trip(self, tmp_path, dataset):
+        """A stored dataset loads back with identical arrays and IDs"""
+        cache = ParseCache(tmp_path / "cache")
+        cache.store("abc", dataset)
+        loaded = cache.load("abc")
+
+        assert loaded.bom.room_ids == ["R1", "R2"]
+        assert loaded.bom.nc12_igts == ["IGT1", ""]
+        assert dict(loaded.bom.room_components("R2")) == {"989606130501": 1, "989606130502": 5}
+        assert loaded.nc12_sales.ids == dataset.nc12_sales.ids
+        assert np.array_equal(loaded.nc12_sales.dates, dataset.nc12_sales.dates)
+        assert np.array_equal(loaded.room_sales.quantities, dataset.room_sales.quantities)
+        assert cache.load("missing") is None
+
+    def test_unreadable_entry_is_discarded(self, tmp_path):
+        """A corrupt entry counts as a miss and is removed"""
+        cache = ParseCache(tmp_path / "cache")
+        cache.cache_dir.mkdir()
+        (cache.cache_dir / "bad.npz").write_bytes(b"not an archive")
+
+        assert cache.load("bad") is None
+        assert not (cache.cache_dir / "bad.npz").exists()
+
+    def test_eviction_and_invalidation(self, tmp_path, dataset):
+        """Least recently used entries beyond max_entries are evicted"""
+        cache = ParseCache(tmp_path / "cache", max_entries=2)
+        for age, key in enumerate(["old", "mid"]):
+            path = cache.store(key, dataset)
+            stamp = time.time() - 100 + age
+            os.utime(path, (stamp, stamp))
+        cache.store("new", dataset)
+
+        assert sorted(p.stem for p in cache._entries()) == ["mid", "new"]
+        assert cache.invalidate("mid") == 1
+        assert cache.invalidate() == 1
+        assert cache._entries() == []
+
+    def test_evict_skips_vanished_entries(self, monkeypatch, tmp_path, dataset):
+        """An entry removed by someone else during eviction is skipped"""
+        cache = ParseCache(tmp_path / "cache")
+        path = cache.store("old", dataset)
+        cache.max_entries = 0
+        monkeypatch.setattr(cache, "_entries", lambda: [cache.cache_dir / "gone.npz", path])
+
+        assert cache.evict() == 1
+        assert not path.exists()
+
+
+# ============================================================================
+# LOAD PIPELINE TESTS
+# ============================================================================
+
+
+class TestLoadDataset:
+    """Test suite for cached loading of Rooms and 12NCs"""
+
+    def test_second_load_skips_parsing(self, monkeypatch, tmp_path, input_files, config, dataset):
+        """Unchanged files are parsed once, changed files are parsed again"""
+        calls = []
+
+        def fake_parse(file_paths, config, *args, **kwargs):
+            calls.append(file_paths)
+            return dataset
+
+        monkeypatch.setattr(data_pipeline, "parse_dataset", fake_parse)
+        cache = ParseCache(tmp_path / "cache")
+
+        rooms, nc12s = load_dataset(input_files, config, cache=cache)
+        rooms_again, _ = load_dataset(input_files, config, cache=cache)
+        assert len(calls) == 1
+        assert [r.id for r in rooms_again] == [r.id for r in rooms]
+        assert rooms_again[1].sales_history[0].quantity == 1
+        assert nc12s[0].components["R2"] == 1
+
+        Path(input_files["fit_cvi"]).write_text("new sales\n")
+        load_dataset(input_files, config, cache=cache)
+        assert len(calls) == 2
+
+    def test_incomplete_parse_is_not_cached(self, monkeypatch, tmp_path, input_files, config, dataset):
+        """A load with an unreadable sales file is not reused"""
+        dataset.complete = False
+        monkeypatch.setattr(data_pipeline, "parse_dataset", lambda *args, **kwargs: dataset)
+        cache = ParseCache(tmp_path / "cache")
+
+        load_dataset(input_files, config, cache=cache)
+        assert cache._entries() == []
+
+
+# ============================================================================
+# PARSE ORCHESTRATION TESTS
+# ============================================================================
+
+
+@pytest.fixture
+def real_files(tmp_path):
+    """CBOM, YMBD and FIT_CVI files small enough for the parsers, plus their config"""
+    cbom = np.full((10, 8), "", dtype=object)
+    cbom[3, 6:8] = ["Cath Lab", "Hybrid OR"]
+    cbom[4, 6:8] = ["R100", "R200"]
+    cbom[8, [2, 3, 6, 7]] = ["989606130501", "Cable", "2", "1"]
+    cbom[9, [2, 3, 7]] = ["989606130502", "Monitor", "4"]
+    paths = {"cbom": tmp_path / "cbom.csv", "ymbd": tmp_path / "ymbd.csv", "fit_cvi": tmp_path / "fit.csv"}
+    pd.DataFrame(cbom).to_csv(paths["cbom"], header=False, index=False)
+    pd.DataFrame(
+        {"Component": ["989606130502", "989606130501"], "Date": ["2024-02-01", "2024-01-01"], "Qty": [5, 2]}
+    ).to_csv(paths["ymbd"], index=False)
+    pd.DataFrame({"Room": ["R200"], "Date": ["2024-03-01"], "Qty": [1]}).to_csv(paths["fit_cvi"], index=False)
+
+    config = {
+        "cbom": {
+            "columns": {"room_start": "G", "12nc": "C", "12nc_description": "D", "IGT_12nc": "A"},
+            "rows": {"room_numbers": 5, "room_descriptions": 4, "12nc_start": 9},
+        },
+        "ymbd": {"columns": {"12nc": "Component", "date": "Date", "sales": "Qty"}, "date_format": "YYYY-MM-DD"},
+        "fit_cvi": {"columns": {"room": "Room", "date": "Date", "sales": "Qty"}, "date_format": "YYYY-MM-DD"},
+        "validation": {"patterns": {"room_normalized": r"^[A-Z0-9]+$", "12nc_normalized": r"^\d{12}$"}},
+    }
+    return {name: str(path) for name, path in paths.items()}, config
+
+
+class TestParseDataset:
+    """Test suite for the serial and process-pool parse paths"""
+
+    def test_parallel_matches_serial(self, real_files):
+        """Worker payloads rebuild the same store and sales arrays"""
+        paths, config = real_files
+        serial = parse_dataset(paths, config)
+        parallel = parse_dataset(paths, config, parallel=True)
+
+        for dataset in (serial, parallel):
+            assert dataset.bom.room_ids == ["R100", "R200"]
+            assert dict(dataset.bom.room_components("R200")) == {"989606130501": 1, "989606130502": 4}
+            assert dataset.nc12_sales.ids == ["989606130502", "989606130501"]
+            assert dataset.room_sales.get("R200")[1].tolist() == [1]
+            assert dataset.complete
+        assert [r.parsed_rows for r in parallel.reports] == [2, 1]
+
+    def test_unreadable_sales_file_reported(self, real_files):
+        """A missing sales file is passed to on_error and the load continues"""
+        paths, config = real_files
+        paths["fit_cvi"] = paths["fit_cvi"] + ".missing"
+        errors = []
+        dataset = parse_dataset(paths, config, on_error=errors.append)
+
+        assert [e.title for e in errors] == ["File Not Found"]
+        assert len(dataset.room_sales) == 0
+        assert not dataset.complete
+
+    @pytest.mark.parametrize("parallel", [False, True])
+    def test_corrupt_streamed_workbook_reported(self, tmp_path, real_files, parallel):
+        """A workbook that breaks mid-stream is an unreadable sales file, not a failed load"""
+        paths, config = real_files
+        sales = pd.DataFrame({"Component": ["989606130501"] * 5, "Date": ["2024-01-01"] * 5, "Qty": [2] * 5})
+        sales.to_excel(tmp_path / "ymbd_ok.xlsx", index=False)
+        # Cut the sheet XML inside the second row: the header probe passes, the rows don't
+        source = zipfile.ZipFile(tmp_path / "ymbd_ok.xlsx")
+        with source, zipfile.ZipFile(tmp_path / "ymbd.xlsx", "w") as target:
+            for item in source.infolist():
+                data = source.read(item.filename)
+                if item.filename == "xl/worksheets/sheet1.xml":
+                    data = data[: data.index(b"</row>") + 30]
+                target.writestr(item, data)
+        paths["ymbd"] = str(tmp_path / "ymbd.xlsx")
+        config["ymbd"]["excel_reader"] = "read_only"
+        errors = []
+        dataset = parse_dataset(paths, config, on_error=errors.append, parallel=parallel)
+
+        assert [e.title for e in errors] == ["Error"]
+        assert len(dataset.nc12_sales) == 0 and len(dataset.room_sales) == 1
+        assert not dataset.complete
+
+    def test_unreadable_cbom_raises(self, real_files):
+        """Without a CBOM there is nothing to load"""
+        paths, config = real_files
+        paths["cbom"] = paths["cbom"] + ".missing"
+
+        with pytest.raises(FileReadError):
+            parse_dataset(paths, config, parallel=True)
+
+    def test_progress_and_row_counts(self, real_files):
+        """Stages report increasing progress, sales files report rows read"""
+        paths, config = real_files
+        config["ymbd"]["chunk_size"] = 1
+        stages, rows = [], []
+        load_dataset(
+            paths,
+            config,
+            parallel=False,
+            on_stage=lambda *args: stages.append(args),
+            on_rows=lambda *args: rows.append(args),
+        )
+
+        progress = [fraction for _, fraction in stages]
+        assert progress == sorted(progress)
+        assert stages[-1] == ("Processing data...", data_pipeline.PARSE_PROGRESS)
+        assert rows == [("ymbd", 1), ("ymbd", 2), ("fit_cvi", 1)]
+
+    @pytest.mark.parametrize("parallel", [False, True])
+    def test_cancelled_load_raises(self, real_files, parallel):
+        """A set cancel event stops the load before any entity is built"""
+        paths, config = real_files
+        cancel_event = threading.Event()
+        cancel_event.set()
+
+        with pytest.raises(LoadCancelled):
+            load_dataset(paths, config, parallel=parallel, cancel_event=cancel_event)
+
+    def test_parallel_cancel_stops_workers(self, real_files):
+        """Cancelling a parallel parse waits for the pool instead of orphaning its workers"""
+        paths, config = real_files
+        cancel_event = threading.Event()
+
+        with pytest.raises(LoadCancelled):
+            parse_dataset(
+                paths, config, on_stage=lambda *args: cancel_event.set(), parallel=True, cancel_event=cancel_event
+            )
+        assert multiprocessing.active_children() == []
+
+    def test_cancel_does_not_wait_for_a_long_read(self):
+        """Workers busy in one long call (a CBOM sheet read) are killed, not awaited"""
+        pool = spawn_pool(1)
+        future = pool.submit(time.sleep, 60)
+        while not future.running():
+            time.sleep(0.05)
+        started = time.perf_counter()
+        terminate_pool(pool)
+
+        assert time.perf_counter() - started < 10
+        assert multiprocessing.active_children() == []
+
+    def test_cbom_checks_cancel_before_parsing(self, real_files):
+        """A CBOM read in a cancelled load is not parsed"""
+        paths, config = real_files
+        cancel_event = threading.Event()
+        cancel_event.set()
+
+        with pytest.raises(LoadCancelled):
+            data_pipeline.parse_file("cbom", paths["cbom"], config, cancel_event=cancel_event)
+
+    def test_worker_stops_at_next_chunk(self, monkeypatch, real_files):
+        """A parse worker checks the shared cancel event per chunk"""
+        paths, config = real_files
+        config["ymbd"]["chunk_size"] = 1
+        cancel_event = threading.Event()
+        cancel_event.set()
+        monkeypatch.setattr(data_pipeline, "_worker_progress", None)
+        monkeypatch.setattr(data_pipeline, "_worker_cancel", cancel_event)
+
+        with pytest.raises(LoadCancelled):
+            data_pipeline._parse_file_payload("ymbd", paths["ymbd"], config)
+
+    def test_cancel_between_chunks(self, real_files):
+        """Cancelling while a sales file streams stops at the next chunk"""
+        paths, config = real_files
+        config["ymbd"]["chunk_size"] = 1
+        cancel_event = threading.Event()
+
+        with pytest.raises(LoadCancelled):
+            parse_dataset(paths, config, on_rows=lambda *args: cancel_event.set(), cancel_event=cancel_event)
+
+
+# ============================================================================
+# BACKGROUND LOAD TESTS
+# ============================================================================
+
+
+class TestBackgroundLoad:
+    """Test suite for the threaded load and its event queue"""
+
+    def _events(self, load):
+        load.join(timeout=30)
+        assert not load.running
+        return load.poll()
+
+    def test_events_end_with_done(self, real_files):
+        """Stage events arrive in order and the result is posted last"""
+        paths, config = real_files
+        config["loading"] = {"parallel": False}
+        events = self._events(BackgroundLoad(paths, config).start())
+
+        kinds = [event.kind for event in events]
+        assert kinds[0] == "stage" and kinds[-1] == "done"
+        assert "rows" in kinds
+        catalog = events[-1].payload
+        assert catalog.ids("room") == ["R100", "R200"]
+        assert [r.quantity for r in catalog.get("12NC", "989606130501").sales_history] == [2]
+        assert ("stage", "Indexing entities...") in [(e.kind, e.message) for e in events]
+        assert events[-1].progress == 1.0
+
+    def test_failure_and_sales_errors_posted(self, real_files):
+        """Unreadable sales files are posted as errors, an unreadable CBOM fails the load"""
+        paths, config = real_files
+        config["loading"] = {"parallel": False}
+        paths["ymbd"] = paths["ymbd"] + ".missing"
+        events = self._events(BackgroundLoad(paths, config).start())
+        assert [e.kind for e in events if e.kind in ("error", "done")] == ["error", "done"]
+
+        paths["cbom"] = paths["cbom"] + ".missing"
+        events = self._events(BackgroundLoad(paths, config).start())
+        assert events[-1].kind == "failed"
+        assert isinstance(events[-1].payload, FileReadError)
+
+    def test_cancel(self, monkeypatch, real_files):
+        """cancel() ends the load with a 'cancelled' event"""
+        paths, config = real_files
+        started = threading.Event()
+
+        def slow_load(*args, cancel_event, **kwargs):
+            started.set()
+            while not cancel_event.wait(0.01):
+                pass
+            raise LoadCancelled()
+
+        monkeypatch.setattr(background_load, "load_dataset", slow_load)
+        load = BackgroundLoad(paths, config).start()
+        assert started.wait(5)
+        assert load.running
+        load.cancel()
+
+        assert [event.kind for event in self._events(load)] == ["cancelled"]
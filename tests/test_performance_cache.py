@@ -0,0 +1,89 @@
+"""
+Performance Cache Test Suite
+Tests the LRU of PerformanceData in front of PerformanceAnalyzer.analyze and
+its invalidation by data loads.
+"""
+
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import pytest
+
+from src.analysis import PerformanceAnalyzer
+from src.analysis.performance_cache import PerformanceCache
+from src.models import G_entity, Room, SalesHistory, SalesRecord
+from src.services import EntityCatalog
+
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+
+def _rooms():
+    today = datetime.now().date()
+    return [
+        Room(
+            id=f"R{n}",
+            description="Room",
+            components={},
+            sales_history=[SalesRecord(f"R{n}", n + 1, today - timedelta(days=30 * k)) for k in range(10)],
+        )
+        for n in range(3)
+    ]
+
+
+@pytest.fixture
+def rooms():
+    return _rooms()
+
+
+@pytest.fixture
+def analyzer(rooms):
+    return PerformanceAnalyzer(cube_source=EntityCatalog(rooms, []), cache=PerformanceCache(max_entries=2))
+
+
+# ============================================================================
+# CACHE TESTS
+# ============================================================================
+
+
+class TestPerformanceCache:
+    """Test suite for memoized analyses"""
+
+    def test_hits_and_key(self, analyzer, rooms):
+        first = analyzer.analyze(G_entity(rooms[0], "room"), 3, "monthly")
+        assert analyzer.analyze(G_entity(rooms[0], "room"), 3, "monthly") is first
+        assert analyzer.analyze(G_entity(rooms[0], "room"), 3, "quarterly") is not first
+        assert analyzer.analyze(G_entity(rooms[0], "room"), 2, "monthly") is not first
+        stats = analyzer.cache.stats
+        assert (stats.hits, stats.misses) == (1, 3)
+
+    def test_lru_eviction(self, analyzer, rooms):
+        for room in rooms:
+            analyzer.analyze(G_entity(room, "room"))
+        assert len(analyzer.cache) == 2 and analyzer.cache.stats.evictions == 1
+        analyzer.analyze(G_entity(rooms[0], "room"))
+        assert analyzer.cache.stats.hits == 0
+
+    def test_new_load_invalidates(self, analyzer, rooms):
+        cached = analyzer.analyze(G_entity(rooms[0], "room"))
+        reloaded = _rooms()
+        analyzer.cube_source = EntityCatalog(reloaded, [])
+        assert analyzer.analyze(G_entity(reloaded[0], "room")) is not cached
+        assert analyzer.cache.stats.invalidations == 2 and len(analyzer.cache) == 1
+
+    def test_replaced_sales_are_not_served(self, analyzer, rooms):
+        analyzer.analyze(G_entity(rooms[0], "room"))
+        rooms[0].sales_history = SalesHistory.from_records(rooms[0].sales_history[:3])
+        assert analyzer.analyze(G_entity(rooms[0], "room")).total == 3
+
+    def test_no_versioned_source_no_cache(self, rooms):
+        analyzer = PerformanceAnalyzer(cache=PerformanceCache())
+        analyzer.analyze(G_entity(rooms[0], "room"))
+        assert len(analyzer.cache) == 0 and analyzer.cache.stats.misses == 0
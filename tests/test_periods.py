@@ -0,0 +1,111 @@
+"""
+Period Number Test Suite
+Tests the integer monthly / quarterly / yearly periods behind the analyzer,
+the charts and the predictor.
+"""
+
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+import pytest
+
+from src.analysis import Predictor
+from src.models import G_entity, PerformanceData, Room, TimePeriod
+from src.utils.date_utils import get_period_key, parse_period_label_for_sorting
+from src.utils.periods import (
+    GRANULARITIES,
+    format_period,
+    format_period_ui,
+    parse_period,
+    period_of,
+    period_start,
+    period_year,
+    periods_of,
+    same_period_last_year,
+)
+
+
+# ============================================================================
+# PERIOD ARITHMETIC TESTS
+# ============================================================================
+
+
+class TestPeriods:
+    """Test suite for period numbers and their labels"""
+
+    @pytest.mark.parametrize("granularity", GRANULARITIES)
+    def test_labels_round_trip(self, granularity):
+        """Labels are the get_period_key ones and sort like the numbers"""
+        days = [date(1999, 12, 31) + timedelta(days=n) for n in range(0, 10_000, 37)]
+        periods = [period_of(day, granularity) for day in days]
+        labels = [format_period(period, granularity) for period in periods]
+        assert labels == [get_period_key(day, granularity) for day in days]
+        assert [parse_period(label, granularity) for label in labels] == periods
+        assert sorted(labels, key=parse_period_label_for_sorting) == [
+            format_period(period, granularity) for period in sorted(periods)
+        ]
+
+    @pytest.mark.parametrize("granularity", GRANULARITIES)
+    def test_vectorized(self, granularity):
+        days = [date(2023, 1, 1) + timedelta(days=n) for n in range(0, 800, 11)]
+        ordinals = np.array([day.toordinal() for day in days])
+        assert periods_of(ordinals, granularity).tolist() == [period_of(day, granularity) for day in days]
+
+    def test_arithmetic(self):
+        march = period_of(date(2024, 3, 15), "monthly")
+        assert format_period(march + 10, "monthly") == "01-2025"
+        assert format_period(same_period_last_year(march, "monthly"), "monthly") == "03-2023"
+        q4 = parse_period("2024-Q4", "quarterly")
+        assert format_period(q4 + 1, "quarterly") == "2025-Q1"
+        assert period_start(q4, "quarterly") == date(2024, 10, 1)
+        assert (period_year(q4, "quarterly"), format_period_ui(q4, "quarterly")) == (2024, "Q4")
+        assert format_period_ui(march, "monthly") == "Mar"
+        assert same_period_last_year(2024, "yearly") == 2023
+
+    def test_invalid_labels(self):
+        for label, granularity in [("13-2024", "monthly"), ("2024-Q5", "quarterly"), ("2024", "monthly"), ("x", "yearly")]:
+            with pytest.raises(ValueError):
+                parse_period(label, granularity)
+        with pytest.raises(ValueError):
+            parse_period("2024", "weekly")
+
+
+# ============================================================================
+# PREDICTOR TESTS
+# ============================================================================
+
+
+class TestSamePeriodPrediction:
+    """Test suite for same-period-previous-years predictions on period numbers"""
+
+    def _performance(self, granularity, quantities):
+        room = Room(id="R1", description="Room", components={}, sales_history=[])
+        periods = [
+            TimePeriod(label=format_period(index, granularity), quantity=qty, index=index)
+            for index, qty in quantities.items()
+        ]
+        total = sum(quantities.values())
+        return PerformanceData(G_entity(room, "room"), periods, granularity, total, total / len(periods))
+
+    def test_quarterly_matches_the_target_quarter(self):
+        quarters = {parse_period(label, "quarterly"): qty for label, qty in
+                    [("2023-Q1", 10), ("2023-Q2", 100), ("2024-Q1", 30), ("2024-Q2", 200)]}
+        predictor = Predictor(self._performance("quarterly", quarters))
+        assert predictor._predict_avg_same_period_previous_years("2099-Q2", "quarterly") == 150
+        assert predictor._predict_avg_same_period_previous_years("2099-Q3", "quarterly") == 85
+
+    def test_monthly_and_future_validation(self):
+        today = date.today()
+        current = period_of(today, "monthly")
+        months = {current - 12: 4, current - 24: 8, current - 1: 50}
+        predictor = Predictor(self._performance("monthly", months))
+        target = format_period(current + 12, "monthly")
+        assert predictor.predict(target, "avg_same_period_previous_years", 0).baseline == 6
+        with pytest.raises(ValueError):
+            predictor.predict(format_period(current, "monthly"))
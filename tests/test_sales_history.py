@@ -0,0 +1,182 @@
+"""
+Sales History Test Suite
+Tests the columnar, date-sorted SalesHistory of Room / TwelveNC objects and its
+SalesRecord compatibility.
+"""
+
+import sys
+from datetime import date
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+import pytest
+
+from src.models import GroupedSales, Room, SalesHistory, SalesRecord, TwelveNC
+from src.models.mapping import validate_entity_fields
+
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+
+@pytest.fixture
+def records():
+    """Unsorted records of one entity"""
+    return [
+        SalesRecord(identifier="R100", quantity=5, date=date(2024, 3, 1)),
+        SalesRecord(identifier="R100", quantity=2, date=date(2023, 12, 31)),
+        SalesRecord(identifier="R100", quantity=7, date=date(2024, 1, 15)),
+    ]
+
+
+@pytest.fixture
+def history(records):
+    return SalesHistory.from_records(records)
+
+
+# ============================================================================
+# SALES HISTORY TESTS
+# ============================================================================
+
+
+class TestSalesHistory:
+    """Test suite for the array-backed history"""
+
+    def test_sorted_compact_arrays(self, history):
+        """Sales are sorted by date and stored in 12 bytes each"""
+        assert history.identifier == "R100"
+        assert [date.fromordinal(d) for d in history.dates.tolist()] == [
+            date(2023, 12, 31),
+            date(2024, 1, 15),
+            date(2024, 3, 1),
+        ]
+        assert history.quantities.tolist() == [2, 7, 5]
+        assert history.nbytes == 12 * len(history)
+
+    def test_records_view(self, history, records):
+        """Indexing and iteration yield SalesRecords equal to the originals"""
+        assert all(isinstance(record, SalesRecord) for record in history)
+        assert history[0] == records[1]
+        assert history[-1].quantity == 5
+        assert history == sorted(records, key=lambda r: r.date)
+        with pytest.raises(IndexError):
+            history[3]
+
+    def test_slices_and_aggregates(self, history):
+        """Slices stay SalesHistory objects; aggregates run on the arrays"""
+        tail = history[1:]
+        assert isinstance(tail, SalesHistory)
+        assert [r.quantity for r in tail] == [7, 5]
+        assert history.total_quantity() == 14
+        assert history.years() == [2023, 2024]
+        assert (history.first_date, history.last_date) == (date(2023, 12, 31), date(2024, 3, 1))
+        assert SalesHistory("X").years() == [] and SalesHistory("X").first_date is None
+
+    def test_reversed_slices_keep_their_order(self, history):
+        """A negative step returns the records in the requested (reversed) order"""
+        assert history[::-1] == list(reversed(list(history)))
+        assert [r.quantity for r in history[:0:-1]] == [5, 7]
+        assert [r.quantity for r in history[::-2]] == [5, history[0].quantity]
+
+    def test_validation(self):
+        with pytest.raises(ValueError, match="negative"):
+            SalesHistory("R1", np.array([1, 2]), np.array([1, -1]))
+        with pytest.raises(ValueError):
+            SalesHistory("R1", np.array([1, 2]), np.array([1]))
+
+    def test_mixed_identifiers_kept(self, records):
+        """Records of different identifiers keep their own identifier"""
+        records[0] = SalesRecord(identifier="R200", quantity=5, date=date(2024, 3, 1))
+        history = SalesHistory.from_records(records)
+        assert [r.identifier for r in history] == ["R100", "R100", "R200"]
+
+
+class TestDateRangeQueries:
+    """Test suite for binary-searched windows and prefix-sum totals"""
+
+    def test_window_bounds_inclusive(self, history):
+        """Both ends of the range are included; None leaves a side open"""
+        window = history.window(date(2023, 12, 31), date(2024, 1, 15))
+        assert isinstance(window, SalesHistory)
+        assert window.quantities.tolist() == [2, 7]
+        assert np.shares_memory(window.dates, history.dates)
+        assert history.window(date(2024, 1, 16)).quantities.tolist() == [5]
+        assert len(history.window(date(2025, 1, 1), date(2024, 1, 1))) == 0
+
+    def test_totals_match_linear_scan(self):
+        """total_between / totals_between agree with summing the records"""
+        rng = np.random.default_rng(0)
+        start = date(2020, 1, 1).toordinal()
+        history = SalesHistory("R1", rng.integers(start, start + 1500, 500), rng.integers(0, 50, 500))
+        starts = rng.integers(start - 10, start + 1500, 50)
+        ends = starts + rng.integers(-5, 400, 50)
+
+        expected = [
+            sum(r.quantity for r in history if s <= r.date.toordinal() <= e)
+            for s, e in zip(starts.tolist(), ends.tolist())
+        ]
+        assert history.totals_between(starts, ends).tolist() == expected
+        assert [
+            history.total_between(date.fromordinal(s), date.fromordinal(e))
+            for s, e in zip(starts.tolist(), ends.tolist())
+        ] == expected
+        assert history.total_between() == history.total_quantity() == int(history.quantities.sum())
+
+    def test_filter_sales_by_date(self, records):
+        room = Room(id="R100", description="Room", components={}, sales_history=records)
+        assert room.filter_sales_by_date(date(2024, 1, 1), date(2024, 12, 31)) == {"R100": records[0]}
+        assert room.filter_sales_by_date(date(2022, 1, 1), date(2022, 12, 31)) == {}
+
+
+class TestEntitySalesHistory:
+    """Test suite for entities holding a SalesHistory"""
+
+    def test_list_converted(self, records):
+        """Entities built with a list of records get a SalesHistory"""
+        room = Room(id="R100", description="Room", components={}, sales_history=records)
+        assert isinstance(room.sales_history, SalesHistory)
+        assert len(room.sales_history) == 3
+        assert Room(id="R1", description="Room", components={}, sales_history=[]).sales_history == []
+
+    def test_attach_shares_arrays(self, records):
+        """attach() gives entities views of the grouped arrays and merges existing sales"""
+        sales = GroupedSales.from_columns(
+            ["R100", "R200", "R100"],
+            np.array([date(2024, 5, 1).toordinal()] * 3),
+            np.array([1, 2, 3]),
+        )
+        fresh = Room(id="R200", description="Room", components={}, sales_history=[])
+        existing = Room(id="R100", description="Room", components={}, sales_history=records)
+
+        assert sales.attach([fresh, existing]) == (2, 3)
+        assert np.shares_memory(fresh.sales_history.dates, sales.dates)
+        assert existing.sales_history.quantities.tolist() == [2, 7, 5, 1, 3]
+        assert GroupedSales.from_entities([fresh, existing]).record_count == 6
+
+
+class TestCompactModels:
+    """Test suite for slotted models, interned IDs and ingest-time validation"""
+
+    def test_slotted(self, history):
+        room = Room.trusted("R100", "Room", {}, history)
+        for obj in (room, history[0], SalesRecord("R1", 1, date(2024, 1, 1))):
+            assert not hasattr(obj, "__dict__")
+
+    def test_records_share_identifier_and_dates(self, history):
+        """Records of one history share the ID string and one date object per day"""
+        built_id = "".join(["R", "100"])
+        first, second = SalesHistory(built_id, history.dates, history.quantities), list(history)
+        assert first[0].identifier is second[0].identifier
+        assert first[0].date is second[0].date
+
+    def test_batch_validation(self):
+        validate_entity_fields("Room", ["R1", "R2"], ["a", "b"])
+        with pytest.raises(ValueError, match="Room description cannot be empty"):
+            validate_entity_fields("Room", ["R1", "R2"], ["a", ""])
+        with pytest.raises(ValueError, match="12NC cannot be empty"):
+            TwelveNC(id="", description="Part", igt="", components={}, sales_history=[])
@@ -0,0 +1,298 @@
+"""
+Sales Parsing Test Suite
+Tests the column-wise YMBD / FIT_CVI parsers and their aggregated skip reports
+on small synthetic DataFrames.
+"""
+
+import sys
+from datetime import date
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.infrastructure import data_loaders, data_transformer
+from src.infrastructure.data_transformer import (
+    parse_fit_cvi_sales,
+    parse_fit_cvi_to_sales_records,
+    parse_ymbd_sales,
+    parse_ymbd_to_sales_records,
+)
+from src.models.mapping import Room, TwelveNC
+
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+
+@pytest.fixture
+def sales_config():
+    return {
+        "ymbd": {
+            "columns": {
+                "12nc": "Component",
+                "date": "Confirmed Delivery Date",
+                "sales": "Component Quantity",
+            },
+            "date_format": "YYYY-MM-DD HH:MM:SS",
+        },
+        "fit_cvi": {
+            "columns": {"room": "Room", "date": "Date", "sales": "Qty"},
+            "date_format": "DD-MMM-YYYY",
+        },
+    }
+
+
+@pytest.fixture
+def ymbd_df():
+    """Valid rows in three date formats plus one row per skip reason"""
+    return pd.DataFrame(
+        {
+            "Component": [
+                989606130501.0,
+                "9896-0613-0502",
+                "989606130501",
+                None,
+                "12345",
+                "989606130502",
+                "989606130502",
+                "989606130501",
+            ],
+            "Confirmed Delivery Date": [
+                "2024-03-01 00:00:00",
+                "2024-01-05",
+                "01-15-2024",
+                "2024-01-01 00:00:00",
+                "2024-01-01 00:00:00",
+                "not a date",
+                "2024-02-01 00:00:00",
+                "2024-02-01 00:00:00",
+            ],
+            "Component Quantity": [2, "3", 4.0, 1, 1, 1, "n/a", -1],
+        }
+    )
+
+
+# ============================================================================
+# YMBD PARSER TESTS
+# ============================================================================
+
+
+class TestParseYmbdSales:
+    """Test suite for the column-wise YMBD parser"""
+
+    def test_grouped_sorted_arrays(self, ymbd_df, sales_config):
+        """Valid rows are grouped per normalized 12NC with dates ascending"""
+        sales, _ = parse_ymbd_sales(ymbd_df, sales_config)
+
+        assert sales.ids == ["989606130501", "989606130502"]
+        dates, quantities = sales.get("989606130501")
+        assert [date.fromordinal(d) for d in dates.tolist()] == [date(2024, 1, 15), date(2024, 3, 1)]
+        assert quantities.tolist() == [4, 2]
+        assert sales.get("989606130502")[1].tolist() == [3]
+
+    def test_skip_report(self, ymbd_df, sales_config):
+        """Every dropped row is counted once under its first failing check"""
+        _, report = parse_ymbd_sales(ymbd_df, sales_config)
+
+        assert report.total_rows == 8
+        assert report.parsed_rows == 3
+        assert report.skipped == {
+            "missing_id": 1,
+            "invalid_id": 1,
+            "invalid_date": 1,
+            "invalid_quantity": 2,
+        }
+        assert report.examples["invalid_date"] == ["not a date"]
+        assert report.fallback_formats == {"%Y-%m-%d": 1, "%m-%d-%Y": 1}
+        assert "3 parsed" in report.summary()
+
+    def test_datetime_column(self, sales_config):
+        """Columns already read as datetimes skip string parsing"""
+        df = pd.DataFrame(
+            {
+                "Component": ["989606130501"] * 2,
+                "Confirmed Delivery Date": pd.to_datetime(["2024-05-02 13:30", "2023-12-31 00:00"]),
+                "Component Quantity": [1, 2],
+            }
+        )
+        sales, report = parse_ymbd_sales(df, sales_config)
+
+        assert report.skipped == {}
+        assert [date.fromordinal(d) for d in sales.dates.tolist()] == [
+            date(2023, 12, 31),
+            date(2024, 5, 2),
+        ]
+
+    def test_missing_column(self, ymbd_df, sales_config):
+        """A misconfigured column name skips the whole file with one reason"""
+        sales_config["ymbd"]["columns"]["sales"] = "Qty"
+        sales, report = parse_ymbd_sales(ymbd_df, sales_config)
+
+        assert len(sales) == 0
+        assert report.skipped == {"missing_column": 8}
+        assert report.examples["missing_column"] == ["Qty"]
+
+    def test_records_attached_to_twelve_ncs(self, monkeypatch, ymbd_df, sales_config):
+        """The list-based API still fills sales_history with SalesRecords"""
+        monkeypatch.setattr(data_transformer, "get_config", lambda *args: sales_config)
+        nc12s = [
+            TwelveNC(id=nc12_id, description="Part", igt="", components={}, sales_history=[])
+            for nc12_id in ("989606130501", "989606130502", "989606130599")
+        ]
+        parse_ymbd_to_sales_records(nc12s, ymbd_df)
+
+        assert [(r.date, r.quantity) for r in nc12s[0].sales_history] == [
+            (date(2024, 1, 15), 4),
+            (date(2024, 3, 1), 2),
+        ]
+        assert nc12s[1].sales_history[0].identifier == "989606130502"
+        assert nc12s[2].sales_history == []
+
+
+# ============================================================================
+# FIT_CVI PARSER TESTS
+# ============================================================================
+
+
+class TestParseFitCviSales:
+    """Test suite for the column-wise FIT_CVI parser"""
+
+    @pytest.fixture
+    def fit_df(self):
+        return pd.DataFrame(
+            {
+                "Room": ["R-100", "R 100", "R_200", " ", np.nan, "R200"],
+                "Date": ["05-Mar-2024", "2024-01-02 00:00:00", "07-Feb-2024", "07-Feb-2024", "07-Feb-2024", "31-02-2024"],
+                "Qty": [1, 2, 3, 1, 1, 1],
+            }
+        )
+
+    def test_rooms_grouped_and_fallbacks_aggregated(self, fit_df, sales_config, capsys):
+        """Any non-empty room ID is accepted; fallback dates are counted, not printed"""
+        sales, report = parse_fit_cvi_sales(fit_df, sales_config)
+
+        assert sales.ids == ["R100", "R200"]
+        assert sales.get("R100")[1].tolist() == [2, 1]
+        assert report.skipped == {"missing_id": 1, "invalid_id": 1, "invalid_date": 1}
+        assert report.fallback_formats == {"%Y-%m-%d %H:%M:%S": 1}
+        assert capsys.readouterr().out == ""
+
+    def test_records_attached_to_rooms(self, monkeypatch, fit_df, sales_config):
+        """The list-based API still fills Room.sales_history"""
+        monkeypatch.setattr(data_transformer, "get_config", lambda *args: sales_config)
+        rooms = [
+            Room(id=room_id, description="Room", components={}, sales_history=[])
+            for room_id in ("R100", "R300")
+        ]
+        parse_fit_cvi_to_sales_records(rooms, fit_df)
+
+        assert [(r.date, r.quantity) for r in rooms[0].sales_history] == [
+            (date(2024, 1, 2), 2),
+            (date(2024, 3, 5), 1),
+        ]
+        assert rooms[1].sales_history == []
+
+
+# ============================================================================
+# READ_FILE TESTS
+# ============================================================================
+
+
+class TestReadSalesFile:
+    """Test suite for column-selective, typed reads of sales files"""
+
+    @pytest.fixture(autouse=True)
+    def _patch_environment(self, monkeypatch, sales_config):
+        self.errors = []
+        monkeypatch.setattr(data_loaders, "get_config", lambda *args, **kwargs: sales_config)
+        monkeypatch.setattr(data_loaders, "file_in_use", lambda path: False)
+        monkeypatch.setattr(
+            data_loaders.messagebox, "showerror", lambda *args: self.errors.append(args)
+        )
+
+    @pytest.fixture
+    def wide_frame(self):
+        return pd.DataFrame(
+            {
+                "Plant": ["NL01", "NL02"],
+                "Component": ["989606130501", "989606130502"],
+                "Confirmed Delivery Date": ["2024-01-05 00:00:00", "2024-02-06 00:00:00"],
+                "Component Quantity": [3, 4],
+                "Remarks": ["", "late"],
+            }
+        )
+
+    @pytest.mark.parametrize("suffix", [".csv", ".xlsx"])
+    def test_only_configured_columns_typed(self, tmp_path, wide_frame, suffix):
+        """Unused columns are skipped; IDs stay strings, dates are parsed"""
+        path = tmp_path / f"ymbd{suffix}"
+        if suffix == ".csv":
+            wide_frame.to_csv(path, index=False)
+        else:
+            wide_frame.to_excel(path, index=False)
+
+        df = data_loaders.read_file(path, "ymbd", header=0)
+
+        assert list(df.columns) == ["Component", "Confirmed Delivery Date", "Component Quantity"]
+        assert df["Component"].tolist() == ["989606130501", "989606130502"]
+        assert pd.api.types.is_datetime64_any_dtype(df["Confirmed Delivery Date"])
+        assert pd.api.types.is_integer_dtype(df["Component Quantity"])
+
+    def test_malformed_quantity_falls_back_to_untyped(self, tmp_path, wide_frame, sales_config):
+        """A non-integer quantity does not fail the read"""
+        wide_frame["Component Quantity"] = ["3", "2.5"]
+        path = tmp_path / "ymbd.csv"
+        wide_frame.to_csv(path, index=False)
+
+        df = data_loaders.read_file(path, "ymbd", header=0)
+        _, report = parse_ymbd_sales(df, sales_config)
+
+        assert df["Component Quantity"].tolist() == [3.0, 2.5]
+        assert report.parsed_rows == 2
+
+    def test_missing_header_rejected(self, tmp_path, wide_frame):
+        """The header probe reports missing columns without loading the data"""
+        path = tmp_path / "ymbd.csv"
+        wide_frame.drop(columns="Component").to_csv(path, index=False)
+
+        assert data_loaders.read_file(path, "ymbd", header=0) is None
+        assert "must contain columns" in self.errors[0][1]
+
+    def test_streaming_matches_full_read(self, tmp_path, ymbd_df, sales_config):
+        """Chunked parsing gives the same groups and report as one full read"""
+        path = tmp_path / "ymbd.csv"
+        ymbd_df.to_csv(path, index=False)
+
+        chunks = data_loaders.read_file(path, "ymbd", header=0, chunksize=3)
+        assert not isinstance(chunks, pd.DataFrame)
+        streamed, streamed_report = parse_ymbd_sales(chunks, sales_config)
+        full, full_report = parse_ymbd_sales(data_loaders.read_file(path, "ymbd", header=0), sales_config)
+
+        assert streamed.ids == full.ids
+        assert streamed.offsets.tolist() == full.offsets.tolist()
+        assert streamed.dates.tolist() == full.dates.tolist()
+        assert streamed.quantities.tolist() == full.quantities.tolist()
+        assert streamed_report.skipped == full_report.skipped
+        assert streamed_report.total_rows == 8
+
+    def test_read_only_excel_batches(self, tmp_path, wide_frame, sales_config):
+        """The openpyxl read-only reader yields batches of the configured columns"""
+        path = tmp_path / "ymbd.xlsx"
+        wide_frame.to_excel(path, index=False)
+        sales_config["ymbd"]["excel_reader"] = "read_only"
+
+        batches = list(data_loaders.read_file(path, "ymbd", header=0, chunksize=1))
+        sales, report = parse_ymbd_sales(iter(batches), sales_config)
+
+        assert len(batches) == 2
+        assert list(batches[0].columns) == ["Component", "Confirmed Delivery Date", "Component Quantity"]
+        assert sales.ids == ["989606130501", "989606130502"]
+        assert sales.quantities.tolist() == [3, 4]
+        assert report.parsed_rows == 2
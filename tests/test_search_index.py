@@ -0,0 +1,91 @@
+"""
+Search Index Test Suite
+Tests the ID prefix / trigram index and the description token index behind
+the entity search boxes.
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import pytest
+
+from src.services.search_index import IdSearchIndex, TokenSearchIndex, tokenize
+
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+
+@pytest.fixture
+def ids():
+    return ["ROOM_002", "ROOM_001", "MYROOM_003", "TESTROOM_004", "LAB_005", "room", "989606130501"]
+
+
+@pytest.fixture
+def index(ids):
+    return IdSearchIndex(ids)
+
+
+# ============================================================================
+# ID SEARCH TESTS
+# ============================================================================
+
+
+class TestIdSearchIndex:
+    """Test suite for ranked prefix / substring ID search"""
+
+    def test_prefix(self, index):
+        """Case-insensitive, in ID order"""
+        assert index.prefix("room_") == ["ROOM_001", "ROOM_002"]
+        assert index.prefix("zzz") == []
+
+    def test_ranking(self, index):
+        """Exact match, then prefix matches, then substring matches by match position"""
+        assert index.search("Room") == ["room", "ROOM_001", "ROOM_002", "MYROOM_003", "TESTROOM_004"]
+        assert index.search(" 0613 ") == ["989606130501"]
+        assert index.search("oo") == ["room", "ROOM_001", "ROOM_002", "MYROOM_003", "TESTROOM_004"]
+
+    def test_limit_and_empty(self, index):
+        assert index.search("room", limit=2) == ["room", "ROOM_001"]
+        assert index.search("room_0", limit=3) == ["ROOM_001", "ROOM_002", "MYROOM_003"]
+        assert index.search("") == []
+        assert index.search("ROOMX") == []
+
+    def test_matches_linear_scan(self):
+        """Trigram candidates are verified: same set as a substring scan"""
+        ids = [f"{n:012d}" for n in range(0, 10**12, 7_777_777_777)]
+        index = IdSearchIndex(ids)
+        for query in ["777", "0077", "5555", "12345"]:
+            assert sorted(index.search(query, limit=len(ids))) == sorted(i for i in ids if query in i)
+
+
+class TestTokenSearchIndex:
+    """Test suite for the inverted description / IGT token index"""
+
+    @pytest.fixture
+    def index(self):
+        texts = {
+            "A": "Patient Table, Rev-B 4522 123 4567",
+            "B": "Table",
+            "C": "Tablet holder",
+            "D": "Patient support",
+        }
+        return TokenSearchIndex(sorted(texts), {key: tokenize(text) for key, text in texts.items()})
+
+    def test_and_of_prefixes(self, index):
+        """Every query word must prefix-match a token of the entity"""
+        assert index.search("pat tab") == ["A"]
+        assert index.search("PATIENT") == ["D", "A"]
+        assert index.search("4567") == ["A"]
+        assert index.search("patient xyz") == []
+        assert index.search("  ") == []
+
+    def test_ranking(self, index):
+        """Exact word matches first, then more specific (fewer-word) descriptions"""
+        assert index.search("table") == ["B", "A", "C"]
+        assert index.search("tab", limit=2) == ["B", "C"]
@@ -0,0 +1,90 @@
+"""
+Session Clock Test Suite
+Tests the explicit as-of date of analyses and predictions and the session
+clock they default to.
+"""
+
+import sys
+from datetime import date
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import pytest
+
+from src.analysis import PerformanceAnalyzer, PerformanceCache, Predictor
+from src.models import G_entity, Room, SalesRecord
+from src.services import EntityCatalog, PerformanceCenter
+from src.utils import SessionClock, get_next_period_label
+
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+
+@pytest.fixture
+def room():
+    sales = [SalesRecord("R1", month, date(2022, month, 15)) for month in range(1, 13)]
+    sales += [SalesRecord("R1", 100, date(2023, 6, 1))]
+    return Room(id="R1", description="Room", components={}, sales_history=sales)
+
+
+# ============================================================================
+# AS-OF TESTS
+# ============================================================================
+
+
+class TestAsOf:
+    """Test suite for deterministic analysis dates"""
+
+    def test_clock(self):
+        clock = SessionClock()
+        assert not clock.pinned and clock.today() == date.today()
+        assert clock.pin(date(2020, 2, 29)) == date(2020, 2, 29)
+        assert clock.today() == date(2020, 2, 29) and clock.resolve(date(2021, 1, 1)) == date(2021, 1, 1)
+        clock.unpin()
+        assert clock.today() == date.today()
+
+    def test_analyze_as_of(self, room):
+        analyzer = PerformanceAnalyzer(cube_source=EntityCatalog([room], []), cache=PerformanceCache())
+        g_entity = G_entity(room, "room")
+        data = analyzer.analyze(g_entity, lookback_years=1, granularity="monthly", as_of=date(2022, 12, 31))
+        assert data.total == sum(range(1, 13)) and data.periods[0].label == "01-2022"
+        later = analyzer.analyze(g_entity, lookback_years=1, granularity="monthly", as_of=date(2023, 6, 30))
+        assert later.total == sum(range(7, 13)) + 100
+        # as_of is part of the cache key
+        assert analyzer.cache.stats.misses == 2
+
+    def test_pinned_clock_is_the_default(self, room):
+        clock = SessionClock(date(2022, 12, 31))
+        analyzer = PerformanceAnalyzer(clock=clock)
+        assert analyzer.lookback_window(4) == (date(2018, 12, 31), date(2022, 12, 31))
+        data = analyzer.analyze(G_entity(room, "room"), lookback_years=1, granularity="quarterly")
+        assert [p.label for p in data.periods] == ["2022-Q1", "2022-Q2", "2022-Q3", "2022-Q4"]
+        table = PerformanceAnalyzer(cube_source=EntityCatalog([room], []), clock=clock).analyze_all(
+            "room", lookback_years=1, granularity="yearly"
+        )
+        assert table.totals.tolist() == [sum(range(1, 13))]
+
+    def test_prediction_as_of(self, room):
+        center = PerformanceCenter([room], [], clock=SessionClock(date(2022, 12, 31)))
+        performance = center.analyze_entity_performance(G_entity(room, "room"), 1, "monthly")
+        predictor = Predictor(performance, clock=center.clock)
+        assert predictor.predict("01-2023", buffer_percentage=0).predicted_quantity > 0
+        with pytest.raises(ValueError):
+            predictor.predict("12-2022")
+        with pytest.raises(ValueError):
+            predictor.predict("01-2023", as_of=date(2023, 1, 10))
+
+    def test_multiple_entities_as_of(self, room):
+        center = PerformanceCenter([room], [])
+        results = center.analyze_multiple_entities([G_entity(room, "room")], 1, "monthly", as_of=date(2023, 6, 30))
+        assert [data.total for data in results["R1"]] == [sum(range(7, 13)) + 100]
+
+    def test_next_period_label(self):
+        assert get_next_period_label("monthly", as_of=date(2024, 12, 5)) == "01-2025"
+        assert get_next_period_label("quarterly", as_of=date(2024, 3, 31)) == "2024-Q2"
+        assert get_next_period_label("yearly", as_of=date(2024, 1, 1)) == "2025"
@@ -0,0 +1,93 @@
+"""
+String Utilities Test Suite
+Tests the bulk identifier normalization / validation against the scalar
+normalize_identifier.
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.utils.string_utils import normalize_identifier, normalize_identifiers, validate_identifiers
+
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+
+@pytest.fixture
+def raw_identifiers():
+    """Float artifacts, separators, padding, missing values and non-strings"""
+    return [
+        989606130501.0,
+        " 9896-0613_0502 ",
+        None,
+        np.nan,
+        pd.NA,
+        "R 100",
+        "R-100",
+        "12.5",
+        12,
+        "",
+        "   ",
+        "989606130501",
+    ]
+
+
+# ============================================================================
+# BULK NORMALIZATION TESTS
+# ============================================================================
+
+
+class TestNormalizeIdentifiers:
+    """Test suite for the vectorized normalize_identifier companion"""
+
+    @pytest.mark.parametrize(
+        "container", [list, lambda values: np.array(values, dtype=object), pd.Series]
+    )
+    def test_same_result_as_scalar(self, raw_identifiers, container):
+        """Every position matches normalize_identifier, whatever the input container"""
+        values = container(raw_identifiers)
+        expected = [normalize_identifier(value) for value in raw_identifiers]
+
+        assert normalize_identifiers(values).tolist() == expected
+
+    def test_memo_reused_across_calls(self, raw_identifiers):
+        """A memo gives the same results and only grows by unseen values"""
+        memo = {}
+        first = normalize_identifiers(raw_identifiers, memo)
+        size = len(memo)
+        second = normalize_identifiers(raw_identifiers + ["X_1"], memo)
+
+        assert second.tolist() == first.tolist() + ["X1"]
+        assert len(memo) == size + 1
+        assert memo[989606130501.0] == "989606130501"
+
+    def test_empty_input(self):
+        assert normalize_identifiers([]).tolist() == []
+
+
+# ============================================================================
+# BULK VALIDATION TESTS
+# ============================================================================
+
+
+class TestValidateIdentifiers:
+    """Test suite for pattern masks over normalized IDs"""
+
+    def test_mask(self, raw_identifiers):
+        """Only non-empty IDs matching the pattern are True"""
+        normalized = normalize_identifiers(raw_identifiers)
+        mask = validate_identifiers(normalized, r"^\d{12}$")
+
+        assert mask.dtype == bool
+        assert np.flatnonzero(mask).tolist() == [0, 1, 11]
+        assert validate_identifiers(["R100", "", "r-1"], r"^[A-Z0-9]*$").tolist() == [True, False, False]
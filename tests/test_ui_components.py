@@ -432,23 +432,20 @@ class TestSearchFunctionality:
         assert screen.selected_entity_room is None or screen.selected_entity_room != "No matches found"
     
     def test_prefix_search_filter(self, entity_screen_room_mode):
-        """Test that search filter uses startswith (prefix matching)"""
+        """Test that prefix matches are listed before other substring matches"""
         screen = entity_screen_room_mode
         
         # Add test items
-        test_items = ["ROOM_001", "ROOM_002", "MYROOM_003", "TESTROOM_004"]
+        test_items = ["ROOM_001", "ROOM_002", "MYROOM_003", "TESTROOM_004", "LAB_005"]
         screen.all_items = test_items
         
-        # Filter with "ROOM" - should match ROOM_001, ROOM_002 but not MYROOM_003
+        # Filter with "ROOM" - ROOM_001, ROOM_002 first, then MYROOM_003, TESTROOM_004 (earlier match first)
         screen._filter_and_show_dropdown("ROOM")
         
         # Count items in dropdown
         listbox_items = [screen.dropdown_listbox.get(i) for i in range(screen.dropdown_listbox.size())]
         
-        # Should only have items starting with "ROOM"
-        for item in listbox_items:
-            if item != "No matches found":
-                assert item.startswith("ROOM")
+        assert listbox_items == ["ROOM_001", "ROOM_002", "MYROOM_003", "TESTROOM_004"]
 
 
 # ============================================================================